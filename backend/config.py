@@ -17,8 +17,32 @@ class Settings(BaseSettings):
 
     # Caching settings
     CACHE_SIZE: int = 128
+    TEXT_CACHE_SIZE: int = 100_000
+    EXPLANATION_CACHE_SIZE: int = 10_000
+    LANGUAGE_CACHE_SIZE: int = 8192
+    TRANSLATION_CACHE_SIZE: int = 10_000
+    TRANSLATION_CACHE_FILE: str = "translation_cache.db"  # empty: keep translations in memory only
+
+    # Database settings
+    DB_READ_POOL_SIZE: int = 10
 
     class Config:
         env_file = ".env"
+        frozen = True
+
+settings = Settings()
 
-settings = Settings()
\ No newline at end of file
+# Resolved once at import so per-message code reads plain module globals
+# instead of going through the settings model on every comparison.
+VADER_POS = settings.VADER_POSITIVE_THRESHOLD
+VADER_NEG = settings.VADER_NEGATIVE_THRESHOLD
+TOP_USERS_COUNT = settings.TOP_USERS_COUNT
+TOP_EMOJIS_COUNT = settings.TOP_EMOJIS_COUNT
+MAX_SAMPLE_FAILED_LINES = settings.MAX_SAMPLE_FAILED_LINES
+CACHE_SIZE = settings.CACHE_SIZE
+TEXT_CACHE_SIZE = settings.TEXT_CACHE_SIZE
+EXPLANATION_CACHE_SIZE = settings.EXPLANATION_CACHE_SIZE
+LANGUAGE_CACHE_SIZE = settings.LANGUAGE_CACHE_SIZE
+TRANSLATION_CACHE_SIZE = settings.TRANSLATION_CACHE_SIZE
+TRANSLATION_CACHE_FILE = settings.TRANSLATION_CACHE_FILE
+DB_READ_POOL_SIZE = settings.DB_READ_POOL_SIZE
@@ -2,21 +2,167 @@
 Database models for WhatsApp Sentiment Analyzer.
 Uses SQLite for persistent message storage and analysis results.
 """
+import copy
+import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import logging
+import zlib
+
+import numpy as np
+import orjson
+
+from backend.config import CACHE_SIZE, DB_READ_POOL_SIZE, TOP_USERS_COUNT
+from backend.db_pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
 DATABASE_FILE = "analyzer.db"
 
+# PRAGMA application_id records which backend owns the file (the v2 backend
+# uses the same analyzer.db with an incompatible schema); PRAGMA user_version
+# is that backend's schema version, so later startups skip the DDL.
+APPLICATION_ID = 0x57534131  # "WSA1"
+SCHEMA_VERSION = 2
+
+# Prepared-statement cache per connection (sqlite3 default is 128), sized so
+# the per-filter-combination count/page queries stay prepared.
+_STATEMENT_CACHE_SIZE = 512
+
+# Shared connection, opened lazily. sqlite3 connections are not safe for
+# concurrent use, so every access goes through _lock.
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.RLock()
+
+# Read-only connections for queries (see _reader)
+READ_POOL_SIZE = DB_READ_POOL_SIZE
+_read_pool: Optional[ConnectionPool] = None
+
+# Write counters used to key cached query results. Bumped per job_id on every
+# message write; the None entry covers queries that span all jobs.
+_job_version: Dict[Optional[str], int] = {}
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection, opening it on first use (caller holds _lock)."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(
+            DATABASE_FILE,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        _conn.row_factory = sqlite3.Row
+        _configure_pragmas(_conn)
+    return _conn
+
+
+def _configure_pragmas(conn: sqlite3.Connection):
+    """Tune the connection for bulk ingest (WAL persists in the file once set)."""
+    # Another process (the other backend, a script) may hold the write lock;
+    # wait for it instead of failing with "database is locked".
+    conn.execute("PRAGMA busy_timeout=30000")
+    if DATABASE_FILE != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+
+
+def optimize_db() -> bool:
+    """Run PRAGMA optimize so SQLite refreshes planner statistics that went stale."""
+    try:
+        with _lock:
+            _get_conn().execute("PRAGMA optimize")
+        return True
+    except Exception as e:
+        logger.error("Failed to optimize database: %s", e)
+        return False
+
+
+def close_db() -> None:
+    """Close the shared and pooled connections (app shutdown); they reopen on next use."""
+    global _conn
+    with _lock:
+        if _read_pool is not None:
+            _read_pool.close()
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+def _setup_read_conn(conn: sqlite3.Connection):
+    conn.row_factory = sqlite3.Row
+    _configure_pragmas(conn)
+    conn.execute("PRAGMA query_only=ON")
+
+
+@contextmanager
+def _reader():
+    """Yield a cursor on a pooled read-only connection; WAL lets it run alongside the writer."""
+    global _read_pool
+    if _read_pool is None:
+        with _lock:
+            if _read_pool is None:
+                _read_pool = ConnectionPool(
+                    DATABASE_FILE,
+                    READ_POOL_SIZE,
+                    setup=_setup_read_conn,
+                    isolation_level=None,
+                    cached_statements=_STATEMENT_CACHE_SIZE,
+                )
+    with _read_pool.acquire() as conn:
+        yield conn.cursor()
+
+
+@contextmanager
+def _transaction(begin: str = "BEGIN"):
+    """Run several statements in one explicit transaction on the shared connection."""
+    with _lock:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.execute(begin)
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _bump_job_versions(job_ids) -> None:
+    """Invalidate cached counts for the given jobs (and the all-jobs key)."""
+    with _lock:
+        for job_id in set(job_ids) | {None}:
+            _job_version[job_id] = _job_version.get(job_id, 0) + 1
+
 
 def init_db():
     """Initialize SQLite database with required tables."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
+    with _transaction() as cursor:
+        application_id = cursor.execute("PRAGMA application_id").fetchone()[0]
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        # Files stamped before application_id existed: v1 used version 1, v2 higher
+        foreign = application_id not in (0, APPLICATION_ID) or (application_id == 0 and version > 1)
+        if foreign:
+            logger.error("%s belongs to the v2 backend; not applying the v1 schema", DATABASE_FILE)
+            return
+        if application_id == APPLICATION_ID and version == SCHEMA_VERSION:
+            return
+        _create_schema(cursor)
+        cursor.execute(f"PRAGMA application_id = {APPLICATION_ID}")
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    logger.info("Database initialized successfully")
+
 
+def _create_schema(cursor):
+    """Create tables and indices, adding columns missing from older files."""
     # Messages table: stores parsed WhatsApp messages with sentiment analysis
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS messages (
@@ -62,6 +208,9 @@ def init_db():
             total_messages INTEGER,
             overall_sentiment JSON,
             error TEXT,
+            result JSON,
+            traceback TEXT,
+            detail JSON,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             completed_at DATETIME
         )
@@ -86,9 +235,72 @@ def init_db():
         cursor.execute("ALTER TABLE messages ADD COLUMN media_urls JSON")
         logger.info("Added 'media_urls' column to messages table")
 
-    conn.commit()
-    conn.close()
-    logger.info("Database initialized successfully")
+    cursor.execute("PRAGMA table_info(jobs)")
+    job_columns = {col[1] for col in cursor.fetchall()}
+    for column, column_type in (("result", "JSON"), ("traceback", "TEXT"), ("detail", "JSON")):
+        if column not in job_columns:
+            cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            logger.info("Added '%s' column to jobs table", column)
+
+
+# ============================================================================
+# JSON COLUMNS
+# ============================================================================
+
+# The JSON columns of messages hold a few dozen bytes each, too little for
+# plain deflate to gain anything. Deflating against a preset dictionary of the
+# keys they repeat shrinks the usual emotions document from 53 bytes to 4, so
+# the stats scans read more rows per page. A value is stored as that BLOB only
+# when it is smaller; otherwise (and in rows written earlier) it is JSON text.
+_JSON_ZDICT = b'["",""]{"joy":0,"anger":0,"sadness":0,"fear":0,"surprise":0}'
+
+
+def encode_json_column(value: Any) -> Optional[Union[str, bytes]]:
+    """Storage form of a value for the messages JSON columns (None stays NULL)."""
+    if value is None:
+        return None
+    text = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=_JSON_ZDICT)
+    packed = compressor.compress(text) + compressor.flush()
+    return packed if len(packed) < len(text) else text.decode()
+
+
+def decode_json_column(stored: Optional[Union[str, bytes]]) -> Any:
+    """Inverse of encode_json_column; also reads plain JSON text. Empty values give None."""
+    if not stored:
+        return None
+    if isinstance(stored, bytes):
+        stored = zlib.decompressobj(-15, zdict=_JSON_ZDICT).decompress(stored)
+    return orjson.loads(stored)
+
+
+_INSERT_SQL = """
+    INSERT INTO messages (
+        id, job_id, timestamp, sender, text, translated_text,
+        language, vader_score, textblob_score, ensemble_score,
+        ensemble_label, emotions, keywords, emojis, media_urls
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT DO NOTHING
+"""
+
+
+def insert_messages(rows: Iterable[tuple]):
+    """
+    Insert a batch of message rows in a single transaction.
+
+    Each row is a tuple ordered like the columns in _INSERT_SQL. Rows that
+    already exist (same id or job_id/timestamp/sender) are skipped by SQLite.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    try:
+        with _transaction() as cursor:
+            cursor.executemany(_INSERT_SQL, rows)
+        _bump_job_versions(row[1] for row in rows)
+    except Exception as e:
+        logger.error("Failed to insert messages: %s", e)
+        raise
 
 
 def insert_message(
@@ -103,48 +315,29 @@ def insert_message(
     textblob_score: float,
     ensemble_score: float,
     ensemble_label: str,
-    emotions: str,  # JSON string
-    keywords: str,  # JSON string
-    emojis: Optional[str] = None,  # JSON string
-    media_urls: Optional[str] = None,  # JSON string
+    emotions: str,  # JSON string or encode_json_column() value
+    keywords: str,  # JSON string or encode_json_column() value
+    emojis: Optional[str] = None,  # JSON string or encode_json_column() value
+    media_urls: Optional[str] = None,  # JSON string or encode_json_column() value
 ):
     """Insert a parsed message with sentiment scores into the database."""
-    try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO messages (
-                id, job_id, timestamp, sender, text, translated_text,
-                language, vader_score, textblob_score, ensemble_score,
-                ensemble_label, emotions, keywords, emojis, media_urls
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                msg_id,
-                job_id,
-                timestamp,
-                sender,
-                text,
-                translated_text,
-                language,
-                vader_score,
-                textblob_score,
-                ensemble_score,
-                ensemble_label,
-                emotions,
-                keywords,
-                emojis,
-                media_urls,
-            ),
-        )
-        conn.commit()
-        conn.close()
-    except sqlite3.IntegrityError as e:
-        logger.warning(f"Message already exists (ignored): {e}")
-    except Exception as e:
-        logger.error(f"Failed to insert message: {e}")
-        raise
+    insert_messages([(
+        msg_id,
+        job_id,
+        timestamp,
+        sender,
+        text,
+        translated_text,
+        language,
+        vader_score,
+        textblob_score,
+        ensemble_score,
+        ensemble_label,
+        emotions,
+        keywords,
+        emojis,
+        media_urls,
+    )])
 
 
 def query_messages(
@@ -159,156 +352,328 @@ def query_messages(
 ):
     """Query messages with optional filters. Returns paginated results."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        mask, params = _filter_mask(start_date, end_date, sender, f"%{keyword}%" if keyword else None, sentiment, language)
+        where_sql, query = _build_query(mask)
+        with _reader() as cursor:
+            cursor.execute(query, params + [limit, offset])
+            rows = cursor.fetchall()
+            messages = [dict(row) for row in rows]
+
+        # Get total count for pagination (cached until messages change)
+        total = _count_messages(where_sql, tuple(params), _job_version.get(None, 0))
+        return messages, total
+    except Exception as e:
+        logger.error("Failed to query messages: %s", e)
+        raise
 
-        # Build query dynamically
-        where_clauses = []
-        params = []
 
-        if start_date:
-            where_clauses.append("timestamp >= ?")
-            params.append(start_date)
+def get_message_by_id(message_id: str) -> Optional[Dict]:
+    """Scores and text of a single message, or None if there is no such id."""
+    try:
+        with _reader() as cursor:
+            cursor.execute("""
+                SELECT id, text, vader_score, textblob_score, ensemble_score, ensemble_label
+                FROM messages WHERE id = ?
+            """, (message_id,))
+            row = cursor.fetchone()
+        return dict(row) if row else None
+    except Exception as e:
+        logger.error("Failed to get message %s: %s", message_id, e)
+        raise
 
-        if end_date:
-            where_clauses.append("timestamp <= ?")
-            params.append(end_date)
 
-        if sender:
-            where_clauses.append("sender = ?")
-            params.append(sender)
+# Columns returned by query_messages (the fields of schemas.MessageDB)
+_MESSAGE_COLUMNS = """
+    id, timestamp, sender, text, translated_text, language,
+    vader_score, textblob_score, ensemble_score, ensemble_label,
+    emotions, keywords, emojis, media_urls
+"""
 
-        if keyword:
-            where_clauses.append("text LIKE ?")
-            params.append(f"%{keyword}%")
+# WHERE fragments for the message filters, in filter-bitmask order
+_FILTER_CLAUSES = (
+    "timestamp >= ?",
+    "timestamp <= ?",
+    "sender = ?",
+    "text LIKE ?",
+    "ensemble_label = ?",
+    "language = ?",
+)
+
+
+def _filter_mask(*values):
+    """Map filter values (in _FILTER_CLAUSES order) to (bitmask, params); falsy values are skipped."""
+    mask = 0
+    params = []
+    for bit, value in enumerate(values):
+        if value:
+            mask |= 1 << bit
+            params.append(value)
+    return mask, params
+
+
+@lru_cache(maxsize=1 << len(_FILTER_CLAUSES))
+def _where_sql(mask: int) -> str:
+    """WHERE clause for a filter bitmask, assembled once per combination."""
+    where_clauses = [clause for bit, clause in enumerate(_FILTER_CLAUSES) if mask & (1 << bit)]
+    return " AND ".join(where_clauses) if where_clauses else "1=1"
+
+
+@lru_cache(maxsize=1 << len(_FILTER_CLAUSES))
+def _build_query(mask: int) -> Tuple[str, str]:
+    """(where_sql, page query) for a filter bitmask."""
+    where_sql = _where_sql(mask)
+    query = f"""
+        SELECT {_MESSAGE_COLUMNS} FROM messages
+        WHERE {where_sql}
+        ORDER BY timestamp DESC
+        LIMIT ? OFFSET ?
+    """
+    return where_sql, query
+
+
+@lru_cache(maxsize=1 << len(_FILTER_CLAUSES))
+def _stats_query(mask: int) -> str:
+    """Column scan used by get_stats for a filter bitmask."""
+    return f"""
+        SELECT COALESCE(ensemble_label, ''), ensemble_score, COALESCE(language, ''), COALESCE(sender, '')
+        FROM messages
+        WHERE {_where_sql(mask)}
+    """
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _count_messages(where_sql: str, params: Tuple, version: int) -> int:
+    """COUNT(*) for a filter; version is part of the cache key only."""
+    with _reader() as cursor:
+        cursor.execute(f"SELECT COUNT(*) as count FROM messages WHERE {where_sql}", params)
+        return cursor.fetchone()["count"]
 
-        if sentiment:
-            where_clauses.append("ensemble_label = ?")
-            params.append(sentiment)
 
-        if language:
-            where_clauses.append("language = ?")
-            params.append(language)
+def get_stats(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sender: Optional[str] = None,
+):
+    """Get statistics over filtered messages."""
+    try:
+        mask, params = _filter_mask(start_date, end_date, sender)
+        # Cached until messages change; callers get their own copy
+        return copy.deepcopy(_filtered_stats(mask, tuple(params), _job_version.get(None, 0)))
+    except Exception as e:
+        logger.error("Failed to compute stats: %s", e)
+        raise
 
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-        query = f"""
-            SELECT * FROM messages
-            WHERE {where_sql}
-            ORDER BY timestamp DESC
-            LIMIT ? OFFSET ?
-        """
-        params.extend([limit, offset])
 
-        cursor.execute(query, params)
+def _factorize(values: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Encode a low-cardinality string column as integer codes into its sorted
+    distinct values (what np.unique returns, without sorting every row).
+    """
+    index = dict.fromkeys(values)
+    keys = sorted(index)
+    for code, key in enumerate(keys):
+        index[key] = code
+    codes = np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=len(values))
+    return keys, codes
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _filtered_stats(mask: int, params: Tuple, version: int) -> Dict:
+    """get_stats aggregates for a filter; version is part of the cache key only."""
+    with _reader() as cursor:
+        # Pull the hot columns once and aggregate in NumPy instead of
+        # running a GROUP BY per statistic.
+        cursor.row_factory = None
+        cursor.arraysize = 10000
+        cursor.execute(_stats_query(mask), params)
         rows = cursor.fetchall()
-        messages = [dict(row) for row in rows]
 
-        # Get total count for pagination
-        count_query = f"SELECT COUNT(*) as count FROM messages WHERE {where_sql}"
-        cursor.execute(count_query, params[:-2])
-        total = cursor.fetchone()["count"]
+    if not rows:
+        return {
+            "total_messages": 0,
+            "sentiment_distribution": {},
+            "language_distribution": {},
+            "top_participants": {},
+            "average_sentiment_score": 0.0,
+        }
 
-        conn.close()
-        return messages, total
+    # One packed array per column: scores as floats (NULL -> NaN), the
+    # string columns as integer codes
+    labels, scores, languages, senders = zip(*rows)
+    scores = np.array(scores, dtype=float)
+    has_score = ~np.isnan(scores)
+
+    # Overall sentiment distribution
+    label_keys, label_idx = _factorize(labels)
+    label_counts = np.bincount(label_idx, minlength=len(label_keys))
+    score_sums = np.bincount(label_idx[has_score], weights=scores[has_score], minlength=len(label_keys))
+    score_counts = np.bincount(label_idx[has_score], minlength=len(label_keys))
+    sentiment_dist = {
+        str(label): {
+            "count": int(count),
+            "avg_score": float(score_sums[i] / score_counts[i]) if score_counts[i] else None,
+        }
+        for i, (label, count) in enumerate(zip(label_keys, label_counts))
+    }
+
+    # Language distribution
+    lang_keys, lang_idx = _factorize(languages)
+    lang_counts = np.bincount(lang_idx, minlength=len(lang_keys))
+    language_dist = {str(k): int(c) for k, c in zip(lang_keys, lang_counts)}
+
+    # Top participants
+    sender_keys, sender_idx = _factorize(senders)
+    sender_counts = np.bincount(sender_idx, minlength=len(sender_keys))
+    top = np.argsort(-sender_counts, kind="stable")[:TOP_USERS_COUNT]
+    top_senders = {str(sender_keys[i]): int(sender_counts[i]) for i in top}
+
+    # Overall average sentiment score
+    avg_sentiment = float(scores[has_score].mean()) if has_score.any() else None
+
+    return {
+        "total_messages": len(rows),
+        "sentiment_distribution": sentiment_dist,
+        "language_distribution": language_dist,
+        "top_participants": top_senders,
+        "average_sentiment_score": round(avg_sentiment, 3) if avg_sentiment else 0.0,
+    }
+
+
+# VADER and TextBlob put a message on different sides of neutral. Same
+# cutoffs as ExplainableAIService._score_to_label.
+_SIDE_SQL = "(CASE WHEN {col} > 0.1 THEN 1 WHEN {col} < -0.1 THEN -1 ELSE 0 END)"
+_DISAGREES_SQL = (
+    _SIDE_SQL.format(col="COALESCE(vader_score, 0)")
+    + " != "
+    + _SIDE_SQL.format(col="COALESCE(textblob_score, 0)")
+)
+
+
+def query_disagreements(
+    job_id: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Tuple[List[Dict], int, int]:
+    """
+    Messages of a job where VADER and TextBlob disagree on sentiment direction.
+    Returns (rows, disagreement_count, total_messages); rows are in message order.
+    """
+    try:
+        with _reader() as cursor:
+            cursor.execute(f"""
+                SELECT COUNT(*) AS total, COALESCE(SUM({_DISAGREES_SQL}), 0) AS disagreements
+                FROM messages WHERE job_id = ?
+            """, (job_id,))
+            counts = cursor.fetchone()
+            cursor.execute(f"""
+                SELECT id, sender, timestamp, substr(text, 1, 100) AS text,
+                       COALESCE(vader_score, 0) AS vader_score,
+                       COALESCE(textblob_score, 0) AS textblob_score
+                FROM messages
+                WHERE job_id = ? AND {_DISAGREES_SQL}
+                ORDER BY rowid
+                LIMIT ? OFFSET ?
+            """, (job_id, -1 if limit is None else limit, offset))
+            rows = [dict(row) for row in cursor.fetchall()]
+        return rows, counts["disagreements"], counts["total"]
     except Exception as e:
-        logger.error(f"Failed to query messages: {e}")
+        logger.error("Failed to query disagreements: %s", e)
         raise
 
 
-def get_stats(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    sender: Optional[str] = None,
-):
-    """Get statistics over filtered messages."""
+# ============================================================================
+# JOBS
+# ============================================================================
+
+def save_job(
+    job_id: str,
+    status: str,
+    result: Optional[Dict] = None,
+    error: Optional[str] = None,
+    traceback: Optional[str] = None,
+    detail: Optional[Dict] = None,
+) -> bool:
+    """Create or overwrite the state of an analysis job."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        completed_at = None if status == "processing" else datetime.now()
+        total_messages = len(result.get("messages", [])) if result else None
+        with _transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO jobs (job_id, status, total_messages, error, result, traceback, detail, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    status = excluded.status,
+                    total_messages = excluded.total_messages,
+                    error = excluded.error,
+                    result = excluded.result,
+                    traceback = excluded.traceback,
+                    detail = excluded.detail,
+                    completed_at = excluded.completed_at
+            """, (
+                job_id, status, total_messages, error,
+                json.dumps(result) if result is not None else None,
+                traceback,
+                json.dumps(detail) if detail is not None else None,
+                completed_at,
+            ))
+        return True
+    except Exception as e:
+        logger.error("Failed to save job %s: %s", job_id, e)
+        return False
 
-        where_clauses = []
-        params = []
-
-        if start_date:
-            where_clauses.append("timestamp >= ?")
-            params.append(start_date)
-
-        if end_date:
-            where_clauses.append("timestamp <= ?")
-            params.append(end_date)
-
-        if sender:
-            where_clauses.append("sender = ?")
-            params.append(sender)
-
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-        # Overall sentiment distribution
-        query = f"""
-            SELECT
-                ensemble_label,
-                COUNT(*) as count,
-                AVG(ensemble_score) as avg_score
-            FROM messages
-            WHERE {where_sql}
-            GROUP BY ensemble_label
-        """
-        cursor.execute(query, params)
-        sentiment_dist = {row["ensemble_label"]: {"count": row["count"], "avg_score": row["avg_score"]} for row in cursor.fetchall()}
-
-        # Language distribution
-        query = f"""
-            SELECT language, COUNT(*) as count
-            FROM messages
-            WHERE {where_sql}
-            GROUP BY language
-        """
-        cursor.execute(query, params)
-        language_dist = {row["language"]: row["count"] for row in cursor.fetchall()}
-
-        # Top participants
-        query = f"""
-            SELECT sender, COUNT(*) as count
-            FROM messages
-            WHERE {where_sql}
-            GROUP BY sender
-            ORDER BY count DESC
-            LIMIT 10
-        """
-        cursor.execute(query, params)
-        top_senders = {row["sender"]: row["count"] for row in cursor.fetchall()}
-
-        # Overall average sentiment score
-        query = f"SELECT AVG(ensemble_score) as avg FROM messages WHERE {where_sql}"
-        cursor.execute(query, params)
-        avg_sentiment = cursor.fetchone()["avg"]
-
-        conn.close()
 
+def get_job(job_id: str) -> Optional[Dict]:
+    """
+    Return a job as {"status", "result", "error", "traceback", "detail"},
+    or None if it does not exist. Each call decodes its own copy.
+    """
+    try:
+        with _reader() as cursor:
+            cursor.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        if row["status"] == "processing":
+            return {"status": "processing"}
+        status, result, error, traceback, detail = _finished_job_row(job_id)
         return {
-            "total_messages": sum(s["count"] for s in sentiment_dist.values()),
-            "sentiment_distribution": sentiment_dist,
-            "language_distribution": language_dist,
-            "top_participants": top_senders,
-            "average_sentiment_score": round(avg_sentiment, 3) if avg_sentiment else 0.0,
+            "status": status,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "traceback": traceback,
+            "detail": json.loads(detail) if detail else None,
         }
     except Exception as e:
-        logger.error(f"Failed to compute stats: {e}")
-        raise
+        logger.error("Failed to get job %s: %s", job_id, e)
+        return None
+
+
+# Finished jobs whose stored columns are kept in memory. A result is the
+# whole analyzed chat (uploads run to 50MB), so only a few, and only as the
+# stored JSON text, which is several times smaller than the decoded objects.
+FINISHED_JOB_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=FINISHED_JOB_CACHE_SIZE)
+def _finished_job_row(job_id: str) -> Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """Stored (status, result, error, traceback, detail) of a completed or failed job; such jobs are never rewritten, so caching is safe."""
+    with _reader() as cursor:
+        cursor.execute(
+            "SELECT status, result, error, traceback, detail FROM jobs WHERE job_id = ?", (job_id,)
+        )
+        return tuple(cursor.fetchone())
 
 
 def clear_all_messages():
     """Clear all messages from database (for testing)."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM messages")
-        cursor.execute("DELETE FROM summaries")
-        cursor.execute("DELETE FROM jobs")
-        conn.commit()
-        conn.close()
+        with _transaction() as cursor:
+            cursor.execute("DELETE FROM messages")
+            cursor.execute("DELETE FROM summaries")
+            cursor.execute("DELETE FROM jobs")
+        _bump_job_versions(list(_job_version))
+        _finished_job_row.cache_clear()
         logger.info("All messages cleared")
     except Exception as e:
-        logger.error(f"Failed to clear messages: {e}")
+        logger.error("Failed to clear messages: %s", e)
         raise
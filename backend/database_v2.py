@@ -2,31 +2,326 @@
 Enhanced Database Schema v2.0 - Persistent Job Storage and Rich Analytics
 Supports emoji analytics, media detection, message type classification, and better filtering.
 """
+import calendar
+import copy
 import sqlite3
-from datetime import datetime
-from typing import Optional, List, Dict, Tuple, Any
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Iterator, Tuple, Any
 import logging
 import json
+import queue
+
+import orjson
+
+from backend.config import CACHE_SIZE, DB_READ_POOL_SIZE, TOP_EMOJIS_COUNT
+from backend.db_pool import ConnectionPool
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from itertools import chain
 
 logger = logging.getLogger(__name__)
 
 DATABASE_FILE = "analyzer.db"
 
+# PRAGMA application_id records which backend owns the file: the v1 backend
+# (backend/database.py) uses the same analyzer.db with an incompatible
+# messages table. PRAGMA user_version is the schema version, stamped once the
+# schema and its migrations are in place so later startups skip the DDL.
+APPLICATION_ID = 0x57534132  # "WSA2"
+V1_APPLICATION_ID = 0x57534131  # "WSA1"
+SCHEMA_VERSION = 7
+
+# Prepared-statement cache per connection (sqlite3 default is 128), sized so
+# the per-filter-combination count/page queries and the multi-row INSERTs
+# stay prepared instead of being re-parsed.
+_STATEMENT_CACHE_SIZE = 512
+
+# Shared connection, opened lazily. sqlite3 connections are not safe for
+# concurrent use, so every access goes through _lock.
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.RLock()
+
+# Read-only connections for request handlers (see _reader)
+READ_POOL_SIZE = DB_READ_POOL_SIZE
+_read_pool: Optional[ConnectionPool] = None
+
+# Write counters used to key cached query results. Bumped per job_id on every
+# message write; the None entry covers queries that span all jobs.
+_job_version: Dict[Optional[str], int] = {}
+
+# Set by init_db once the messages_fts full-text index is available.
+_fts_enabled = False
+
+
+# (job_id, timestamp) serves the paginated listing without a sort (walked
+# backwards for "timestamp DESC, rowid DESC"); it also covers plain job_id
+# lookups, so the old idx_job_id is dropped.
+# The other (job_id, ...) indices cover the per-job GROUP BYs in
+# _compute_job_aggregates and get_media_analytics, so those read only the
+# job's index range instead of the table. The toxic and message type filters
+# often match only a few messages, so their indices end in timestamp: a
+# filtered page reads just the matching entries, already in listing order.
+# The same goes for has_disagreement and /disagreements.
+_INDICES = [
+    ("idx_job_ts", "messages", "job_id, timestamp"),
+    ("idx_job_sender_ts", "messages", "job_id, sender, timestamp"),
+    ("idx_sender", "messages", "sender"),
+    ("idx_timestamp", "messages", "timestamp"),
+    ("idx_msg_job_label", "messages", "job_id, ensemble_label, ensemble_score"),
+    ("idx_msg_job_lang", "messages", "job_id, detected_language"),
+    ("idx_msg_job_type_ts", "messages", "job_id, message_type, timestamp"),
+    ("idx_msg_job_sender", "messages", "job_id, sender, ensemble_score"),
+    ("idx_msg_job_toxic_ts", "messages", "job_id, is_toxic, timestamp"),
+    ("idx_msg_job_disagree_ts", "messages", "job_id, has_disagreement, timestamp"),
+    ("idx_job_status", "jobs", "status"),
+    ("idx_emoji_job", "emoji_analytics", "job_id"),
+    ("idx_emoji_count", "emoji_analytics", "usage_count"),
+    ("idx_media_job_type", "media_analytics", "job_id, media_type"),
+    ("idx_media_job_sender", "media_analytics", "job_id, sender"),
+]
+
+# Indices from older versions, superseded by the job-scoped ones above
+_OBSOLETE_INDICES = (
+    "idx_job_id", "idx_ensemble_label", "idx_language",
+    "idx_message_type", "idx_is_toxic", "idx_media_job",
+    "idx_msg_job_type", "idx_msg_job_toxic",
+)
+
+# Number of ingests currently inside deferred_message_indices()
+_active_ingests = 0
+
+# deferred_message_indices() only drops the indices while messages holds at
+# most this many rows: the drop is table-wide, so on a populated table every
+# other job's reads would full-scan until the ingest finishes.
+DEFER_INDICES_MAX_ROWS = 1000
+
+
+# timestamp is stored as INTEGER Unix seconds (naive datetimes are taken as
+# UTC) so range filters compare integers against the index. Uniqueness comes
+# from message_id, a short hash of the job and the message's position in the
+# export; (job_id, timestamp, sender) is not unique at one-second resolution.
+_MESSAGES_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        message_id TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,  -- Unix epoch seconds
+        sender TEXT NOT NULL,
+        raw_text TEXT NOT NULL,
+        cleaned_text TEXT,
+        translated_text TEXT,
+        message_type TEXT DEFAULT 'text',
+        is_media BOOLEAN DEFAULT 0,
+        is_emoji_only BOOLEAN DEFAULT 0,
+        is_link BOOLEAN DEFAULT 0,
+        detected_language TEXT DEFAULT 'en',
+        language_confidence REAL,
+        vader_score REAL,
+        vader_label TEXT,
+        textblob_score REAL,
+        textblob_label TEXT,
+        ensemble_score REAL,
+        ensemble_label TEXT,
+        confidence_score REAL,
+        top_emotion TEXT,
+        media_count INTEGER DEFAULT 0,
+        toxicity_score REAL,
+        is_toxic BOOLEAN DEFAULT 0,
+        has_disagreement BOOLEAN NOT NULL DEFAULT 0,  -- see _LABELS_DISAGREE_SQL
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (job_id) REFERENCES jobs(job_id)
+    )
+"""
+
+# A message's VADER, TextBlob and ensemble labels are not all equal. IS NOT
+# (rather than <>) so a NULL label counts as differing from a set one.
+# Evaluated once per message: build_message_row stores it as has_disagreement.
+_LABELS_DISAGREE_SQL = "(vader_label IS NOT textblob_label OR vader_label IS NOT ensemble_label)"
+
+
+# emoji_id is an integer rowid alias, so the emoji_senders join key is 8 bytes
+# rather than the old "<job_id>_<emoji>" text
+_EMOJI_ANALYTICS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        emoji_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id TEXT NOT NULL,
+        emoji_char TEXT NOT NULL,
+        emoji_name TEXT,
+        emoji_category TEXT,
+        usage_count INTEGER DEFAULT 1,
+        unique_users INTEGER DEFAULT 1,
+        first_used DATETIME,
+        last_used DATETIME,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (job_id) REFERENCES jobs(job_id),
+        UNIQUE(job_id, emoji_char)
+    )
+"""
+
+_EMOJI_SENDERS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        emoji_id INTEGER NOT NULL,
+        sender TEXT NOT NULL,
+        count INTEGER DEFAULT 1,
+        FOREIGN KEY (emoji_id) REFERENCES emoji_analytics(emoji_id),
+        UNIQUE(emoji_id, sender)
+    )
+"""
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection, opening it on first use (caller holds _lock)."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(
+            DATABASE_FILE,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        # Rows stay sqlite3.Row internally; public getters hand out plain dicts
+        _conn.row_factory = sqlite3.Row
+        _configure_pragmas(_conn)
+    return _conn
+
+
+def _configure_pragmas(conn: sqlite3.Connection):
+    """Tune the connection for bulk ingest (WAL persists in the file once set)."""
+    # Another process (the other backend, a script) may hold the write lock;
+    # wait for it instead of failing with "database is locked".
+    conn.execute("PRAGMA busy_timeout=30000")
+    if DATABASE_FILE != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=1073741824")  # 1 GiB of address space, not memory
+    conn.execute("PRAGMA analysis_limit=1000")  # bounds ANALYZE / PRAGMA optimize per index
+    # INSERT OR REPLACE only fires DELETE triggers (which keep messages_fts in
+    # sync) when recursive triggers are on.
+    conn.execute("PRAGMA recursive_triggers=ON")
+
+
+def optimize_db() -> bool:
+    """Run PRAGMA optimize so SQLite refreshes planner statistics that went stale."""
+    try:
+        with _lock:
+            _get_conn().execute("PRAGMA optimize")
+        return True
+    except Exception as e:
+        logger.error("✗ Failed to optimize database: %s", e)
+        return False
+
+
+def close_db() -> None:
+    """Close the shared and pooled connections (app shutdown); they reopen on next use."""
+    global _conn
+    with _lock:
+        if _read_pool is not None:
+            _read_pool.close()
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
 
-def dict_factory(cursor, row):
-    """Convert database rows to dictionaries."""
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
+def _setup_read_conn(conn: sqlite3.Connection):
+    conn.row_factory = sqlite3.Row
+    _configure_pragmas(conn)
+    conn.execute("PRAGMA query_only=ON")
+
+
+@contextmanager
+def _reader():
+    """
+    Yield a cursor on a pooled read-only connection. Readers don't take _lock,
+    so with WAL they run alongside the writer instead of queueing behind it.
+    """
+    global _read_pool
+    if _read_pool is None:
+        with _lock:
+            if _read_pool is None:
+                _read_pool = ConnectionPool(
+                    DATABASE_FILE,
+                    READ_POOL_SIZE,
+                    setup=_setup_read_conn,
+                    isolation_level=None,
+                    cached_statements=_STATEMENT_CACHE_SIZE,
+                )
+    with _read_pool.acquire() as conn:
+        yield conn.cursor()
+
+
+@contextmanager
+def _transaction(begin: str = "BEGIN"):
+    """Run several statements in one explicit transaction on the shared connection."""
+    with _lock:
+        conn = _get_conn()
+        cursor = conn.cursor()
+        cursor.execute(begin)
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _bump_job_versions(job_ids) -> None:
+    """Invalidate cached counts and results for the given jobs (and the all-jobs key)."""
+    with _lock:
+        for job_id in set(job_ids) | {None}:
+            _job_version[job_id] = _job_version.get(job_id, 0) + 1
+
+
+def _cached_per_job(func):
+    """
+    Memoize func(job_id) until the job's next write (_bump_job_versions).
+    Callers get a deep copy, so mutating a result never touches the cache.
+    Exceptions propagate and are not cached.
+    """
+    @lru_cache(maxsize=CACHE_SIZE)
+    def cached(job_id, version):
+        return func(job_id)
+
+    @wraps(func)
+    def wrapper(job_id):
+        return copy.deepcopy(cached(job_id, _job_version.get(job_id, 0)))
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
 
 
 def init_db():
     """Initialize SQLite database with v2.0 schema including jobs, messages, emoji analytics."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
+    global _fts_enabled
+    with _transaction() as cursor:
+        application_id = cursor.execute("PRAGMA application_id").fetchone()[0]
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if application_id == 0 and version == 1:
+            application_id = V1_APPLICATION_ID  # stamped by v1 before application_id existed
+        if application_id not in (0, APPLICATION_ID):
+            logger.error("✗ %s belongs to the v1 backend; not applying the v2 schema", DATABASE_FILE)
+            return
+        if version >= SCHEMA_VERSION:
+            # Restores indices left dropped by an ingest that never reached
+            # the rebuild in deferred_message_indices()
+            _create_message_indices(cursor)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'")
+            _fts_enabled = cursor.fetchone() is not None
+            return
+        _create_schema(cursor)
+        _fts_enabled = _create_fts_index(cursor)
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_listing_query_plan(cursor)
+        cursor.execute(f"PRAGMA application_id = {APPLICATION_ID}")
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    logger.info("✓ Database v2.0 initialized successfully")
 
+
+def _create_schema(cursor):
+    """Create tables and indices if they do not exist."""
     # JOBS TABLE - Persists analysis metadata
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS jobs (
@@ -47,71 +342,44 @@ def init_db():
     """)
 
     # MESSAGES TABLE - Rich message data with type classification
+    cursor.execute(_MESSAGES_DDL.format(table="messages"))
+
+    # MESSAGE PAYLOAD TABLE - JSON blobs, read only by detail views
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS messages (
+        CREATE TABLE IF NOT EXISTS message_payload (
             message_id TEXT PRIMARY KEY,
-            job_id TEXT NOT NULL,
-            timestamp DATETIME NOT NULL,
-            sender TEXT NOT NULL,
-            raw_text TEXT NOT NULL,
-            cleaned_text TEXT,
-            translated_text TEXT,
-            message_type TEXT DEFAULT 'text',
-            is_media BOOLEAN DEFAULT 0,
-            is_emoji_only BOOLEAN DEFAULT 0,
-            is_link BOOLEAN DEFAULT 0,
-            detected_language TEXT DEFAULT 'en',
-            language_confidence REAL,
-            vader_score REAL,
-            vader_label TEXT,
-            textblob_score REAL,
-            textblob_label TEXT,
-            ensemble_score REAL,
-            ensemble_label TEXT,
-            confidence_score REAL,
             emotions JSON,
-            top_emotion TEXT,
             keywords JSON,
             emoji_list JSON,
             media_types JSON,
-            media_count INTEGER DEFAULT 0,
-            toxicity_score REAL,
-            is_toxic BOOLEAN DEFAULT 0,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(job_id, timestamp, sender),
-            FOREIGN KEY (job_id) REFERENCES jobs(job_id)
+            FOREIGN KEY (message_id) REFERENCES messages(message_id)
         )
     """)
+    _migrate_payload_columns(cursor)
+    _migrate_disagreement_flag(cursor)
+    _migrate_epoch_timestamps(cursor)
 
-    # EMOJI ANALYTICS TABLE - Emoji insights
+    # JOB STATS TABLE - Aggregates materialized when a job completes
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS emoji_analytics (
-            emoji_id TEXT PRIMARY KEY,
-            job_id TEXT NOT NULL,
-            emoji_char TEXT NOT NULL,
-            emoji_name TEXT,
-            emoji_category TEXT,
-            usage_count INTEGER DEFAULT 1,
-            unique_users INTEGER DEFAULT 1,
-            first_used DATETIME,
-            last_used DATETIME,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (job_id) REFERENCES jobs(job_id),
-            UNIQUE(job_id, emoji_char)
+        CREATE TABLE IF NOT EXISTS job_stats (
+            job_id TEXT PRIMARY KEY,
+            sentiment_dist JSON,
+            language_dist JSON,
+            message_type_dist JSON,
+            top_senders JSON,
+            toxicity JSON,
+            total_messages INTEGER,
+            computed_at DATETIME,
+            FOREIGN KEY (job_id) REFERENCES jobs(job_id)
         )
     """)
 
+    # EMOJI ANALYTICS TABLE - Emoji insights
+    cursor.execute(_EMOJI_ANALYTICS_DDL.format(table="emoji_analytics"))
+
     # EMOJI_SENDERS TABLE - Which users used which emojis
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS emoji_senders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            emoji_id TEXT NOT NULL,
-            sender TEXT NOT NULL,
-            count INTEGER DEFAULT 1,
-            FOREIGN KEY (emoji_id) REFERENCES emoji_analytics(emoji_id),
-            UNIQUE(emoji_id, sender)
-        )
-    """)
+    cursor.execute(_EMOJI_SENDERS_DDL.format(table="emoji_senders"))
+    _migrate_emoji_ids(cursor)
 
     # MEDIA ANALYTICS TABLE - Media insights
     cursor.execute("""
@@ -145,26 +413,188 @@ def init_db():
     """)
 
     # CREATE INDICES for fast querying
-    indices = [
-        ("idx_job_id", "messages", "job_id"),
-        ("idx_sender", "messages", "sender"),
-        ("idx_timestamp", "messages", "timestamp"),
-        ("idx_ensemble_label", "messages", "ensemble_label"),
-        ("idx_language", "messages", "detected_language"),
-        ("idx_message_type", "messages", "message_type"),
-        ("idx_is_toxic", "messages", "is_toxic"),
-        ("idx_job_status", "jobs", "status"),
-        ("idx_emoji_job", "emoji_analytics", "job_id"),
-        ("idx_emoji_count", "emoji_analytics", "usage_count"),
-        ("idx_media_job", "media_analytics", "job_id"),
-    ]
-
-    for idx_name, table, column in indices:
+    for idx_name, table, column in _INDICES:
         cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {table}({column})")
+    for idx_name in _OBSOLETE_INDICES:
+        cursor.execute(f"DROP INDEX IF EXISTS {idx_name}")
+
+
+def _migrate_payload_columns(cursor):
+    """Move JSON columns from messages rows written by older versions into message_payload."""
+    cursor.execute("PRAGMA table_info(messages)")
+    columns = {row["name"] for row in cursor.fetchall()}
+    legacy = [col for col in _PAYLOAD_COLUMNS if col in columns]
+    if "message_id" not in columns or not legacy:
+        return
+
+    select = ", ".join(col if col in columns else "NULL" for col in _PAYLOAD_COLUMNS)
+    cursor.execute(f"""
+        INSERT OR IGNORE INTO message_payload (message_id, {', '.join(_PAYLOAD_COLUMNS)})
+        SELECT message_id, {select} FROM messages
+    """)
+    for col in legacy:
+        try:
+            cursor.execute(f"ALTER TABLE messages DROP COLUMN {col}")
+        except sqlite3.OperationalError:
+            # SQLite < 3.35 has no DROP COLUMN; clear the data instead
+            cursor.execute(f"UPDATE messages SET {col} = NULL")
+    logger.info("✓ Moved %s from messages into message_payload", ', '.join(legacy))
+
+
+def _migrate_disagreement_flag(cursor):
+    """Add has_disagreement to a messages table from older versions and fill it in."""
+    cursor.execute("PRAGMA table_info(messages)")
+    columns = {row["name"] for row in cursor.fetchall()}
+    if "message_id" not in columns or "has_disagreement" in columns:
+        return
+
+    cursor.execute("ALTER TABLE messages ADD COLUMN has_disagreement BOOLEAN NOT NULL DEFAULT 0")
+    cursor.execute(f"UPDATE messages SET has_disagreement = 1 WHERE {_LABELS_DISAGREE_SQL}")
+    logger.info("✓ Flagged %d messages with model disagreements", cursor.rowcount)
+
+
+def _migrate_epoch_timestamps(cursor):
+    """Rebuild a messages table from older versions (ISO text timestamps) with epoch integers."""
+    cursor.execute("PRAGMA table_info(messages)")
+    columns = {row["name"]: row["type"] for row in cursor.fetchall()}
+    if "message_id" not in columns or columns.get("timestamp", "").upper() == "INTEGER":
+        return
+
+    copied = [col for col in (*_MESSAGE_COLUMNS, "created_at") if col in columns]
+    select = ", ".join(
+        "CAST(strftime('%s', timestamp) AS INTEGER)" if col == "timestamp" else col
+        for col in copied
+    )
+    cursor.execute("DROP TABLE IF EXISTS messages_migrating")
+    cursor.execute(_MESSAGES_DDL.format(table="messages_migrating"))
+    # rowid is kept so the messages_fts index stays valid
+    cursor.execute(f"""
+        INSERT INTO messages_migrating (rowid, {', '.join(copied)})
+        SELECT rowid, {select} FROM messages
+    """)
+    cursor.execute("DROP TABLE messages")
+    cursor.execute("ALTER TABLE messages_migrating RENAME TO messages")
+    logger.info("✓ Converted message timestamps to epoch seconds")
+
+
+def _migrate_emoji_ids(cursor):
+    """Rebuild emoji tables from older versions (TEXT "<job_id>_<emoji>" keys) with integer ids."""
+    cursor.execute("PRAGMA table_info(emoji_analytics)")
+    columns = {row["name"]: row["type"] for row in cursor.fetchall()}
+    if columns.get("emoji_id", "").upper() != "TEXT":
+        return
+
+    cursor.execute("DROP TABLE IF EXISTS emoji_analytics_migrating")
+    cursor.execute("DROP TABLE IF EXISTS emoji_senders_migrating")
+    cursor.execute(_EMOJI_ANALYTICS_DDL.format(table="emoji_analytics_migrating"))
+    cursor.execute(_EMOJI_SENDERS_DDL.format(table="emoji_senders_migrating"))
+    cursor.execute("""
+        INSERT INTO emoji_analytics_migrating (
+            job_id, emoji_char, emoji_name, emoji_category, usage_count,
+            unique_users, first_used, last_used, created_at
+        )
+        SELECT job_id, emoji_char, emoji_name, emoji_category, usage_count,
+               unique_users, first_used, last_used, created_at
+        FROM emoji_analytics ORDER BY rowid
+    """)
+    cursor.execute("""
+        INSERT INTO emoji_senders_migrating (emoji_id, sender, count)
+        SELECT n.emoji_id, s.sender, s.count
+        FROM emoji_senders s
+        JOIN emoji_analytics o ON o.emoji_id = s.emoji_id
+        JOIN emoji_analytics_migrating n ON n.job_id = o.job_id AND n.emoji_char = o.emoji_char
+        ORDER BY s.id
+    """)
+    cursor.execute("DROP TABLE emoji_senders")
+    cursor.execute("DROP TABLE emoji_analytics")
+    cursor.execute("ALTER TABLE emoji_analytics_migrating RENAME TO emoji_analytics")
+    cursor.execute("ALTER TABLE emoji_senders_migrating RENAME TO emoji_senders")
+    logger.info("✓ Converted emoji ids to integers")
 
-    conn.commit()
-    conn.close()
-    logger.info("✓ Database v2.0 initialized successfully")
+
+def _create_fts_index(cursor) -> bool:
+    """
+    Create the messages_fts full-text index over raw_text and its sync triggers.
+    The trigram tokenizer lets it serve LIKE '%keyword%' for any substring,
+    not just whole words. Returns False when this SQLite build has no FTS5
+    trigram tokenizer (keyword search then uses LIKE alone).
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'messages_fts'")
+    row = cursor.fetchone()
+    existed = row is not None
+    if existed and "trigram" not in row["sql"]:
+        # Word-tokenized index from an older version: it can't serve substrings
+        for trigger in ("messages_fts_ai", "messages_fts_ad", "messages_fts_au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute("DROP TABLE messages_fts")
+        existed = False
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                raw_text, content='messages', content_rowid='rowid', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning("FTS5 trigram index unavailable, keyword search will use LIKE: %s", e)
+        return False
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+            INSERT INTO messages_fts(rowid, raw_text) VALUES (new.rowid, new.raw_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, raw_text) VALUES ('delete', old.rowid, old.raw_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF raw_text ON messages BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, raw_text) VALUES ('delete', old.rowid, old.raw_text);
+            INSERT INTO messages_fts(rowid, raw_text) VALUES (new.rowid, new.raw_text);
+        END
+    """)
+    if not existed:
+        # Index messages stored before the FTS table existed
+        cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+        logger.info("✓ Built full-text index for existing messages")
+    return True
+
+
+# Trigrams need three characters to look anything up; shorter keywords (and
+# ones with LIKE wildcards) would scan messages_fts and gain nothing over LIKE.
+FTS_MIN_KEYWORD_LENGTH = 3
+
+
+def _use_fts(keyword: str) -> bool:
+    """Whether messages_fts can narrow down the rows for a keyword filter."""
+    return (
+        _fts_enabled
+        and len(keyword) >= FTS_MIN_KEYWORD_LENGTH
+        and "%" not in keyword
+        and "_" not in keyword
+    )
+
+
+def _log_listing_query_plan(cursor):
+    """Log how SQLite plans the paginated listing query (debug aid)."""
+    for label, where, params in (
+        ("job", "job_id = ?", ("",)),
+        ("job+sender", "job_id = ? AND sender = ?", ("", "")),
+        ("job+toxic", "job_id = ? AND is_toxic = ?", ("", 1)),
+        ("job+type", "job_id = ? AND message_type = ?", ("", "")),
+        ("job+disagreement", "job_id = ? AND has_disagreement = 1", ("",)),
+    ):
+        cursor.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM messages WHERE {where} "
+            "ORDER BY timestamp DESC, rowid DESC LIMIT 50 OFFSET 0",
+            params,
+        )
+        plan = "; ".join(row["detail"] for row in cursor.fetchall())
+        if "USE TEMP B-TREE FOR ORDER BY" in plan:
+            logger.warning("Listing query (%s) sorts in memory: %s", label, plan)
+        else:
+            logger.debug("Listing query plan (%s): %s", label, plan)
 
 
 # ============================================================================
@@ -174,86 +604,83 @@ def init_db():
 def create_job(job_id: str, filename: str) -> bool:
     """Create a new analysis job."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO jobs (job_id, filename, status)
-            VALUES (?, ?, 'processing')
-        """, (job_id, filename))
-        conn.commit()
-        conn.close()
-        logger.info(f"✓ Job created: {job_id}")
+        with _lock:
+            conn = _get_conn()
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO jobs (job_id, filename, status)
+                VALUES (?, ?, 'processing')
+            """, (job_id, filename))
+        _bump_job_versions([job_id])
+        logger.info("✓ Job created: %s", job_id)
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to create job {job_id}: {e}")
+        logger.error("✗ Failed to create job %s: %s", job_id, e)
         return False
 
 
 def update_job_status(job_id: str, status: str, **kwargs) -> bool:
     """Update job status and metadata."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
+        with _transaction() as cursor:
         
-        updates = ["status = ?"]
-        params = [status]
+            updates = ["status = ?"]
+            params = [status]
         
-        if status == "completed":
-            updates.append("completed_at = CURRENT_TIMESTAMP")
+            if status == "completed":
+                updates.append("completed_at = CURRENT_TIMESTAMP")
         
-        if "total_messages" in kwargs:
-            updates.append("total_messages = ?")
-            params.append(kwargs["total_messages"])
+            if "total_messages" in kwargs:
+                updates.append("total_messages = ?")
+                params.append(kwargs["total_messages"])
         
-        if "parsed_messages" in kwargs:
-            updates.append("parsed_messages = ?")
-            params.append(kwargs["parsed_messages"])
+            if "parsed_messages" in kwargs:
+                updates.append("parsed_messages = ?")
+                params.append(kwargs["parsed_messages"])
         
-        if "overall_sentiment_score" in kwargs:
-            updates.append("overall_sentiment_score = ?")
-            params.append(kwargs["overall_sentiment_score"])
+            if "overall_sentiment_score" in kwargs:
+                updates.append("overall_sentiment_score = ?")
+                params.append(kwargs["overall_sentiment_score"])
         
-        if "overall_sentiment_label" in kwargs:
-            updates.append("overall_sentiment_label = ?")
-            params.append(kwargs["overall_sentiment_label"])
+            if "overall_sentiment_label" in kwargs:
+                updates.append("overall_sentiment_label = ?")
+                params.append(kwargs["overall_sentiment_label"])
         
-        if "error_message" in kwargs:
-            updates.append("error_message = ?")
-            params.append(kwargs["error_message"])
+            if "error_message" in kwargs:
+                updates.append("error_message = ?")
+                params.append(kwargs["error_message"])
         
-        if "error_traceback" in kwargs:
-            updates.append("error_traceback = ?")
-            params.append(kwargs["error_traceback"])
+            if "error_traceback" in kwargs:
+                updates.append("error_traceback = ?")
+                params.append(kwargs["error_traceback"])
         
-        if "processing_time_seconds" in kwargs:
-            updates.append("processing_time_seconds = ?")
-            params.append(kwargs["processing_time_seconds"])
+            if "processing_time_seconds" in kwargs:
+                updates.append("processing_time_seconds = ?")
+                params.append(kwargs["processing_time_seconds"])
         
-        params.append(job_id)
+            params.append(job_id)
         
-        query = f"UPDATE jobs SET {', '.join(updates)} WHERE job_id = ?"
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
-        logger.info(f"✓ Job {job_id} status updated to {status}")
+            query = f"UPDATE jobs SET {', '.join(updates)} WHERE job_id = ?"
+            cursor.execute(query, params)
+            if status == "completed":
+                _materialize_job_stats(cursor, job_id)
+        _bump_job_versions([job_id])
+        logger.info("✓ Job %s status updated to %s", job_id, status)
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to update job {job_id}: {e}")
+        logger.error("✗ Failed to update job %s: %s", job_id, e)
         return False
 
 
 def get_job(job_id: str) -> Optional[Dict]:
     """Retrieve job metadata."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
-        job = cursor.fetchone()
-        conn.close()
-        return job
+        with _reader() as cursor:
+            cursor.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+            job = cursor.fetchone()
+        return dict(job) if job else None
     except Exception as e:
-        logger.error(f"✗ Failed to retrieve job {job_id}: {e}")
+        logger.error("✗ Failed to retrieve job %s: %s", job_id, e)
         return None
 
 
@@ -261,7 +688,67 @@ def get_job(job_id: str) -> Optional[Dict]:
 # MESSAGE INSERTION & STORAGE
 # ============================================================================
 
-def insert_message(
+# Scalar columns stored on the messages row. The JSON blobs live in
+# message_payload so list queries don't drag them through the row decoder.
+_MESSAGE_COLUMNS = (
+    "message_id", "job_id", "timestamp", "sender", "raw_text", "cleaned_text",
+    "translated_text", "message_type", "is_media", "is_emoji_only", "is_link",
+    "detected_language", "language_confidence",
+    "vader_score", "vader_label", "textblob_score", "textblob_label",
+    "ensemble_score", "ensemble_label", "confidence_score",
+    "top_emotion", "media_count", "toxicity_score", "is_toxic", "has_disagreement",
+)
+_PAYLOAD_COLUMNS = ("emotions", "keywords", "emoji_list", "media_types")
+_MESSAGE_SELECT = ", ".join(_MESSAGE_COLUMNS)
+_PAYLOAD_SELECT = ", ".join(f"p.{col}" for col in _PAYLOAD_COLUMNS)
+
+
+def _message_read_columns(prefix: str = "") -> str:
+    """
+    SELECT list for messages. timestamp stays epoch seconds: callers that show
+    it convert with from_epoch, bulk readers that ignore it pay nothing.
+    """
+    return ", ".join(f"{prefix}{col}" for col in _MESSAGE_COLUMNS)
+
+# Messages are immutable once stored: re-ingesting an existing row is a no-op
+# inside SQLite rather than a delete + reinsert (and index rewrite).
+_INSERT_PREFIX = f"INSERT INTO messages ({_MESSAGE_SELECT}) VALUES "
+_PAYLOAD_INSERT_PREFIX = (
+    f"INSERT INTO message_payload (message_id, {', '.join(_PAYLOAD_COLUMNS)}) VALUES "
+)
+_ON_CONFLICT = " ON CONFLICT DO NOTHING"
+
+_INSERT_SQL = _INSERT_PREFIX + "(" + ", ".join(["?"] * len(_MESSAGE_COLUMNS)) + ")" + _ON_CONFLICT
+_PAYLOAD_INSERT_SQL = (
+    _PAYLOAD_INSERT_PREFIX + "(" + ", ".join(["?"] * (1 + len(_PAYLOAD_COLUMNS))) + ")" + _ON_CONFLICT
+)
+
+
+def to_epoch(value) -> int:
+    """Convert a datetime (or ISO string) to Unix seconds; naive values are taken as UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return calendar.timegm(value.timetuple())
+    return int(value.timestamp())
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def from_epoch(seconds: int) -> datetime:
+    """Convert stored Unix seconds back to a naive UTC datetime (inverse of to_epoch)."""
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def _date_bounds(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Epoch range [start, end) covering whole days start_date..end_date (YYYY-MM-DD)."""
+    start = to_epoch(datetime.fromisoformat(start_date[:10])) if start_date else None
+    end = to_epoch(datetime.fromisoformat(end_date[:10]) + timedelta(days=1)) if end_date else None
+    return start, end
+
+
+def build_message_row(
     message_id: str,
     job_id: str,
     timestamp: datetime,
@@ -290,45 +777,199 @@ def insert_message(
     media_count: int = 0,
     toxicity_score: float = 0.0,
     is_toxic: bool = False,
-) -> bool:
-    """Insert a message with comprehensive analysis."""
+) -> Tuple[Tuple, Tuple]:
+    """
+    Build the parameter tuples for one message.
+    Returns: (messages row, message_payload row), see _INSERT_SQL / _PAYLOAD_INSERT_SQL.
+    """
+    message_row = (
+        message_id, job_id, to_epoch(timestamp),
+        sender, raw_text, cleaned_text, translated_text, message_type,
+        1 if is_media else 0, 1 if is_emoji_only else 0, 1 if is_link else 0,
+        detected_language, language_confidence,
+        vader_score, vader_label, textblob_score, textblob_label,
+        ensemble_score, ensemble_label, confidence_score,
+        top_emotion, media_count, toxicity_score, 1 if is_toxic else 0,
+        # Same test as _LABELS_DISAGREE_SQL
+        1 if vader_label != textblob_label or vader_label != ensemble_label else 0,
+    )
+    payload_row = (
+        message_id,
+        json.dumps(emotions) if emotions else None,
+        json.dumps(keywords) if keywords else None,
+        json.dumps(emoji_list) if emoji_list else None,
+        json.dumps(media_types) if media_types else None,
+    )
+    return message_row, payload_row
+
+
+def insert_messages(rows: List[Tuple[Tuple, Tuple]]) -> bool:
+    """Insert a batch of rows from build_message_row in a single transaction."""
+    if not rows:
+        return True
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO messages (
-                message_id, job_id, timestamp, sender, raw_text, cleaned_text,
-                translated_text, message_type, is_media, is_emoji_only, is_link,
-                detected_language, language_confidence,
-                vader_score, vader_label, textblob_score, textblob_label,
-                ensemble_score, ensemble_label, confidence_score,
-                emotions, top_emotion, keywords, emoji_list, media_types,
-                media_count, toxicity_score, is_toxic
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            message_id, job_id, timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
-            sender, raw_text, cleaned_text, translated_text, message_type,
-            1 if is_media else 0, 1 if is_emoji_only else 0, 1 if is_link else 0,
-            detected_language, language_confidence,
-            vader_score, vader_label, textblob_score, textblob_label,
-            ensemble_score, ensemble_label, confidence_score,
-            json.dumps(emotions) if emotions else None,
-            top_emotion,
-            json.dumps(keywords) if keywords else None,
-            json.dumps(emoji_list) if emoji_list else None,
-            json.dumps(media_types) if media_types else None,
-            media_count, toxicity_score, 1 if is_toxic else 0
-        ))
-        
-        conn.commit()
-        conn.close()
+        with _transaction() as cursor:
+            cursor.executemany(_INSERT_SQL, [message_row for message_row, _ in rows])
+            cursor.executemany(_PAYLOAD_INSERT_SQL, [payload_row for _, payload_row in rows])
+        _bump_job_versions(message_row[1] for message_row, _ in rows)
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to insert message {message_id}: {e}")
+        logger.error("✗ Failed to insert %s messages: %s", len(rows), e)
         return False
 
 
+def _multi_row_insert_sql(prefix: str, placeholder: str, row_count: int) -> str:
+    """INSERT statement with row_count VALUES groups."""
+    return prefix + ",".join([placeholder] * row_count) + _ON_CONFLICT
+
+
+def _execute_multi_row(cursor, prefix: str, rows: List[Tuple]) -> None:
+    """
+    Insert rows with multi-row VALUES statements, chunked so each statement
+    stays under SQLite's bound-variable limit.
+    """
+    params_per_row = len(rows[0])
+    try:
+        max_vars = cursor.connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    except AttributeError:
+        max_vars = 999  # Python < 3.11: assume the conservative default
+    placeholder = "(" + ", ".join(["?"] * params_per_row) + ")"
+    rows_per_chunk = max(1, max_vars // params_per_row)
+    full_sql = _multi_row_insert_sql(prefix, placeholder, rows_per_chunk)
+    for start in range(0, len(rows), rows_per_chunk):
+        chunk = rows[start:start + rows_per_chunk]
+        sql = full_sql if len(chunk) == rows_per_chunk else _multi_row_insert_sql(prefix, placeholder, len(chunk))
+        cursor.execute(sql, list(chain.from_iterable(chunk)))
+
+
+def bulk_insert_messages(rows: List[Tuple[Tuple, Tuple]]) -> bool:
+    """
+    Insert a large batch of rows from build_message_row using multi-row
+    VALUES statements; messages and payloads are written in one transaction.
+    """
+    if not rows:
+        return True
+    try:
+        with _transaction("BEGIN IMMEDIATE") as cursor:
+            _execute_multi_row(cursor, _INSERT_PREFIX, [message_row for message_row, _ in rows])
+            _execute_multi_row(cursor, _PAYLOAD_INSERT_PREFIX, [payload_row for _, payload_row in rows])
+        _bump_job_versions(message_row[1] for message_row, _ in rows)
+        return True
+    except Exception as e:
+        logger.error("✗ Failed to bulk insert %s messages: %s", len(rows), e)
+        return False
+
+
+# ============================================================================
+# BACKGROUND WRITER
+# ============================================================================
+
+# SQLite has a single writer, so single-message inserts are handed to one
+# writer thread that coalesces whatever is queued into one transaction.
+WRITER_BATCH_SIZE = 500
+_write_queue: "queue.Queue[Tuple[Tuple, Tuple]]" = queue.Queue(maxsize=10000)
+_writer_thread: Optional[threading.Thread] = None
+_writer_failed = 0
+
+
+def _writer_loop() -> None:
+    """Drain the write queue forever, up to WRITER_BATCH_SIZE rows per transaction."""
+    global _writer_failed
+    while True:
+        batch = [_write_queue.get()]
+        while len(batch) < WRITER_BATCH_SIZE:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if not bulk_insert_messages(batch):
+                with _lock:
+                    _writer_failed += len(batch)
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+
+def _ensure_writer() -> None:
+    """Start the writer thread on first use."""
+    global _writer_thread
+    with _lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_writer_loop, name="db-writer", daemon=True)
+            _writer_thread.start()
+
+
+def insert_message(*args, **kwargs) -> bool:
+    """
+    Queue a message (same arguments as build_message_row) for the background
+    writer. Blocks only while the queue is full; call flush() to wait for it.
+    """
+    row = build_message_row(*args, **kwargs)
+    _ensure_writer()
+    _write_queue.put(row)
+    return True
+
+
+def flush() -> int:
+    """Wait until every queued message is written; returns how many failed since the last flush."""
+    global _writer_failed
+    _write_queue.join()
+    with _lock:
+        failed, _writer_failed = _writer_failed, 0
+    return failed
+
+
+def _drop_message_indices(cursor) -> None:
+    """Drop the secondary indices on messages (PRIMARY KEY/UNIQUE stay for dedup)."""
+    for idx_name, table, _ in _INDICES:
+        if table == "messages":
+            cursor.execute(f"DROP INDEX IF EXISTS {idx_name}")
+
+
+def _create_message_indices(cursor) -> None:
+    """Recreate the secondary indices on messages."""
+    for idx_name, table, column in _INDICES:
+        if table == "messages":
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {table}({column})")
+
+
+@contextmanager
+def deferred_message_indices(expected_rows: int):
+    """
+    Drop the messages indices for the duration of a large ingest and rebuild
+    them afterwards, instead of maintaining them on every insert.
+
+    Only kicks in when messages is empty or nearly so (DEFER_INDICES_MAX_ROWS),
+    the ingest is bigger than what is already stored and no other ingest is
+    running; otherwise it is a no-op. If the process dies before the rebuild,
+    the next init_db() recreates the indices.
+    """
+    global _active_ingests
+    deferred = False
+    with _lock:
+        _active_ingests += 1
+        if _active_ingests == 1:
+            cursor = _get_conn().cursor()
+            cursor.execute("SELECT COALESCE(MAX(rowid), 0) AS n FROM messages")  # cheap size estimate
+            stored = cursor.fetchone()["n"]
+            if stored <= DEFER_INDICES_MAX_ROWS and expected_rows > stored:
+                with _transaction() as cursor:
+                    _drop_message_indices(cursor)
+                deferred = True
+    try:
+        yield
+    finally:
+        with _lock:
+            _active_ingests -= 1
+            if deferred:
+                with _transaction() as cursor:
+                    _create_message_indices(cursor)
+                    # Fresh planner statistics so the new indices get picked
+                    cursor.execute("ANALYZE messages")
+                logger.info("✓ Rebuilt message indices after bulk ingest")
+
+
 # ============================================================================
 # MESSAGE QUERYING WITH FILTERS
 # ============================================================================
@@ -345,170 +986,305 @@ def query_messages_advanced(
     is_toxic: Optional[bool] = None,
     limit: int = 50,
     offset: int = 0,
+    include_payload: bool = False,
+    after: Optional[Tuple[int, int]] = None,
 ) -> Tuple[List[Dict], int]:
     """
     Advanced message filtering with multiple criteria.
+    JSON payload columns (emotions, keywords, ...) are only included when
+    include_payload is set; timestamp is epoch seconds (see from_epoch).
+    Every row carries its rowid: with after=(timestamp, rowid) of the last row
+    seen, the page starts right after it (keyset pagination; offset is ignored)
+    and SQLite seeks there through the index instead of skipping offset rows.
     Returns: (messages, total_count)
     """
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
-        
-        where_clauses = []
-        params = []
-        
-        if job_id:
-            where_clauses.append("job_id = ?")
-            params.append(job_id)
-        
-        if start_date:
-            where_clauses.append("DATE(timestamp) >= ?")
-            params.append(start_date)
-        
-        if end_date:
-            where_clauses.append("DATE(timestamp) <= ?")
-            params.append(end_date)
-        
-        if sender:
-            where_clauses.append("sender = ?")
-            params.append(sender)
-        
-        if keyword:
-            where_clauses.append("raw_text LIKE ?")
-            params.append(f"%{keyword}%")
-        
-        if sentiment:
-            where_clauses.append("ensemble_label = ?")
-            params.append(sentiment)
-        
-        if language:
-            where_clauses.append("detected_language = ?")
-            params.append(language)
-        
-        if message_type:
-            where_clauses.append("message_type = ?")
-            params.append(message_type)
-        
-        if is_toxic is not None:
-            where_clauses.append("is_toxic = ?")
-            params.append(1 if is_toxic else 0)
-        
-        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-        
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM messages WHERE {where_clause}"
-        cursor.execute(count_query, params)
-        total = cursor.fetchone()["total"]
-        
-        # Get paginated results
-        query = f"""
-            SELECT * FROM messages
-            WHERE {where_clause}
-            ORDER BY timestamp DESC
-            LIMIT ? OFFSET ?
-        """
-        cursor.execute(query, params + [limit, offset])
-        messages = cursor.fetchall()
-        
-        conn.close()
+        start_ts, end_ts = _date_bounds(start_date, end_date)
+    except ValueError as e:
+        logger.error("✗ Invalid date filter: %s", e)
+        return [], 0
+
+    # Filter values in _FILTER_CLAUSES order; None means the filter is off
+    pattern = f"%{keyword}%" if keyword else None
+    values = (
+        job_id or None,
+        start_ts,
+        end_ts,
+        sender or None,
+        pattern if pattern and _use_fts(keyword) else None,
+        pattern,
+        sentiment or None,
+        language or None,
+        message_type or None,
+        None if is_toxic is None else (1 if is_toxic else 0),
+    )
+    mask = 0
+    params = []
+    for bit, value in enumerate(values):
+        if value is not None:
+            mask |= 1 << bit
+            params.append(value)
+
+    try:
+        where_clause, query = _build_query(mask, after is not None)
+        # Get total count (cached until the job receives new messages)
+        total = _count_messages(where_clause, tuple(params), _job_version.get(job_id or None, 0))
+
+        with _reader() as cursor:
+            # Get paginated results
+            if after is not None:
+                cursor.execute(query, params + [*after, limit, 0])
+            else:
+                cursor.execute(query, params + [limit, offset])
+            messages = [dict(row) for row in cursor.fetchall()]
+
+            # Payload blobs only for the rows on this page
+            if include_payload and messages:
+                cursor.execute(
+                    f"SELECT {', '.join(('message_id',) + _PAYLOAD_COLUMNS)} FROM message_payload "
+                    f"WHERE message_id IN ({', '.join(['?'] * len(messages))})",
+                    [msg["message_id"] for msg in messages],
+                )
+                payloads = {row[0]: row for row in cursor.fetchall()}
+                empty = dict.fromkeys(_PAYLOAD_COLUMNS)
+                for msg in messages:
+                    row = payloads.get(msg["message_id"])
+                    msg.update(zip(_PAYLOAD_COLUMNS, row[1:]) if row else empty)
         return messages, total
     except Exception as e:
-        logger.error(f"✗ Query failed: {e}")
+        logger.error("✗ Query failed: %s", e)
         return [], 0
 
 
+# WHERE fragments for query_messages_advanced, in filter-bitmask order
+_FILTER_CLAUSES = (
+    "job_id = ?",
+    "timestamp >= ?",
+    "timestamp < ?",
+    "sender = ?",
+    # keyword: the trigram index narrows the candidates, and LIKE decides, so
+    # results are the same case-insensitive substring match with or without it
+    "rowid IN (SELECT rowid FROM messages_fts WHERE messages_fts.raw_text LIKE ?)",
+    "raw_text LIKE ?",
+    "ensemble_label = ?",
+    "detected_language = ?",
+    "message_type = ?",
+    "is_toxic = ?",
+)
+
+
+@lru_cache(maxsize=2 << len(_FILTER_CLAUSES))
+def _build_query(mask: int, keyset: bool = False) -> Tuple[str, str]:
+    """
+    Build (where_clause, page_query) for a filter bitmask. There are only a
+    few hundred combinations, so each SQL string is assembled once. With
+    keyset the page query takes the (timestamp, rowid) to continue after.
+    """
+    where_clauses = [clause for bit, clause in enumerate(_FILTER_CLAUSES) if mask & (1 << bit)]
+    where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+    page_where = where_clause
+    if keyset:
+        page_where += " AND (messages.timestamp, messages.rowid) < (?, ?)"
+    query = f"""
+        SELECT {_message_read_columns()}, messages.rowid AS rowid FROM messages
+        WHERE {page_where}
+        ORDER BY messages.timestamp DESC, messages.rowid DESC
+        LIMIT ? OFFSET ?
+    """
+    return where_clause, query
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _count_messages(where_clause: str, params: Tuple, version: int) -> int:
+    """COUNT(*) for a filter; version is part of the cache key only."""
+    with _reader() as cursor:
+        cursor.execute(f"SELECT COUNT(*) as total FROM messages WHERE {where_clause}", params)
+        return cursor.fetchone()["total"]
+
+
 def get_message_by_id(message_id: str) -> Optional[Dict]:
     """Get a single message by ID with all details."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM messages WHERE message_id = ?", (message_id,))
-        message = cursor.fetchone()
-        conn.close()
-        return message
+        with _reader() as cursor:
+            cursor.execute(f"""
+                SELECT {_message_read_columns("m.")}, {_PAYLOAD_SELECT}
+                FROM messages m
+                LEFT JOIN message_payload p ON p.message_id = m.message_id
+                WHERE m.message_id = ?
+            """, (message_id,))
+            message = cursor.fetchone()
+        return dict(message) if message else None
     except Exception as e:
-        logger.error(f"✗ Failed to retrieve message {message_id}: {e}")
+        logger.error("✗ Failed to retrieve message %s: %s", message_id, e)
         return None
 
 
-# ============================================================================
-# EMOJI ANALYTICS
-# ============================================================================
+def get_messages_by_ids(message_ids: List[str]) -> Dict[str, Dict]:
+    """get_message_by_id for several ids in one query; ids that don't exist are absent."""
+    if not message_ids:
+        return {}
+    try:
+        with _reader() as cursor:
+            cursor.execute(f"""
+                SELECT {_message_read_columns("m.")}, {_PAYLOAD_SELECT}
+                FROM messages m
+                LEFT JOIN message_payload p ON p.message_id = m.message_id
+                WHERE m.message_id IN ({", ".join(["?"] * len(message_ids))})
+            """, message_ids)
+            return {message["message_id"]: dict(message) for message in cursor.fetchall()}
+    except Exception as e:
+        logger.error("✗ Failed to retrieve %d messages: %s", len(message_ids), e)
+        return {}
 
-def upsert_emoji(job_id: str, emoji_char: str, emoji_name: str = None, emoji_category: str = None) -> str:
-    """Add or update emoji analytics entry."""
+
+def get_message_payload(message_id: str) -> Optional[Dict]:
+    """Get the JSON payload columns (emotions, keywords, emoji_list, media_types) of a message."""
     try:
-        emoji_id = f"{job_id}_{emoji_char}"
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO emoji_analytics (emoji_id, job_id, emoji_char, emoji_name, emoji_category, first_used, last_used)
-            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ON CONFLICT(job_id, emoji_char) DO UPDATE SET
-                usage_count = usage_count + 1,
-                last_used = CURRENT_TIMESTAMP
-        """, (emoji_id, job_id, emoji_char, emoji_name, emoji_category))
-        
-        conn.commit()
-        conn.close()
-        return emoji_id
+        with _reader() as cursor:
+            cursor.execute("SELECT * FROM message_payload WHERE message_id = ?", (message_id,))
+            payload = cursor.fetchone()
+        return dict(payload) if payload else None
     except Exception as e:
-        logger.error(f"✗ Failed to upsert emoji {emoji_char}: {e}")
+        logger.error("✗ Failed to retrieve payload for message %s: %s", message_id, e)
         return None
 
 
-def record_emoji_sender(emoji_id: str, sender: str) -> bool:
-    """Record which user used an emoji."""
+# Both queries read the stored has_disagreement flag through
+# idx_msg_job_disagree_ts, so they touch only the job's index range and the
+# matching rows.
+_DISAGREEMENT_COUNTS_SQL = """
+    SELECT COUNT(*) AS total, COALESCE(SUM(has_disagreement), 0) AS disagreements
+    FROM messages WHERE job_id = ?
+"""
+_DISAGREEMENT_ROWS_SQL = """
+    SELECT message_id, substr(raw_text, 1, 100) AS text, sender,
+           vader_label, vader_score, textblob_label, textblob_score,
+           ensemble_label, ensemble_score
+    FROM messages
+    WHERE job_id = ? AND has_disagreement = 1
+    ORDER BY timestamp DESC, rowid DESC
+    LIMIT ?
+"""
+
+
+def get_disagreement_messages(job_id: str, limit: int = 10000) -> Tuple[List[Dict], int, int]:
+    """
+    Messages of a job whose VADER, TextBlob and ensemble labels are not all equal,
+    newest first.
+    Returns: (rows, disagreement_count, total_messages)
+    """
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO emoji_senders (emoji_id, sender, count)
-            VALUES (?, ?, 1)
-            ON CONFLICT(emoji_id, sender) DO UPDATE SET
-                count = count + 1
-        """, (emoji_id, sender))
-        
-        # Update unique user count in emoji_analytics
-        cursor.execute("""
-            UPDATE emoji_analytics SET unique_users = (
-                SELECT COUNT(DISTINCT sender) FROM emoji_senders WHERE emoji_id = ?
-            ) WHERE emoji_id = ?
-        """, (emoji_id, emoji_id))
-        
-        conn.commit()
-        conn.close()
+        with _reader() as cursor:
+            cursor.execute(_DISAGREEMENT_COUNTS_SQL, (job_id,))
+            counts = cursor.fetchone()
+            cursor.execute(_DISAGREEMENT_ROWS_SQL, (job_id, limit))
+            rows = [dict(row) for row in cursor.fetchall()]
+        return rows, counts["disagreements"], counts["total"]
+    except Exception as e:
+        logger.error("✗ Failed to query disagreements for job %s: %s", job_id, e)
+        return [], 0, 0
+
+
+def count_disagreements(job_id: str) -> Tuple[int, int]:
+    """Returns: (disagreement_count, total_messages) of a job."""
+    try:
+        with _reader() as cursor:
+            cursor.execute(_DISAGREEMENT_COUNTS_SQL, (job_id,))
+            counts = cursor.fetchone()
+        return counts["disagreements"], counts["total"]
+    except Exception as e:
+        logger.error("✗ Failed to count disagreements for job %s: %s", job_id, e)
+        return 0, 0
+
+
+def iter_disagreement_messages(job_id: str, limit: int = 10000, batch_size: int = 500) -> Iterator[List[Dict]]:
+    """
+    The rows of get_disagreement_messages in lists of up to batch_size, read
+    from an open cursor so a caller streaming them never holds them all.
+    The pooled connection is held until the iterator is exhausted or closed.
+    """
+    try:
+        with _reader() as cursor:
+            cursor.execute(_DISAGREEMENT_ROWS_SQL, (job_id, limit))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [dict(row) for row in rows]
+    except Exception as e:
+        logger.error("✗ Failed to stream disagreements for job %s: %s", job_id, e)
+
+
+# ============================================================================
+# EMOJI ANALYTICS
+# ============================================================================
+
+def record_emojis_for_job(job_id: str, per_message_emojis: List[Tuple[str, List[str]]]) -> bool:
+    """
+    Record emoji usage for a batch of messages in one transaction.
+
+    per_message_emojis is [(sender, [emoji_char, ...]), ...]. Usage counts are
+    aggregated in Python first, so each distinct emoji and (emoji, sender)
+    pair is written once, and unique_users is recounted once per call.
+    """
+    emoji_counts = Counter()
+    sender_counts = Counter()
+    for sender, emojis in per_message_emojis:
+        for emoji_char in emojis:
+            emoji_counts[emoji_char] += 1
+            sender_counts[(emoji_char, sender)] += 1
+    if not emoji_counts:
+        return True
+
+    try:
+        with _transaction() as cursor:
+            cursor.executemany("""
+                INSERT INTO emoji_analytics (job_id, emoji_char, usage_count, first_used, last_used)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                ON CONFLICT(job_id, emoji_char) DO UPDATE SET
+                    usage_count = usage_count + excluded.usage_count,
+                    last_used = CURRENT_TIMESTAMP
+            """, [(job_id, emoji_char, count) for emoji_char, count in emoji_counts.items()])
+            # emoji_id is resolved through UNIQUE(job_id, emoji_char)
+            cursor.executemany("""
+                INSERT INTO emoji_senders (emoji_id, sender, count)
+                SELECT emoji_id, ?, ? FROM emoji_analytics WHERE job_id = ? AND emoji_char = ?
+                ON CONFLICT(emoji_id, sender) DO UPDATE SET
+                    count = count + excluded.count
+            """, [
+                (sender, count, job_id, emoji_char)
+                for (emoji_char, sender), count in sender_counts.items()
+            ])
+            cursor.execute("""
+                UPDATE emoji_analytics SET unique_users = (
+                    SELECT COUNT(DISTINCT sender) FROM emoji_senders
+                    WHERE emoji_id = emoji_analytics.emoji_id
+                ) WHERE job_id = ?
+            """, (job_id,))
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to record emoji sender: {e}")
+        logger.error("✗ Failed to record emojis for job %s: %s", job_id, e)
         return False
 
 
-def get_emoji_analytics(job_id: str, limit: int = 50) -> List[Dict]:
+def get_emoji_analytics(job_id: str, limit: int = TOP_EMOJIS_COUNT) -> List[Dict]:
     """Get emoji analytics for a job."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
+        with _reader() as cursor:
         
-        cursor.execute("""
-            SELECT ea.*, 
-                   (SELECT GROUP_CONCAT(sender, ',') FROM emoji_senders WHERE emoji_id = ea.emoji_id) as user_list
-            FROM emoji_analytics ea
-            WHERE ea.job_id = ?
-            ORDER BY ea.usage_count DESC
-            LIMIT ?
-        """, (job_id, limit))
+            cursor.execute("""
+                SELECT ea.*, 
+                       (SELECT GROUP_CONCAT(sender, ',') FROM emoji_senders WHERE emoji_id = ea.emoji_id) as user_list
+                FROM emoji_analytics ea
+                WHERE ea.job_id = ?
+                ORDER BY ea.usage_count DESC
+                LIMIT ?
+            """, (job_id, limit))
         
-        emojis = cursor.fetchall()
-        conn.close()
+            emojis = [dict(row) for row in cursor.fetchall()]
         return emojis
     except Exception as e:
-        logger.error(f"✗ Failed to get emoji analytics: {e}")
+        logger.error("✗ Failed to get emoji analytics: %s", e)
         return []
 
 
@@ -526,29 +1302,54 @@ def insert_media(
 ) -> bool:
     """Record detected media in a message."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
+        with _lock:
+            conn = _get_conn()
+            cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO media_analytics (media_id, job_id, message_id, sender, media_type, description)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (media_id, job_id, message_id, sender, media_type, description))
-        
-        conn.commit()
-        conn.close()
+            cursor.execute("""
+                INSERT INTO media_analytics (media_id, job_id, message_id, sender, media_type, description)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (media_id, job_id, message_id, sender, media_type, description))
+        _bump_job_versions([job_id])
+        return True
+    except Exception as e:
+        logger.error("✗ Failed to insert media %s: %s", media_id, e)
+        return False
+
+
+def bulk_insert_media(rows: List[Tuple]) -> bool:
+    """
+    Record many media items in one transaction. Each row is
+    (media_id, job_id, message_id, sender, media_type, description).
+    """
+    if not rows:
+        return True
+    try:
+        with _transaction() as cursor:
+            cursor.executemany("""
+                INSERT INTO media_analytics (media_id, job_id, message_id, sender, media_type, description)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+        _bump_job_versions(row[1] for row in rows)
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to insert media {media_id}: {e}")
+        logger.error("✗ Failed to bulk insert %s media items: %s", len(rows), e)
         return False
 
 
 def get_media_analytics(job_id: str) -> Dict[str, Any]:
     """Get media analytics for a job."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
-        
+        return _media_analytics(job_id)
+    except Exception as e:
+        logger.error("✗ Failed to get media analytics: %s", e)
+        return {"total_media": 0, "media_by_type": {}, "top_senders": {}}
+
+
+@_cached_per_job
+def _media_analytics(job_id: str) -> Dict[str, Any]:
+    with _reader() as cursor:
+    
         # Get media count by type
         cursor.execute("""
             SELECT media_type, COUNT(*) as count
@@ -557,13 +1358,13 @@ def get_media_analytics(job_id: str) -> Dict[str, Any]:
             GROUP BY media_type
             ORDER BY count DESC
         """, (job_id,))
-        
+    
         media_by_type = {row["media_type"]: row["count"] for row in cursor.fetchall()}
-        
+    
         # Get total media count
         cursor.execute("SELECT COUNT(*) as total FROM media_analytics WHERE job_id = ?", (job_id,))
         total = cursor.fetchone()["total"]
-        
+    
         # Get top senders
         cursor.execute("""
             SELECT sender, COUNT(*) as count
@@ -573,109 +1374,136 @@ def get_media_analytics(job_id: str) -> Dict[str, Any]:
             ORDER BY count DESC
             LIMIT 10
         """, (job_id,))
-        
+    
         top_senders = {row["sender"]: row["count"] for row in cursor.fetchall()}
-        
-        conn.close()
-        
-        return {
-            "total_media": total,
-            "media_by_type": media_by_type,
-            "top_senders": top_senders
-        }
-    except Exception as e:
-        logger.error(f"✗ Failed to get media analytics: {e}")
-        return {"total_media": 0, "media_by_type": {}, "top_senders": {}}
+    
+    return {
+        "total_media": total,
+        "media_by_type": media_by_type,
+        "top_senders": top_senders
+    }
 
 
 # ============================================================================
 # AGGREGATED STATISTICS
 # ============================================================================
 
+# Every per-job aggregate in one statement. Each subquery is answered from its
+# own covering (job_id, ...) index; json_group_object/array package the
+# GROUP BY results so they come back as one row. JSON object keys cannot be
+# NULL, so NULL groups are keyed "null" (what json.dumps makes of a None key).
+_JOB_AGGREGATES_SQL = """
+    SELECT
+        (SELECT json_group_object(IFNULL(ensemble_label, 'null'), json_object('count', count, 'avg_score', avg_score))
+         FROM (SELECT ensemble_label, COUNT(*) AS count, AVG(ensemble_score) AS avg_score
+               FROM messages WHERE job_id = :job_id
+               GROUP BY ensemble_label)) AS sentiment_dist,
+        (SELECT json_group_object(IFNULL(detected_language, 'null'), count)
+         FROM (SELECT detected_language, COUNT(*) AS count
+               FROM messages WHERE job_id = :job_id
+               GROUP BY detected_language
+               ORDER BY count DESC)) AS language_dist,
+        (SELECT json_group_object(IFNULL(message_type, 'null'), count)
+         FROM (SELECT message_type, COUNT(*) AS count
+               FROM messages WHERE job_id = :job_id
+               GROUP BY message_type)) AS message_type_dist,
+        (SELECT json_group_array(json_object('sender', sender, 'messages', count, 'avg_sentiment', avg_sentiment))
+         FROM (SELECT sender, COUNT(*) AS count, AVG(ensemble_score) AS avg_sentiment
+               FROM messages WHERE job_id = :job_id
+               GROUP BY sender
+               ORDER BY count DESC
+               LIMIT 20)) AS top_senders,
+        (SELECT COUNT(*) FROM messages WHERE job_id = :job_id) AS total,
+        (SELECT SUM(CASE WHEN is_toxic=1 THEN 1 ELSE 0 END) FROM messages WHERE job_id = :job_id) AS toxic_count
+"""
+
+
+def _compute_job_aggregates(cursor, job_id: str) -> Dict[str, Any]:
+    """Compute the per-job GROUP BY aggregates over messages in one round trip."""
+    cursor.execute(_JOB_AGGREGATES_SQL, {"job_id": job_id})
+    row = cursor.fetchone()
+    toxic_count = row["toxic_count"] or 0
+
+    return {
+        "sentiment_distribution": json.loads(row["sentiment_dist"]),
+        "language_distribution": json.loads(row["language_dist"]),
+        "message_type_distribution": json.loads(row["message_type_dist"]),
+        "top_senders": json.loads(row["top_senders"]),
+        "toxicity": {
+            "total_messages": row["total"],
+            "toxic_messages": toxic_count,
+            "toxicity_rate": toxic_count / (row["total"] or 1) * 100
+        }
+    }
+
+
+def _materialize_job_stats(cursor, job_id: str) -> None:
+    """Store the job's aggregates in job_stats (messages are final once a job completes)."""
+    stats = _compute_job_aggregates(cursor, job_id)
+    cursor.execute("""
+        INSERT OR REPLACE INTO job_stats (
+            job_id, sentiment_dist, language_dist, message_type_dist,
+            top_senders, toxicity, total_messages, computed_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """, (
+        job_id,
+        json.dumps(stats["sentiment_distribution"]),
+        json.dumps(stats["language_distribution"]),
+        json.dumps(stats["message_type_distribution"]),
+        json.dumps(stats["top_senders"]),
+        json.dumps(stats["toxicity"]),
+        stats["toxicity"]["total_messages"],
+    ))
+
+
 def get_job_statistics(job_id: str) -> Dict[str, Any]:
-    """Get comprehensive statistics for a job."""
+    """
+    Get comprehensive statistics for a job.
+    Completed jobs are served from job_stats; running jobs are aggregated live.
+    """
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
-        
+        return _job_statistics(job_id)
+    except Exception as e:
+        logger.error("✗ Failed to get job statistics: %s", e)
+        return {}
+
+
+@_cached_per_job
+def _job_statistics(job_id: str) -> Dict[str, Any]:
+    with _reader() as cursor:
+
         # Get job info
         cursor.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
         job = cursor.fetchone()
-        
+
         if not job:
             return {}
-        
-        # Sentiment distribution
-        cursor.execute("""
-            SELECT ensemble_label, COUNT(*) as count, AVG(ensemble_score) as avg_score
-            FROM messages
-            WHERE job_id = ?
-            GROUP BY ensemble_label
-        """, (job_id,))
-        sentiment_dist = {row["ensemble_label"]: {"count": row["count"], "avg_score": row["avg_score"]} for row in cursor.fetchall()}
-        
-        # Language distribution
-        cursor.execute("""
-            SELECT detected_language, COUNT(*) as count
-            FROM messages
-            WHERE job_id = ?
-            GROUP BY detected_language
-            ORDER BY count DESC
-        """, (job_id,))
-        language_dist = {row["detected_language"]: row["count"] for row in cursor.fetchall()}
-        
-        # Message type distribution
-        cursor.execute("""
-            SELECT message_type, COUNT(*) as count
-            FROM messages
-            WHERE job_id = ?
-            GROUP BY message_type
-        """, (job_id,))
-        message_type_dist = {row["message_type"]: row["count"] for row in cursor.fetchall()}
-        
-        # Top senders
-        cursor.execute("""
-            SELECT sender, COUNT(*) as count, AVG(ensemble_score) as avg_sentiment
-            FROM messages
-            WHERE job_id = ?
-            GROUP BY sender
-            ORDER BY count DESC
-            LIMIT 20
-        """, (job_id,))
-        top_senders = [{"sender": row["sender"], "messages": row["count"], "avg_sentiment": row["avg_sentiment"]} for row in cursor.fetchall()]
-        
-        # Toxicity stats
-        cursor.execute("""
-            SELECT COUNT(*) as total, SUM(CASE WHEN is_toxic=1 THEN 1 ELSE 0 END) as toxic_count
-            FROM messages
-            WHERE job_id = ?
-        """, (job_id,))
-        toxicity = cursor.fetchone()
-        
-        conn.close()
-        
-        return {
-            "job": job,
-            "sentiment_distribution": sentiment_dist,
-            "language_distribution": language_dist,
-            "message_type_distribution": message_type_dist,
-            "top_senders": top_senders,
-            "toxicity": {
-                "total_messages": toxicity["total"],
-                "toxic_messages": toxicity["toxic_count"] or 0,
-                "toxicity_rate": (toxicity["toxic_count"] or 0) / (toxicity["total"] or 1) * 100
+
+        cursor.execute("SELECT * FROM job_stats WHERE job_id = ?", (job_id,))
+        cached = cursor.fetchone()
+        if cached and job["status"] == "completed":
+            stats = {
+                "sentiment_distribution": json.loads(cached["sentiment_dist"]),
+                "language_distribution": json.loads(cached["language_dist"]),
+                "message_type_distribution": json.loads(cached["message_type_dist"]),
+                "top_senders": json.loads(cached["top_senders"]),
+                "toxicity": json.loads(cached["toxicity"]),
             }
-        }
-    except Exception as e:
-        logger.error(f"✗ Failed to get job statistics: {e}")
-        return {}
+        else:
+            stats = _compute_job_aggregates(cursor, job_id)
+
+    return {"job": dict(job), **stats}
 
 
 # ============================================================================
 # SUMMARY STORAGE
 # ============================================================================
 
+def _dumps_json(value: Any) -> str:
+    """Encode a summary column; numpy scalars and non-string keys are accepted."""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+
 def save_summary(
     summary_id: str,
     job_id: str,
@@ -686,43 +1514,53 @@ def save_summary(
     sentiment_timeline: Dict = None,
     top_keywords: List = None,
 ) -> bool:
-    """Save conversation summary to database."""
+    """Save conversation summary to database, updating the job's existing summary in place."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        cursor = conn.cursor()
+        with _lock:
+            conn = _get_conn()
+            cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO summaries (
+            cursor.execute("""
+                INSERT INTO summaries (
+                    summary_id, job_id, short_summary, detailed_summary,
+                    key_topics, emotional_trend, sentiment_timeline, top_keywords
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    summary_id = excluded.summary_id,
+                    short_summary = excluded.short_summary,
+                    detailed_summary = excluded.detailed_summary,
+                    key_topics = excluded.key_topics,
+                    emotional_trend = excluded.emotional_trend,
+                    sentiment_timeline = excluded.sentiment_timeline,
+                    top_keywords = excluded.top_keywords,
+                    created_at = CURRENT_TIMESTAMP
+            """, (
                 summary_id, job_id, short_summary, detailed_summary,
-                key_topics, emotional_trend, sentiment_timeline, top_keywords
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            summary_id, job_id, short_summary, detailed_summary,
-            json.dumps(key_topics) if key_topics else None,
-            json.dumps(emotional_trend) if emotional_trend else None,
-            json.dumps(sentiment_timeline) if sentiment_timeline else None,
-            json.dumps(top_keywords) if top_keywords else None,
-        ))
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"✓ Summary saved for job {job_id}")
+                _dumps_json(key_topics) if key_topics else None,
+                _dumps_json(emotional_trend) if emotional_trend else None,
+                _dumps_json(sentiment_timeline) if sentiment_timeline else None,
+                _dumps_json(top_keywords) if top_keywords else None,
+            ))
+        _bump_job_versions([job_id])
+        logger.info("✓ Summary saved for job %s", job_id)
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to save summary: {e}")
+        logger.error("✗ Failed to save summary: %s", e)
         return False
 
 
 def get_summary(job_id: str) -> Optional[Dict]:
     """Retrieve summary for a job."""
     try:
-        conn = sqlite3.connect(DATABASE_FILE)
-        conn.row_factory = dict_factory
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM summaries WHERE job_id = ?", (job_id,))
-        summary = cursor.fetchone()
-        conn.close()
-        return summary
+        return _summary(job_id)
     except Exception as e:
-        logger.error(f"✗ Failed to retrieve summary: {e}")
+        logger.error("✗ Failed to retrieve summary: %s", e)
         return None
+
+
+@_cached_per_job
+def _summary(job_id: str) -> Optional[Dict]:
+    with _reader() as cursor:
+        cursor.execute("SELECT * FROM summaries WHERE job_id = ?", (job_id,))
+        summary = cursor.fetchone()
+    return dict(summary) if summary else None
@@ -0,0 +1,92 @@
+"""
+Thread-safe SQLite connection pool.
+
+Connections are opened lazily, up to `size`, and reused across calls so each
+request skips sqlite3.connect() and keeps a warm page cache. A caller that
+finds every connection checked out blocks until one is returned.
+close() only closes idle connections; ones checked out at the time are
+closed when they come back instead of being handed out again.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+
+class ConnectionPool:
+    """Fixed-size pool of sqlite3 connections shared between threads."""
+
+    def __init__(
+        self,
+        database: str,
+        size: int = 10,
+        setup: Optional[Callable[[sqlite3.Connection], None]] = None,
+        **connect_kwargs,
+    ):
+        self.database = database
+        self.size = size
+        self._setup = setup
+        self._connect_kwargs = connect_kwargs
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened: List[sqlite3.Connection] = []
+        # Checked out when close() ran; still count towards size until returned
+        self._retiring = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database, check_same_thread=False, **self._connect_kwargs)
+        if self._setup:
+            self._setup(conn)
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if len(self._opened) + self._retiring < self.size:
+                    conn = self._open()
+                    self._opened.append(conn)
+                    return conn
+            # A retiring connection frees a slot without being queued, so wait
+            # in short steps and recheck rather than blocking on the queue
+            try:
+                return self._idle.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if any(conn is opened for opened in self._opened):
+                self._idle.put(conn)
+                return
+            self._retiring -= 1
+        conn.close()
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """Check a connection out for the duration of the with-block."""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._checkin(conn)
+
+    def close(self) -> None:
+        """
+        Close every idle connection and retire the checked-out ones, which are
+        closed as they are returned; the pool reopens connections on next use.
+        """
+        with self._lock:
+            idle = 0
+            while not self._idle.empty():
+                self._idle.get_nowait().close()
+                idle += 1
+            self._retiring += len(self._opened) - idle
+            self._opened.clear()
@@ -1,18 +1,35 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from backend.services.nlp_service import nlp_service
-from backend.schemas import AnalysisResult, ParsingError, PaginatedMessages, MessageDB, FilterStats
-from backend.database import init_db, insert_message, query_messages, get_stats
+from fastapi.responses import StreamingResponse
+from backend.services.nlp_service import analyze_chat_file
+from backend.schemas import AnalysisResult, ParsingError, PaginatedMessages, FilterStats
+from backend.database import (
+    init_db, insert_messages, query_messages, get_message_by_id, query_disagreements, get_stats, optimize_db, close_db,
+    save_job, get_job, encode_json_column, decode_json_column,
+)
+from backend.responses import ORJSONResponse, ORJSON_OPTIONS
 from backend.services.summarization_service import get_summarization_service
 from backend.services.multilingual_service import get_multilingual_service
+from backend.services.language import shutdown_detect_executor
 from backend.services.explainable_ai_service import get_explainable_ai_service
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from uuid import uuid4
+import asyncio
+import io
 import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
 import traceback
-from typing import Any, Dict, Optional
-import json
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
+import orjson
+
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,12 +37,51 @@ logger = logging.getLogger(__name__)
 # Initialize database
 init_db()
 
-app = FastAPI()
 
-# --- Job Store ---
-# In-memory store for job statuses and results.
-# For production, a more robust solution like Redis would be used.
-job_store = {}
+MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # bytes copied per read when spooling an upload
+
+# How often the database refreshes its query planner statistics
+OPTIMIZE_INTERVAL_SECONDS = 15 * 60
+
+
+async def _optimize_periodically():
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        await run_in_threadpool(optimize_db)
+
+
+# Chat analysis is CPU-bound, so it runs in worker processes instead of
+# holding the GIL in the server process. Workers are spawned rather than
+# forked because the server process already runs threads.
+ANALYSIS_WORKERS = os.cpu_count() or 1
+_analysis_executor: Optional[ProcessPoolExecutor] = None
+_analysis_executor_lock = threading.Lock()
+
+
+def _get_analysis_executor() -> ProcessPoolExecutor:
+    global _analysis_executor
+    with _analysis_executor_lock:
+        if _analysis_executor is None:
+            _analysis_executor = ProcessPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _analysis_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(_optimize_periodically())
+    yield
+    task.cancel()
+    if _analysis_executor is not None:
+        _analysis_executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_detect_executor()
+    close_db()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # --- CORS ---
 origins = ["http://localhost:5173", "http://127.0.0.1:5173"]
@@ -37,59 +93,111 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def run_analysis_task(job_id: str, content: str):
+# Whitespace is dropped from sender names in message ids
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _message_row(job_id: str, msg: Dict[str, Any]) -> tuple:
+    """Database row (column order of insert_messages) for one analyzed message."""
+    msg_id = f"{job_id}_{msg.get('timestamp', '')}_{_WHITESPACE_RE.sub('', msg.get('sender', ''))}"
+
+    # Extract sentiment scores
+    sentiment = msg.get('sentiment', {})
+    emotions_json = encode_json_column(msg.get('emotions', {}))
+    keywords_list = [k[0] for k in msg.get('keywords', [])]  # Extract keyword names
+    keywords_json = encode_json_column(keywords_list)
+
+    return (
+        msg_id,
+        job_id,
+        msg.get('timestamp', ''),
+        msg.get('sender', ''),
+        msg.get('message', ''),
+        msg.get('translated_message'),
+        msg.get('language', 'en'),
+        sentiment.get('vader_score', 0.0),
+        sentiment.get('textblob_score', 0.0),
+        sentiment.get('ensemble_score', 0.0),
+        sentiment.get('ensemble_label', 'Neutral'),
+        emotions_json,
+        keywords_json,
+        None,
+        None,
+    )
+
+
+# --- Job completion ---
+# Jobs started by this process have an event that is set once their final
+# state is stored, so /results/{job_id}/stream can push it right away.
+# Streams for other jobs re-read the jobs table on every heartbeat instead.
+SSE_HEARTBEAT_SECONDS = 5
+_job_finished: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = {}
+
+
+def _finish_job(job_id: str, status: str, **fields):
+    """Store a job's final state and wake any stream waiting on it (callable from any thread)."""
+    save_job(job_id, status, **fields)
+    waiter = _job_finished.pop(job_id, None)
+    if waiter:
+        loop, event = waiter
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # the event loop has already shut down
+
+
+def run_analysis_task(job_id: str, path: str):
     """The background task that runs the NLP analysis and stores results in database."""
     logger.info("Background task started for job %s", job_id)
     try:
-        results = nlp_service.analyze_chat(content)
+        # Runs in a worker process, which reads the spooled upload itself; results
+        # are stored from this thread so the database caches of this process see the writes
+        results = _get_analysis_executor().submit(analyze_chat_file, path).result()
         
         # If analyze_chat returns an error payload, mark as failed with details
         if isinstance(results, dict) and results.get('error'):
             logger.error("Analysis returned error for job %s: %s", job_id, results.get('error'))
-            job_store[job_id] = {"status": "failed", "error": results.get('error'), "detail": results}
+            _finish_job(job_id, "failed", error=results.get('error'), detail=results)
             return
         
         # Store messages in database
         try:
             messages = results.get('messages', [])
-            for msg in messages:
-                msg_id = f"{job_id}_{msg.get('timestamp', '')}_{''.join(msg.get('sender', '').split())}"
-                
-                # Extract sentiment scores
-                sentiment = msg.get('sentiment', {})
-                emotions_json = json.dumps(msg.get('emotions', {}))
-                keywords_list = [k[0] for k in msg.get('keywords', [])]  # Extract keyword names
-                keywords_json = json.dumps(keywords_list)
-                
-                # Insert message into database
-                insert_message(
-                    msg_id=msg_id,
-                    job_id=job_id,
-                    timestamp=msg.get('timestamp', ''),
-                    sender=msg.get('sender', ''),
-                    text=msg.get('message', ''),
-                    translated_text=msg.get('translated_message'),
-                    language=msg.get('language', 'en'),
-                    vader_score=sentiment.get('vader_score', 0.0),
-                    textblob_score=sentiment.get('textblob_score', 0.0),
-                    ensemble_score=sentiment.get('ensemble_score', 0.0),
-                    ensemble_label=sentiment.get('ensemble_label', 'Neutral'),
-                    emotions=emotions_json,
-                    keywords=keywords_json,
-                )
-            logger.info(f"Stored {len(messages)} messages for job {job_id}")
+            # One executemany in one transaction for the whole chat
+            insert_messages([_message_row(job_id, msg) for msg in messages])
+            logger.info("Stored %s messages for job %s", len(messages), job_id)
         except Exception as e:
-            logger.warning(f"Failed to store messages in database: {e}")
+            logger.warning("Failed to store messages in database: %s", e)
             # Continue anyway - don't fail the analysis
         
         # Store result atomically
-        job_store[job_id] = {"status": "complete", "result": results}
+        _finish_job(job_id, "complete", result=results)
         logger.info("Background task complete for job %s", job_id)
         
     except Exception as e:
-        tb = traceback.format_exc()
+        # logger.exception logs the traceback; the job only keeps a copy when debugging
+        tb = traceback.format_exc() if logger.isEnabledFor(logging.DEBUG) else None
         logger.exception("Analysis failed for job %s: %s", job_id, str(e))
-        job_store[job_id] = {"status": "failed", "error": str(e), "traceback": tb}
+        _finish_job(job_id, "failed", error=str(e), traceback=tb)
+    finally:
+        os.remove(path)
+
+def _spool_upload(upload: UploadFile) -> Optional[str]:
+    """
+    Copy an upload to a temporary file in fixed-size chunks.
+    Returns: the file's path, or None (and no file) when it holds only whitespace.
+    """
+    upload.file.seek(0)
+    has_text = False
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as spool:
+        while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+            has_text = has_text or bool(chunk.strip())
+            spool.write(chunk)
+    if not has_text:
+        os.remove(spool.name)
+        return None
+    return spool.name
+
 
 @app.post("/analyze", status_code=202)
 async def analyze_chat_endpoint(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
@@ -100,42 +208,37 @@ async def analyze_chat_endpoint(background_tasks: BackgroundTasks, file: UploadF
     if not file.filename or not file.filename.lower().endswith(".txt"):
         return {"error": "Only .txt files are allowed."}
 
-    # Read and validate file content
+    # Validate size before reading anything
+    if file.size == 0:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File size exceeds {MAX_FILE_SIZE / (1024*1024):.0f}MB limit")
+
+    # Copy the upload to disk in chunks; the analysis reads it from there line by line
     try:
-        file_content = await file.read()
+        chat_path = await run_in_threadpool(_spool_upload, file)
     except Exception as e:
         logger.error("Failed to read uploaded file: %s", e)
         raise HTTPException(status_code=400, detail="Failed to read uploaded file.")
 
-    if not file_content:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
-
-    # Decode with utf-8 with replacement to avoid UnicodeDecodeError
-    try:
-        chat_content = file_content.decode("utf-8")
-    except Exception:
-        try:
-            chat_content = file_content.decode("utf-8", errors='replace')
-            logger.warning("Uploaded file had encoding issues; decoded with replacement characters.")
-        except Exception as e:
-            logger.error("Failed to decode file: %s", e)
-            raise HTTPException(status_code=400, detail="Failed to decode file. Ensure it's UTF-8 encoded.")
-
     # Basic content validation
-    if len(chat_content.strip()) == 0:
+    if chat_path is None:
         raise HTTPException(status_code=400, detail="Uploaded file contains no readable text.")
 
     job_id = str(uuid4())
-    job_store[job_id] = {"status": "processing"}
+    save_job(job_id, "processing")
+    _job_finished[job_id] = (asyncio.get_running_loop(), asyncio.Event())
 
     # Run analysis in background with protected wrapper and log scheduling
     try:
         logger.info("Scheduling background analysis task for job %s", job_id)
-        background_tasks.add_task(run_analysis_task, job_id, chat_content)
+        background_tasks.add_task(run_analysis_task, job_id, chat_path)
     except Exception as e:
-        tb = traceback.format_exc()
+        os.remove(chat_path)
+        # logger.exception logs the traceback; the job only keeps a copy when debugging
+        tb = traceback.format_exc() if logger.isEnabledFor(logging.DEBUG) else None
         logger.exception("Failed to schedule background task for job %s: %s", job_id, str(e))
-        job_store[job_id] = {"status": "failed", "error": str(e), "traceback": tb}
+        _finish_job(job_id, "failed", error=str(e), traceback=tb)
         raise HTTPException(status_code=500, detail={"error": "Failed to start analysis task.", "detail": str(e)})
 
     return {"job_id": job_id}
@@ -145,10 +248,46 @@ async def get_analysis_results(job_id: str):
     """
     Poll this endpoint with the job_id to get the analysis status and results.
     """
-    job = job_store.get(job_id)
+    job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail={"error": "Job not found."})
+    # The full result can run to megabytes; orjson encodes it without a
+    # jsonable_encoder pass over every message
+    return ORJSONResponse(_results_payload(job))
+
+
+@app.get("/results/{job_id}/stream")
+async def stream_analysis_results(job_id: str):
+    """
+    Server-Sent Events alternative to polling /results/{job_id}: sends the
+    /results payload as a "processing" heartbeat every SSE_HEARTBEAT_SECONDS
+    and once more, as the last event, when the job finishes.
+    """
+    if not get_job(job_id):
+        raise HTTPException(status_code=404, detail={"error": "Job not found."})
 
+    async def events():
+        while True:
+            # Taken before the read so a completion in between is not missed
+            waiter = _job_finished.get(job_id)
+            job = get_job(job_id)
+            payload = _results_payload(job) if job else {"status": "failed", "error": "Job not found."}
+            yield b"data: " + orjson.dumps(payload, option=ORJSON_OPTIONS) + b"\n\n"
+            if payload["status"] != "processing":
+                return
+            try:
+                if waiter:
+                    await asyncio.wait_for(waiter[1].wait(), SSE_HEARTBEAT_SECONDS)
+                else:
+                    await asyncio.sleep(SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _results_payload(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Response body of /results for a stored job."""
     if job.get("status") == "processing":
         return {"status": "processing"}
 
@@ -221,44 +360,27 @@ async def get_messages(
             offset=offset,
         )
 
-        # Convert rows to MessageDB objects
-        message_objects = []
+        # Rows already carry exactly the MessageDB fields; only the JSON columns
+        # need decoding, so the page is returned without per-row model validation
         for msg in messages:
-            # Parse JSON fields
-            emotions = json.loads(msg["emotions"]) if msg["emotions"] else None
-            keywords = json.loads(msg["keywords"]) if msg["keywords"] else None
-
-            msg_obj = MessageDB(
-                id=msg["id"],
-                timestamp=msg["timestamp"],
-                sender=msg["sender"],
-                text=msg["text"],
-                translated_text=msg["translated_text"],
-                language=msg["language"],
-                vader_score=msg["vader_score"],
-                textblob_score=msg["textblob_score"],
-                ensemble_score=msg["ensemble_score"],
-                ensemble_label=msg["ensemble_label"],
-                emotions=emotions,
-                keywords=keywords,
-            )
-            message_objects.append(msg_obj)
+            for field in ("emotions", "keywords", "emojis", "media_urls"):
+                msg[field] = decode_json_column(msg[field])
 
         # Calculate pagination metadata
         total_pages = (total + limit - 1) // limit
 
-        return PaginatedMessages(
-            messages=message_objects,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages,
-        )
+        return ORJSONResponse({
+            "messages": messages,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": total_pages,
+        })
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid query parameter: {str(e)}")
     except Exception as e:
-        logger.exception(f"Error querying messages: {str(e)}")
+        logger.exception("Error querying messages: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve messages")
 
 
@@ -285,7 +407,7 @@ async def get_filtered_stats(
         )
         return FilterStats(**stats)
     except Exception as e:
-        logger.exception(f"Error computing stats: {str(e)}")
+        logger.exception("Error computing stats: %s", e)
         raise HTTPException(status_code=500, detail="Failed to compute statistics")
 
 
@@ -304,7 +426,7 @@ async def summarize_job(job_id: str):
     - Key topics extracted
     - Emotional trend analysis over time
     """
-    job = job_store.get(job_id)
+    job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -315,9 +437,15 @@ async def summarize_job(job_id: str):
         result = job.get("result", {})
         messages = result.get("messages", [])
         
-        # Get all message texts
-        message_texts = [msg.get("message", "") for msg in messages]
-        combined_text = " ".join(message_texts)
+        # Concatenate message texts without an intermediate list of strings
+        buf = io.StringIO()
+        buf_write = buf.write
+        separator = ""
+        for msg in messages:
+            buf_write(separator)
+            buf_write(msg.get("message", ""))
+            separator = " "
+        combined_text = buf.getvalue()
         
         # Generate summaries
         summarization_service = get_summarization_service()
@@ -329,7 +457,7 @@ async def summarize_job(job_id: str):
             "analysis": summary
         }
     except Exception as e:
-        logger.exception(f"Error generating summary: {e}")
+        logger.exception("Error generating summary: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate summary")
 
 
@@ -362,10 +490,7 @@ async def translate_message(text: str, target_language: str = "en"):
         source_lang, confidence = multilingual_service.detect_language(text)
         
         # Check for Hinglish
-        is_hinglish = multilingual_service.detect_hinglish(text)
-        hinglish_analysis = None
-        if is_hinglish:
-            hinglish_analysis = multilingual_service.analyze_hinglish_sentiment(text)
+        is_hinglish, hinglish_analysis = multilingual_service.analyze_hinglish(text)
         
         # Translate
         translated = multilingual_service.translate_text(text, source_lang, target_language)
@@ -382,7 +507,7 @@ async def translate_message(text: str, target_language: str = "en"):
             "hinglish_analysis": hinglish_analysis
         }
     except Exception as e:
-        logger.exception(f"Error translating text: {e}")
+        logger.exception("Error translating text: %s", e)
         raise HTTPException(status_code=500, detail="Translation failed")
 
 
@@ -397,7 +522,7 @@ async def get_language_statistics(job_id: str):
     - Primary language
     - Language diversity score
     """
-    job = job_store.get(job_id)
+    job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -416,7 +541,7 @@ async def get_language_statistics(job_id: str):
             "language_statistics": stats
         }
     except Exception as e:
-        logger.exception(f"Error getting language stats: {e}")
+        logger.exception("Error getting language stats: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get language statistics")
 
 
@@ -437,22 +562,8 @@ async def explain_sentiment(message_id: str):
     - Final verdict with confidence
     """
     try:
-        # Query the message from database
-        messages, _ = query_messages(limit=1000)
-        
-        message_data = None
-        for msg in messages:
-            if msg["id"] == message_id:
-                message_data = {
-                    "id": msg["id"],
-                    "text": msg["text"],
-                    "vader_score": msg["vader_score"],
-                    "textblob_score": msg["textblob_score"],
-                    "ensemble_score": msg["ensemble_score"],
-                    "ensemble_label": msg["ensemble_label"]
-                }
-                break
-        
+        # Primary-key lookup of the message
+        message_data = get_message_by_id(message_id)
         if not message_data:
             raise HTTPException(status_code=404, detail="Message not found")
         
@@ -463,12 +574,16 @@ async def explain_sentiment(message_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.exception(f"Error generating explanation: {e}")
+        logger.exception("Error generating explanation: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate explanation")
 
 
 @app.get("/disagreements/{job_id}")
-async def find_model_disagreements(job_id: str):
+async def find_model_disagreements(
+    job_id: str,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum disagreements to return (default: all)"),
+    offset: int = Query(0, ge=0, description="Number of disagreements to skip"),
+):
     """
     Find all messages where sentiment models disagree.
     
@@ -478,7 +593,7 @@ async def find_model_disagreements(job_id: str):
     - Possible reasons for disagreement
     - Count of disagreements
     """
-    job = job_store.get(job_id)
+    job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -486,33 +601,31 @@ async def find_model_disagreements(job_id: str):
         raise HTTPException(status_code=400, detail="Job not complete")
     
     try:
-        result = job.get("result", {})
-        messages = result.get("messages", [])
+        # The disagreement test runs in SQL; only matching rows come back
+        rows, disagreement_count, total_messages = query_disagreements(job_id, limit, offset)
         
         explainable_ai = get_explainable_ai_service()
-        disagreements = []
-        
-        for msg in messages:
-            sentiment = msg.get("sentiment", {})
-            vader = sentiment.get("vader_score", 0)
-            textblob = sentiment.get("textblob_score", 0)
-            
-            disagreement = explainable_ai.find_disagreements(vader, textblob)
-            if disagreement:
-                disagreements.append({
-                    "message": msg.get("message", "")[:100],
-                    "sender": msg.get("sender"),
-                    "timestamp": msg.get("timestamp"),
-                    "disagreement_info": disagreement
-                })
+        disagreement_infos = explainable_ai.find_disagreements_batch(
+            [row["vader_score"] for row in rows],
+            [row["textblob_score"] for row in rows],
+        )
+        disagreements = [
+            {
+                "message": row["text"],
+                "sender": row["sender"],
+                "timestamp": row["timestamp"],
+                "disagreement_info": info
+            }
+            for row, info in zip(rows, disagreement_infos)
+        ]
         
-        return {
+        return ORJSONResponse({
             "job_id": job_id,
-            "total_messages": len(messages),
-            "disagreement_count": len(disagreements),
-            "disagreement_rate": f"{len(disagreements) / len(messages) * 100:.1f}%" if messages else "0%",
+            "total_messages": total_messages,
+            "disagreement_count": disagreement_count,
+            "disagreement_rate": f"{disagreement_count / total_messages * 100:.1f}%" if total_messages else "0%",
             "disagreements": disagreements
-        }
+        })
     except Exception as e:
-        logger.exception(f"Error finding disagreements: {e}")
-        raise HTTPException(status_code=500, detail="Failed to find disagreements")
\ No newline at end of file
+        logger.exception("Error finding disagreements: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to find disagreements")
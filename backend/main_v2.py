@@ -2,8 +2,9 @@
 WhatsApp Sentiment Analyzer v2.0 - Production-Grade Backend
 Refactored with persistent job storage, emoji analytics, media detection, and robust error handling.
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from backend.services.nlp_service import nlp_service
 from backend.schemas_v2 import (
     JobStatus, JobStatistics, Message, PaginatedMessages,
@@ -12,23 +13,36 @@ from backend.schemas_v2 import (
 )
 from backend.database_v2 import (
     init_db, create_job, update_job_status, get_job, get_job_statistics,
-    insert_message, query_messages_advanced, get_message_by_id,
-    upsert_emoji, record_emoji_sender, get_emoji_analytics,
-    insert_media, get_media_analytics,
-    save_summary, get_summary
+    build_message_row, bulk_insert_messages, from_epoch, deferred_message_indices, query_messages_advanced, get_message_by_id,
+    get_messages_by_ids, get_disagreement_messages, count_disagreements, iter_disagreement_messages,
+    record_emojis_for_job, get_emoji_analytics,
+    bulk_insert_media, get_media_analytics,
+    save_summary, get_summary, optimize_db, close_db
 )
+from backend.message_fields import prepare_message_fields, shutdown_prepare_executor
 from backend.services.summarization_service import get_summarization_service
 from backend.services.multilingual_service import get_multilingual_service
-from backend.services.explainable_ai_service import get_explainable_ai_service
+from backend.services.language import shutdown_detect_executor
+from backend.services.explainable_ai_service import EXPLAINER_VERSION, get_explainable_ai_service
+from backend.responses import ORJSONResponse
+from backend.config import EXPLANATION_CACHE_SIZE
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from uuid import uuid4
+import asyncio
+import base64
+import binascii
+import hashlib
 import logging
+import os
+import tempfile
 import traceback
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
-import json
-import re
 import time
-from html import unescape
+
+import orjson
 
 # ============================================================================
 # CONFIGURATION & SETUP
@@ -40,10 +54,31 @@ logger = logging.getLogger(__name__)
 # Initialize database
 init_db()
 
+OPTIMIZE_INTERVAL_SECONDS = 15 * 60  # PRAGMA optimize cadence
+
+
+async def _optimize_periodically():
+    """Keep SQLite planner statistics fresh while the app is running."""
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        await run_in_threadpool(optimize_db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(_optimize_periodically())
+    yield
+    task.cancel()
+    shutdown_prepare_executor()
+    shutdown_detect_executor()
+    close_db()
+
+
 app = FastAPI(
     title="WhatsApp Sentiment Analyzer v2.0",
     description="Production-grade sentiment analysis with emoji & media analytics",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -62,131 +97,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
 # Constants
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+INSERT_BATCH_SIZE = 1000  # messages written per database transaction
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # bytes copied per read when spooling an upload
 SUPPORTED_LANGUAGES = ["en", "hi", "es", "fr", "de", "it", "pt", "ru", "ja", "zh", "ko", "ar"]
 
 
-# ============================================================================
-# UTILITY FUNCTIONS
-# ============================================================================
-
-def detect_message_type(text: str) -> Tuple[str, bool, bool, bool]:
-    """
-    Detect message type: text, media, emoji_only, link, document
-    Returns: (message_type, is_media, is_emoji_only, is_link)
-    """
-    if not text:
-        return "text", False, False, False
-    
-    text_lower = text.lower()
-    
-    # Check for media omitted
-    if "<media omitted>" in text_lower or "image omitted" in text_lower or "video omitted" in text_lower:
-        return "media", True, False, False
-    
-    # Check for links
-    link_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    has_link = bool(re.search(link_pattern, text))
-    if has_link:
-        return "link", False, False, True
-    
-    # Check for emoji-only
-    emoji_pattern = r'[\U0001F300-\U0001F9FF]+|[\U0001F600-\U0001F64F]|[\U0001F300-\U0001F5FF]'
-    emojis = re.findall(emoji_pattern, text)
-    non_emoji_text = re.sub(emoji_pattern, "", text).strip()
-    
-    if emojis and not non_emoji_text:
-        return "emoji_only", False, True, False
-    
-    # Check for document extensions
-    doc_extensions = ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar']
-    if any(ext in text_lower for ext in doc_extensions):
-        return "document", True, False, False
-    
-    return "text", False, False, False
-
-
-def extract_emojis(text: str) -> List[str]:
-    """Extract all emojis from text."""
-    if not text:
-        return []
-    
-    emoji_pattern = r'[\U0001F300-\U0001F9FF]+|[\U0001F600-\U0001F64F]|[\U0001F300-\U0001F5FF]|[\u2600-\u27BF]|[\u2300-\u23FF]|[\u2000-\u206F]'
-    emojis = re.findall(emoji_pattern, text)
-    return list(set(emojis))  # Remove duplicates
-
-
-def detect_media_types(text: str) -> Tuple[List[str], int]:
-    """Detect media types mentioned in message."""
-    media_types = []
-    
-    if "<media omitted>" in text.lower():
-        # Could be any media type - mark as generic
-        media_types.append("media")
-    elif "image" in text.lower():
-        media_types.append("image")
-    elif "video" in text.lower():
-        media_types.append("video")
-    elif "audio" in text.lower() or "voice" in text.lower():
-        media_types.append("audio")
-    elif "document" in text.lower() or "file" in text.lower():
-        media_types.append("document")
-    
-    return media_types, len(media_types)
-
-
-def normalize_timestamp(timestamp_str: str) -> Optional[datetime]:
-    """
-    Normalize various timestamp formats to ISO datetime.
-    Handles: MM/DD/YYYY HH:MM, DD/MM/YYYY HH:MM, YYYY-MM-DD HH:MM, etc.
-    """
-    formats = [
-        "%m/%d/%Y, %H:%M",  # 12/25/2023, 14:30
-        "%m/%d/%Y, %H:%M:%S",
-        "%d/%m/%Y, %H:%M",  # 25/12/2023, 14:30
-        "%d/%m/%Y, %H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%m/%d/%y, %H:%M",
-        "%d/%m/%y, %H:%M",
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(timestamp_str, fmt)
-        except ValueError:
-            continue
-    
-    logger.warning(f"Could not normalize timestamp: {timestamp_str}")
-    return None
-
-
-def sanitize_text(text: str) -> str:
-    """Clean and sanitize message text."""
-    if not text:
-        return ""
-    
-    # Remove HTML entities
-    text = unescape(text)
-    
-    # Remove extra whitespace
-    text = " ".join(text.split())
-    
-    return text
-
-
 # ============================================================================
 # BACKGROUND ANALYSIS TASK
 # ============================================================================
 
-def run_analysis_task(job_id: str, content: str, filename: str):
+def run_analysis_task(job_id: str, path: str, filename: str):
     """
     Background task: parse chat, analyze sentiment, store in database.
     Includes chunking for large files and comprehensive error handling.
     """
     task_start = time.time()
-    logger.info(f"🔄 Starting analysis for job {job_id} - {filename}")
+    logger.info("🔄 Starting analysis for job %s - %s", job_id, filename)
     
     try:
         # Create job record
@@ -194,15 +123,16 @@ def run_analysis_task(job_id: str, content: str, filename: str):
             raise Exception("Failed to create job record")
         
         # Parse chat with NLP service
-        logger.info(f"📝 Parsing chat content for job {job_id}")
-        parse_result = nlp_service.analyze_chat(content)
+        logger.info("📝 Parsing chat content for job %s", job_id)
+        with open(path, encoding="utf-8", errors="replace") as chat_file:
+            parse_result = nlp_service.analyze_chat(chat_file)
         
         # Handle parsing errors
         if isinstance(parse_result, dict) and parse_result.get('error'):
             error_msg = parse_result.get('error')
             debug_info = parse_result.get('debug_info', {})
             
-            logger.error(f"✗ Parse error for job {job_id}: {error_msg}")
+            logger.error("✗ Parse error for job %s: %s", job_id, error_msg)
             update_job_status(
                 job_id, "failed",
                 error_message=error_msg,
@@ -211,102 +141,117 @@ def run_analysis_task(job_id: str, content: str, filename: str):
             return
         
         messages = parse_result.get('messages', [])
-        logger.info(f"✓ Parsed {len(messages)} messages for job {job_id}")
+        logger.info("✓ Parsed %s messages for job %s", len(messages), job_id)
         
         # Store messages with comprehensive analysis
         stored_count = 0
         failed_count = 0
+        score_sum = 0.0  # ensemble scores of stored messages
+        pending = []  # (row, message_id, sender, emojis, media_types)
+        pending_score = 0.0
         
-        for idx, msg in enumerate(messages):
-            try:
-                # Extract core data
-                timestamp = normalize_timestamp(msg.get('timestamp', ''))
-                if not timestamp:
-                    logger.warning(f"Could not normalize timestamp: {msg.get('timestamp')}")
-                    timestamp = datetime.now()
+        def flush_pending():
+            """Write the pending batch, then its emoji/media analytics."""
+            nonlocal stored_count, failed_count, score_sum, pending_score
+            if not pending:
+                return
+            if bulk_insert_messages([item[0] for item in pending]):
+                stored_count += len(pending)
+                score_sum += pending_score
+                record_emojis_for_job(job_id, [(sender, emojis) for _, _, sender, emojis, _ in pending])
+                bulk_insert_media([
+                    (f"{message_id}_{i}", job_id, message_id, sender, media_type, None)
+                    for _, message_id, sender, _, media_types in pending
+                    for i, media_type in enumerate(media_types)
+                ])
+            else:
+                failed_count += len(pending)
+                logger.warning("Failed to store batch of %s messages", len(pending))
+            pending.clear()
+            pending_score = 0.0
+        
+        prepared = prepare_message_fields(messages)
+        
+        # Large first-time ingests skip per-row index maintenance
+        with deferred_message_indices(len(messages)):
+            for idx, (msg, fields) in enumerate(zip(messages, prepared)):
+                try:
+                    # Extract core data
+                    timestamp, cleaned_text, type_info, emojis, (media_types, media_count) = fields
+                    if not timestamp:
+                        logger.warning("Could not normalize timestamp: %s", msg.get('timestamp'))
+                        timestamp = datetime.now()
                 
-                raw_text = msg.get('message', '')
-                cleaned_text = sanitize_text(raw_text)
-                message_type, is_media, is_emoji_only, is_link = detect_message_type(raw_text)
-                emojis = extract_emojis(raw_text)
-                media_types, media_count = detect_media_types(raw_text)
+                    raw_text = msg.get('message', '')
+                    message_type, is_media, is_emoji_only, is_link = type_info
+                    sender = msg.get('sender', 'Unknown')
                 
-                # Generate message ID
-                message_id = f"{job_id}_{timestamp.isoformat()}_{msg.get('sender', 'Unknown').replace(' ', '_')}"
+                    # Generate message ID: 24 hex chars from the job and the message's
+                    # position, unique even for same-minute messages from one sender
+                    message_id = hashlib.blake2b(f"{job_id}_{idx}".encode(), digest_size=12).hexdigest()
                 
-                # Extract sentiment scores
-                sentiment = msg.get('sentiment', {})
-                emotions = msg.get('emotions', {})
-                keywords = msg.get('keywords', [])
+                    # Extract sentiment scores
+                    sentiment = msg.get('sentiment', {})
+                    ensemble_score = sentiment.get('ensemble_score', 0.0)
+                    emotions = msg.get('emotions', {})
+                    keywords = msg.get('keywords', [])
                 
-                # Determine top emotion
-                top_emotion = max(emotions.items(), key=lambda x: x[1])[0] if emotions else None
+                    # Determine top emotion
+                    top_emotion = max(emotions, key=emotions.__getitem__) if emotions else None
                 
-                # Store message
-                success = insert_message(
-                    message_id=message_id,
-                    job_id=job_id,
-                    timestamp=timestamp,
-                    sender=msg.get('sender', 'Unknown'),
-                    raw_text=raw_text,
-                    cleaned_text=cleaned_text,
-                    translated_text=msg.get('translated_message'),
-                    message_type=message_type,
-                    is_media=is_media,
-                    is_emoji_only=is_emoji_only,
-                    is_link=is_link,
-                    detected_language=msg.get('language', 'en'),
-                    language_confidence=msg.get('language_confidence', 0.0),
-                    vader_score=sentiment.get('vader_score', 0.0),
-                    vader_label=sentiment.get('vader_label', 'Neutral'),
-                    textblob_score=sentiment.get('textblob_score', 0.0),
-                    textblob_label=sentiment.get('textblob_label', 'Neutral'),
-                    ensemble_score=sentiment.get('ensemble_score', 0.0),
-                    ensemble_label=sentiment.get('ensemble_label', 'Neutral'),
-                    confidence_score=sentiment.get('confidence', 0.0),
-                    emotions=emotions,
-                    top_emotion=top_emotion,
-                    keywords=keywords,
-                    emoji_list=emojis,
-                    media_types=media_types,
-                    media_count=media_count,
-                    toxicity_score=msg.get('toxicity_score', 0.0),
-                    is_toxic=msg.get('is_toxic', False),
-                )
+                    # Queue message; rows are written in batches of INSERT_BATCH_SIZE
+                    row = build_message_row(
+                        message_id=message_id,
+                        job_id=job_id,
+                        timestamp=timestamp,
+                        sender=sender,
+                        raw_text=raw_text,
+                        cleaned_text=cleaned_text,
+                        translated_text=msg.get('translated_message'),
+                        message_type=message_type,
+                        is_media=is_media,
+                        is_emoji_only=is_emoji_only,
+                        is_link=is_link,
+                        detected_language=msg.get('language', 'en'),
+                        language_confidence=msg.get('language_confidence', 0.0),
+                        vader_score=sentiment.get('vader_score', 0.0),
+                        vader_label=sentiment.get('vader_label', 'Neutral'),
+                        textblob_score=sentiment.get('textblob_score', 0.0),
+                        textblob_label=sentiment.get('textblob_label', 'Neutral'),
+                        ensemble_score=ensemble_score,
+                        ensemble_label=sentiment.get('ensemble_label', 'Neutral'),
+                        confidence_score=sentiment.get('confidence', 0.0),
+                        emotions=emotions,
+                        top_emotion=top_emotion,
+                        keywords=keywords,
+                        emoji_list=emojis,
+                        media_types=media_types,
+                        media_count=media_count,
+                        toxicity_score=msg.get('toxicity_score', 0.0),
+                        is_toxic=msg.get('is_toxic', False),
+                    )
+                    pending.append((row, message_id, sender, emojis, media_types if media_count > 0 else []))
+                    pending_score += ensemble_score
                 
-                if success:
-                    stored_count += 1
-                    
-                    # Record emojis
-                    for emoji in emojis:
-                        emoji_id = upsert_emoji(job_id, emoji)
-                        if emoji_id:
-                            record_emoji_sender(emoji_id, msg.get('sender', 'Unknown'))
-                    
-                    # Record media
-                    if media_count > 0:
-                        for i, media_type in enumerate(media_types):
-                            media_id = f"{message_id}_{i}"
-                            insert_media(media_id, job_id, message_id, msg.get('sender', 'Unknown'), media_type)
-                else:
-                    failed_count += 1
-                    logger.warning(f"Failed to store message {message_id}")
+                    if len(pending) >= INSERT_BATCH_SIZE:
+                        flush_pending()
                 
-                # Log progress
-                if (idx + 1) % 100 == 0:
-                    logger.info(f"📊 Progress: {idx + 1}/{len(messages)} messages processed")
+                    # Log progress
+                    if (idx + 1) % 100 == 0:
+                        logger.info("Progress: %s/%s messages processed", idx + 1, len(messages))
                 
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"✗ Error processing message {idx}: {e}")
-                continue
+                except Exception as e:
+                    failed_count += 1
+                    logger.error("Error processing message %s: %s", idx, e)
+                    continue
+        
+            flush_pending()
         
-        logger.info(f"✓ Stored {stored_count}/{len(messages)} messages (failed: {failed_count})")
+        logger.info("✓ Stored %s/%s messages (failed: %s)", stored_count, len(messages), failed_count)
         
-        # Calculate overall sentiment
+        # Calculate overall sentiment (accumulated as batches were stored)
         if stored_count > 0:
-            ensemble_scores = [msg.get('sentiment', {}).get('ensemble_score', 0.0) for msg in messages[:stored_count]]
-            overall_score = sum(ensemble_scores) / len(ensemble_scores) if ensemble_scores else 0.0
+            overall_score = score_sum / stored_count
             overall_label = "Positive" if overall_score > 0.1 else ("Negative" if overall_score < -0.1 else "Neutral")
         else:
             overall_score = 0.0
@@ -323,23 +268,42 @@ def run_analysis_task(job_id: str, content: str, filename: str):
             processing_time_seconds=processing_time
         )
         
-        logger.info(f"✅ Job {job_id} completed in {processing_time:.2f}s")
+        logger.info("✅ Job %s completed in %.2fs", job_id, processing_time)
         
     except Exception as e:
-        logger.error(f"✗ Analysis failed for job {job_id}: {e}")
-        logger.error(traceback.format_exc())
+        logger.error("✗ Analysis failed for job %s: %s", job_id, e, exc_info=True)
         
+        # The log above has the traceback; the job only keeps a copy when debugging
         update_job_status(
             job_id, "failed",
             error_message=str(e),
-            error_traceback=traceback.format_exc()
+            error_traceback=traceback.format_exc() if logger.isEnabledFor(logging.DEBUG) else None
         )
+    finally:
+        os.remove(path)
 
 
 # ============================================================================
 # API ENDPOINTS - ANALYSIS & UPLOADS
 # ============================================================================
 
+def _spool_upload(upload: UploadFile) -> Optional[str]:
+    """
+    Copy an upload to a temporary file in fixed-size chunks.
+    Returns: the file's path, or None (and no file) when it holds only whitespace.
+    """
+    upload.file.seek(0)
+    has_text = False
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as spool:
+        while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+            has_text = has_text or bool(chunk.strip())
+            spool.write(chunk)
+    if not has_text:
+        os.remove(spool.name)
+        return None
+    return spool.name
+
+
 @app.post("/analyze", status_code=202, response_model=Dict[str, str])
 async def analyze_chat_endpoint(
     background_tasks: BackgroundTasks,
@@ -349,51 +313,45 @@ async def analyze_chat_endpoint(
     Upload and analyze a WhatsApp chat export file.
     Returns job_id for polling analysis status.
     """
-    logger.info(f"📥 New upload: {file.filename}")
+    logger.info("📥 New upload: %s", file.filename)
     
     # Validate filename
     if not file.filename or not file.filename.lower().endswith(".txt"):
-        logger.warning(f"Invalid file type: {file.filename}")
+        logger.warning("Invalid file type: %s", file.filename)
         raise HTTPException(
             status_code=400,
             detail="Only .txt files are supported. Please export your WhatsApp chat as .txt"
         )
     
     try:
-        # Read file
-        file_content = await file.read()
-        
-        if not file_content:
+        # Check the size Starlette recorded before reading anything
+        if file.size == 0:
             raise HTTPException(status_code=400, detail="Uploaded file is empty.")
         
-        if len(file_content) > MAX_FILE_SIZE:
+        if file.size is not None and file.size > MAX_FILE_SIZE:
             raise HTTPException(
                 status_code=413,
                 detail=f"File size exceeds {MAX_FILE_SIZE / (1024*1024):.0f}MB limit"
             )
         
-        # Decode
-        try:
-            chat_content = file_content.decode("utf-8")
-        except UnicodeDecodeError:
-            chat_content = file_content.decode("utf-8", errors='replace')
-            logger.warning("File had encoding issues, decoded with replacement")
+        # Copy the upload to disk in chunks; the task parses it from there line by line
+        chat_path = await run_in_threadpool(_spool_upload, file)
         
         # Validate content
-        if len(chat_content.strip()) == 0:
+        if chat_path is None:
             raise HTTPException(status_code=400, detail="File contains no readable text.")
         
         # Create analysis job
         job_id = str(uuid4())
-        background_tasks.add_task(run_analysis_task, job_id, chat_content, file.filename)
+        background_tasks.add_task(run_analysis_task, job_id, chat_path, file.filename)
         
-        logger.info(f"✓ Job {job_id} queued for analysis")
+        logger.info("✓ Job %s queued for analysis", job_id)
         return {"job_id": job_id, "status": "processing"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"✗ Upload error: {e}")
+        logger.error("✗ Upload error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to process upload")
 
 
@@ -445,7 +403,7 @@ async def get_analysis_results(job_id: str):
         media_stats = get_media_analytics(job_id)
         summary = get_summary(job_id)
         
-        return {
+        return ORJSONResponse({
             "status": "complete",
             "job_id": job_id,
             "job": job,
@@ -453,7 +411,7 @@ async def get_analysis_results(job_id: str):
             "emoji_analytics": emoji_stats,
             "media_analytics": media_stats,
             "summary": summary
-        }
+        })
     
     raise HTTPException(status_code=400, detail="Unknown job status")
 
@@ -462,6 +420,70 @@ async def get_analysis_results(job_id: str):
 # API ENDPOINTS - MESSAGE FILTERING & SEARCH
 # ============================================================================
 
+_PAYLOAD_FIELDS = ("emotions", "keywords", "emoji_list", "media_types")
+
+
+def _decode_payload(msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a message's JSON payload columns; missing or empty ones become None."""
+    return {field: orjson.loads(msg[field]) if msg.get(field) else None for field in _PAYLOAD_FIELDS}
+
+
+_NO_PAYLOAD = dict.fromkeys(_PAYLOAD_FIELDS)
+
+
+def _page_token(msg: Dict[str, Any]) -> str:
+    """Opaque /messages continuation token: the listing key (timestamp, rowid) of a row."""
+    return base64.urlsafe_b64encode(f"{msg['timestamp']}.{msg['rowid']}".encode()).decode()
+
+
+def _parse_page_token(token: str) -> Tuple[int, int]:
+    try:
+        timestamp, rowid = base64.urlsafe_b64decode(token.encode()).decode().split(".")
+        return int(timestamp), int(rowid)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid page token")
+
+
+def _message_dict(msg: Dict[str, Any], include_payload: bool) -> Dict[str, Any]:
+    """
+    A stored row shaped like the Message schema (same keys and order) without
+    running validation: rows were built by our own ingest, and pydantic
+    validation was most of the /messages response time.
+    """
+    payload = _decode_payload(msg) if include_payload else _NO_PAYLOAD
+    return {
+        "message_id": msg.get("message_id"),
+        "timestamp": from_epoch(msg["timestamp"]),
+        "sender": msg.get("sender"),
+        "raw_text": msg.get("raw_text"),
+        "cleaned_text": msg.get("cleaned_text"),
+        "translated_text": msg.get("translated_text"),
+        "message_type": msg.get("message_type", "text"),
+        "is_media": bool(msg.get("is_media")),
+        "is_emoji_only": bool(msg.get("is_emoji_only")),
+        "is_link": bool(msg.get("is_link")),
+        "detected_language": msg.get("detected_language", "en"),
+        "language_confidence": msg.get("language_confidence", 0.0),
+        "sentiment": {
+            "vader_score": msg.get("vader_score", 0.0),
+            "vader_label": msg.get("vader_label", "Neutral"),
+            "textblob_score": msg.get("textblob_score", 0.0),
+            "textblob_label": msg.get("textblob_label", "Neutral"),
+            "ensemble_score": msg.get("ensemble_score", 0.0),
+            "ensemble_label": msg.get("ensemble_label", "Neutral"),
+            "confidence": msg.get("confidence_score", 0.0),
+        },
+        "emotions": payload["emotions"],
+        "top_emotion": msg.get("top_emotion"),
+        "keywords": payload["keywords"],
+        "emoji_list": payload["emoji_list"],
+        "media_types": payload["media_types"],
+        "media_count": msg.get("media_count", 0),
+        "toxicity_score": msg.get("toxicity_score", 0.0),
+        "is_toxic": bool(msg.get("is_toxic")),
+    }
+
+
 @app.get("/messages", response_model=PaginatedMessages)
 async def get_messages(
     job_id: str = Query(..., description="Analysis job ID"),
@@ -475,13 +497,19 @@ async def get_messages(
     is_toxic: Optional[bool] = Query(None, description="Filter toxic messages"),
     limit: int = Query(50, ge=1, le=500),
     page: int = Query(1, ge=1),
+    include_payload: bool = Query(False, description="Include emotions, keywords, emoji_list and media_types"),
+    after: Optional[str] = Query(None, description="next_token of the previous page; replaces page"),
 ):
     """
     Advanced message filtering with pagination.
-    Supports multiple filters and sorting.
+    Supports multiple filters and sorting. JSON payload fields are omitted
+    unless include_payload is set; /message/{message_id} always has them.
+    Deep pages are cheaper through next_token/after than through page, which
+    makes the database skip every earlier row.
     """
-    logger.info(f"🔍 Query: job={job_id}, page={page}, limit={limit}")
+    logger.info("🔍 Query: job=%s, page=%s, limit=%s", job_id, page, limit)
     
+    after_key = _parse_page_token(after) if after else None
     offset = (page - 1) * limit
     messages, total = query_messages_advanced(
         job_id=job_id,
@@ -495,56 +523,30 @@ async def get_messages(
         is_toxic=is_toxic,
         limit=limit,
         offset=offset,
+        include_payload=include_payload,
+        after=after_key,
     )
     
-    # Convert rows to Message objects
-    message_objects = []
+    # Convert rows to Message-shaped dicts
+    message_dicts = []
     for msg in messages:
         try:
-            message_objects.append(Message(
-                message_id=msg.get("message_id"),
-                timestamp=datetime.fromisoformat(msg.get("timestamp")),
-                sender=msg.get("sender"),
-                raw_text=msg.get("raw_text"),
-                cleaned_text=msg.get("cleaned_text"),
-                translated_text=msg.get("translated_text"),
-                message_type=msg.get("message_type", "text"),
-                is_media=bool(msg.get("is_media")),
-                is_emoji_only=bool(msg.get("is_emoji_only")),
-                is_link=bool(msg.get("is_link")),
-                detected_language=msg.get("detected_language", "en"),
-                language_confidence=msg.get("language_confidence", 0.0),
-                sentiment={
-                    "vader_score": msg.get("vader_score", 0.0),
-                    "vader_label": msg.get("vader_label", "Neutral"),
-                    "textblob_score": msg.get("textblob_score", 0.0),
-                    "textblob_label": msg.get("textblob_label", "Neutral"),
-                    "ensemble_score": msg.get("ensemble_score", 0.0),
-                    "ensemble_label": msg.get("ensemble_label", "Neutral"),
-                    "confidence": msg.get("confidence_score", 0.0),
-                },
-                emotions=json.loads(msg.get("emotions")) if msg.get("emotions") else None,
-                top_emotion=msg.get("top_emotion"),
-                keywords=json.loads(msg.get("keywords")) if msg.get("keywords") else None,
-                emoji_list=json.loads(msg.get("emoji_list")) if msg.get("emoji_list") else None,
-                media_types=json.loads(msg.get("media_types")) if msg.get("media_types") else None,
-                media_count=msg.get("media_count", 0),
-                toxicity_score=msg.get("toxicity_score", 0.0),
-                is_toxic=bool(msg.get("is_toxic")),
-            ))
+            message_dicts.append(_message_dict(msg, include_payload))
         except Exception as e:
-            logger.error(f"Error converting message: {e}")
+            logger.error("Error converting message: %s", e)
             continue
     
     total_pages = (total + limit - 1) // limit
     
-    return PaginatedMessages(
-        messages=message_objects,
-        total=total,
-        page=page,
-        limit=limit,
-        total_pages=total_pages,
-        filters_applied={
+    # response_model still documents the shape; returning a Response skips
+    # FastAPI's validate-and-serialize pass in favour of one orjson.dumps
+    return ORJSONResponse({
+        "messages": message_dicts,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": total_pages,
+        "filters_applied": {
             "start_date": start_date,
             "end_date": end_date,
             "sender": sender,
@@ -553,8 +555,9 @@ async def get_messages(
             "language": language,
             "message_type": message_type,
             "is_toxic": is_toxic,
-        }
-    )
+        },
+        "next_token": _page_token(messages[-1]) if len(messages) == limit else None,
+    })
 
 
 @app.get("/message/{message_id}", response_model=Message)
@@ -567,7 +570,7 @@ async def get_message_detail(message_id: str):
     
     return Message(
         message_id=msg["message_id"],
-        timestamp=datetime.fromisoformat(msg["timestamp"]),
+        timestamp=from_epoch(msg["timestamp"]),
         sender=msg["sender"],
         raw_text=msg["raw_text"],
         cleaned_text=msg["cleaned_text"],
@@ -587,11 +590,8 @@ async def get_message_detail(message_id: str):
             "ensemble_label": msg["ensemble_label"],
             "confidence": msg["confidence_score"],
         },
-        emotions=json.loads(msg["emotions"]) if msg["emotions"] else None,
         top_emotion=msg["top_emotion"],
-        keywords=json.loads(msg["keywords"]) if msg["keywords"] else None,
-        emoji_list=json.loads(msg["emoji_list"]) if msg["emoji_list"] else None,
-        media_types=json.loads(msg["media_types"]) if msg["media_types"] else None,
+        **_decode_payload(msg),
         media_count=msg["media_count"],
         toxicity_score=msg["toxicity_score"],
         is_toxic=bool(msg["is_toxic"]),
@@ -634,7 +634,7 @@ async def get_emoji_analytics_endpoint(
     # Convert to API format
     emoji_items = []
     emoji_distribution = {}
-    user_prefs = {}
+    user_prefs = defaultdict(list)
     
     for emoji in emojis:
         emoji_char = emoji.get("emoji_char")
@@ -643,13 +643,8 @@ async def get_emoji_analytics_endpoint(
         emoji_distribution[emoji_char] = usage_count
         
         # Parse user list
-        user_list = []
-        if emoji.get("user_list"):
-            user_list = emoji["user_list"].split(",")
-        
+        user_list = emoji["user_list"].split(",") if emoji.get("user_list") else []
         for user in user_list:
-            if user not in user_prefs:
-                user_prefs[user] = []
             user_prefs[user].append(emoji_char)
         
         emoji_items.append({
@@ -669,7 +664,7 @@ async def get_emoji_analytics_endpoint(
         unique_emojis=len(emoji_distribution),
         top_emojis=emoji_items,
         emoji_distribution=emoji_distribution,
-        user_emoji_preferences=user_prefs
+        user_emoji_preferences=dict(user_prefs)
     )
 
 
@@ -690,6 +685,37 @@ async def get_media_analytics_endpoint(job_id: str):
 # API ENDPOINTS - SUMMARIZATION
 # ============================================================================
 
+# One lock per job being summarized, so a burst of requests generates once
+_summary_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _generate_summary(job_id: str) -> Dict[str, Any]:
+    """Summarize a job's messages and cache the result (blocking; run in the threadpool)."""
+    messages, _ = query_messages_advanced(job_id=job_id, limit=10000)
+    
+    if not messages:
+        raise HTTPException(status_code=400, detail="No messages found for job")
+    
+    # Prepare message data
+    combined_text = "\n".join([msg.get("raw_text", "") for msg in messages])
+    
+    # Generate summary using summarization service
+    summarization_service = get_summarization_service()
+    summary_data = summarization_service.generate_full_analysis(messages, combined_text)
+    
+    # Save summary
+    save_summary(
+        summary_id=f"{job_id}_summary",
+        job_id=job_id,
+        short_summary=summary_data.get("short_summary"),
+        detailed_summary=summary_data.get("detailed_summary"),
+        key_topics=summary_data.get("key_topics"),
+        emotional_trend=summary_data.get("emotional_trend"),
+        top_keywords=summary_data.get("top_keywords"),
+    )
+    return summary_data
+
+
 @app.post("/summarize/{job_id}", response_model=Summary)
 async def summarize_chat(job_id: str):
     """
@@ -707,139 +733,239 @@ async def summarize_chat(job_id: str):
             detail=f"Job status is {job.get('status')}, must be 'completed'"
         )
     
+    lock = _summary_locks.setdefault(job_id, asyncio.Lock())
     try:
-        # Check cache
-        cached_summary = get_summary(job_id)
-        if cached_summary:
-            logger.info(f"✓ Using cached summary for job {job_id}")
-            return Summary(
-                job_id=job_id,
-                short_summary=cached_summary.get("short_summary"),
-                detailed_summary=cached_summary.get("detailed_summary"),
-                key_topics=json.loads(cached_summary.get("key_topics")) if cached_summary.get("key_topics") else [],
-                emotional_trend=json.loads(cached_summary.get("emotional_trend")) if cached_summary.get("emotional_trend") else [],
-                sentiment_timeline=json.loads(cached_summary.get("sentiment_timeline")) if cached_summary.get("sentiment_timeline") else None,
-                top_keywords=json.loads(cached_summary.get("top_keywords")) if cached_summary.get("top_keywords") else [],
-                generated_at=datetime.fromisoformat(cached_summary.get("created_at")),
-            )
-        
-        # Generate new summary
-        logger.info(f"📝 Generating summary for job {job_id}")
-        
-        # Get all messages
-        messages, _ = query_messages_advanced(job_id=job_id, limit=10000)
-        
-        if not messages:
-            raise HTTPException(status_code=400, detail="No messages found for job")
-        
-        # Prepare message data
-        message_texts = [msg.get("raw_text", "") for msg in messages]
-        combined_text = "\n".join(message_texts)
-        
-        # Generate summary using summarization service
-        summarization_service = get_summarization_service()
-        summary_data = summarization_service.generate_full_analysis(messages, combined_text)
-        
-        # Save summary
-        summary_id = f"{job_id}_summary"
-        save_summary(
-            summary_id=summary_id,
-            job_id=job_id,
-            short_summary=summary_data.get("short_summary"),
-            detailed_summary=summary_data.get("detailed_summary"),
-            key_topics=summary_data.get("key_topics"),
-            emotional_trend=summary_data.get("emotional_trend"),
-            top_keywords=summary_data.get("top_keywords"),
-        )
-        
-        logger.info(f"✓ Summary generated and cached for job {job_id}")
-        
-        return Summary(
-            job_id=job_id,
-            short_summary=summary_data.get("short_summary"),
-            detailed_summary=summary_data.get("detailed_summary"),
-            key_topics=summary_data.get("key_topics", []),
-            emotional_trend=summary_data.get("emotional_trend", []),
-            sentiment_timeline=summary_data.get("sentiment_timeline"),
-            top_keywords=summary_data.get("top_keywords", []),
-            generated_at=datetime.now(),
-        )
-        
+        async with lock:
+            return await _summarize_locked(job_id)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"✗ Summarization failed: {e}")
+        logger.error("✗ Summarization failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate summary")
+    finally:
+        if not lock.locked() and _summary_locks.get(job_id) is lock:
+            del _summary_locks[job_id]
+
+
+async def _summarize_locked(job_id: str) -> Summary:
+    """Serve the cached summary, generating it first if needed (caller holds the job's lock)."""
+    # Check cache; requests that waited on the lock find the summary here
+    cached_summary = get_summary(job_id)
+    if cached_summary:
+        logger.info("✓ Using cached summary for job %s", job_id)
+        return Summary(
+            job_id=job_id,
+            short_summary=cached_summary.get("short_summary"),
+            detailed_summary=cached_summary.get("detailed_summary"),
+            key_topics=orjson.loads(cached_summary.get("key_topics")) if cached_summary.get("key_topics") else [],
+            emotional_trend=orjson.loads(cached_summary.get("emotional_trend")) if cached_summary.get("emotional_trend") else [],
+            sentiment_timeline=orjson.loads(cached_summary.get("sentiment_timeline")) if cached_summary.get("sentiment_timeline") else None,
+            top_keywords=orjson.loads(cached_summary.get("top_keywords")) if cached_summary.get("top_keywords") else [],
+            generated_at=datetime.fromisoformat(cached_summary.get("created_at")),
+        )
+    
+    # Generate new summary off the event loop
+    logger.info("📝 Generating summary for job %s", job_id)
+    summary_data = await run_in_threadpool(_generate_summary, job_id)
+    
+    logger.info("✓ Summary generated and cached for job %s", job_id)
+    
+    return Summary(
+        job_id=job_id,
+        short_summary=summary_data.get("short_summary"),
+        detailed_summary=summary_data.get("detailed_summary"),
+        key_topics=summary_data.get("key_topics", []),
+        emotional_trend=summary_data.get("emotional_trend", []),
+        sentiment_timeline=summary_data.get("sentiment_timeline"),
+        top_keywords=summary_data.get("top_keywords", []),
+        generated_at=datetime.now(),
+    )
 
 
 # ============================================================================
 # API ENDPOINTS - EXPLAINABILITY
 # ============================================================================
 
+class MessageLoader:
+    """
+    Coalesces message lookups (DataLoader-style): every load() issued in the
+    same event-loop tick is answered by one get_messages_by_ids query run in
+    the threadpool, so a burst of /explain calls costs one query, not one each.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._batches: set = set()  # strong refs to in-flight batch tasks
+
+    async def load(self, message_id: str) -> Optional[Dict]:
+        future = self._pending.get(message_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[message_id] = loop.create_future()
+        # Shielded so one cancelled request doesn't cancel the others waiting on the id
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._load_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _load_batch(self, batch: Dict[str, asyncio.Future]):
+        try:
+            messages = await run_in_threadpool(get_messages_by_ids, list(batch))
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for message_id, future in batch.items():
+            future.set_result(messages.get(message_id))
+
+
+_message_loader = MessageLoader()
+
+# Stored messages never change (see _ON_CONFLICT in database_v2), so an
+# explanation can be kept for as long as the process lives; the bound keeps
+# memory flat at roughly 2 KB per entry. Only touched from the event loop.
+_explanations: "OrderedDict[str, SentimentExplanation]" = OrderedDict()
+
+# Same reasoning lets browsers keep an explanation for good
+EXPLAIN_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def _explanation_etag(message_id: str) -> str:
+    key = f"{EXPLAINER_VERSION}:{message_id}".encode()
+    return '"' + hashlib.blake2b(key, digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check; the header may list several (possibly weak) tags or be *."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or "*" in tags
+
+
+def _build_explanation(msg: Dict) -> SentimentExplanation:
+    """Build the explanation for a stored message row."""
+    message_id = msg["message_id"]
+    explainable_ai = get_explainable_ai_service()
+    timestamp = from_epoch(msg["timestamp"])
+    
+    # Build message data for explanation
+    message_data = {
+        "message_id": msg["message_id"],
+        "text": msg["raw_text"],
+        "sender": msg["sender"],
+        "timestamp": timestamp.isoformat(),
+        "vader_score": msg["vader_score"],
+        "vader_label": msg["vader_label"],
+        "textblob_score": msg["textblob_score"],
+        "textblob_label": msg["textblob_label"],
+        "ensemble_score": msg["ensemble_score"],
+        "ensemble_label": msg["ensemble_label"],
+    }
+    
+    explanation = explainable_ai.generate_full_explanation(message_data)
+    
+    return SentimentExplanation(
+        message_id=message_id,
+        message_text=msg["raw_text"],
+        sender=msg["sender"],
+        timestamp=timestamp,
+        model_explanations=[
+            {
+                "model_name": "VADER",
+                "score": msg["vader_score"],
+                "label": msg["vader_label"],
+                "confidence": 0.85,
+            },
+            {
+                "model_name": "TextBlob",
+                "score": msg["textblob_score"],
+                "label": msg["textblob_label"],
+                "confidence": 0.80,
+            },
+            {
+                "model_name": "Ensemble",
+                "score": msg["ensemble_score"],
+                "label": msg["ensemble_label"],
+                "confidence": msg.get("confidence_score", 0.85),
+            },
+        ],
+        disagreements=explanation.get("disagreements"),
+        important_words=explanation.get("important_words", []),
+        final_verdict=explanation.get("verdict", msg["ensemble_label"]),
+        overall_confidence=msg.get("confidence_score", 0.85),
+    )
+
+
 @app.get("/explain/{message_id}", response_model=SentimentExplanation)
-async def explain_sentiment(message_id: str):
+async def explain_sentiment(message_id: str, request: Request, response: Response):
     """
     Get detailed explanation of message sentiment classification.
     Shows per-model scores, disagreements, and important words.
+    Answers 304 when the client already holds this explanation (If-None-Match).
     """
-    msg = get_message_by_id(message_id)
+    explanation = _explanations.get(message_id)
+    if explanation is not None:
+        _explanations.move_to_end(message_id)
+    else:
+        msg = await _message_loader.load(message_id)
+        if not msg:
+            raise HTTPException(status_code=404, detail="Message not found")
     
-    if not msg:
-        raise HTTPException(status_code=404, detail="Message not found")
+    etag = _explanation_etag(message_id)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": EXPLAIN_CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = EXPLAIN_CACHE_CONTROL
+    
+    if explanation is not None:
+        return explanation
     
     try:
-        explainable_ai = get_explainable_ai_service()
-        
-        # Build message data for explanation
-        message_data = {
-            "message_id": msg["message_id"],
-            "text": msg["raw_text"],
-            "sender": msg["sender"],
-            "timestamp": msg["timestamp"],
-            "vader_score": msg["vader_score"],
-            "vader_label": msg["vader_label"],
-            "textblob_score": msg["textblob_score"],
-            "textblob_label": msg["textblob_label"],
-            "ensemble_score": msg["ensemble_score"],
-            "ensemble_label": msg["ensemble_label"],
-        }
-        
-        explanation = explainable_ai.generate_full_explanation(message_data)
-        
-        return SentimentExplanation(
-            message_id=message_id,
-            message_text=msg["raw_text"],
-            sender=msg["sender"],
-            timestamp=datetime.fromisoformat(msg["timestamp"]),
-            model_explanations=[
-                {
-                    "model_name": "VADER",
-                    "score": msg["vader_score"],
-                    "label": msg["vader_label"],
-                    "confidence": 0.85,
-                },
-                {
-                    "model_name": "TextBlob",
-                    "score": msg["textblob_score"],
-                    "label": msg["textblob_label"],
-                    "confidence": 0.80,
-                },
-                {
-                    "model_name": "Ensemble",
-                    "score": msg["ensemble_score"],
-                    "label": msg["ensemble_label"],
-                    "confidence": msg.get("confidence_score", 0.85),
-                },
-            ],
-            disagreements=explanation.get("disagreements"),
-            important_words=explanation.get("important_words", []),
-            final_verdict=explanation.get("verdict", msg["ensemble_label"]),
-            overall_confidence=msg.get("confidence_score", 0.85),
-        )
-        
+        explanation = _build_explanation(msg)
     except Exception as e:
-        logger.error(f"✗ Explanation failed: {e}")
+        logger.error("✗ Explanation failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate explanation")
+    
+    _explanations[message_id] = explanation
+    if len(_explanations) > EXPLANATION_CACHE_SIZE:
+        _explanations.popitem(last=False)
+    return explanation
+
+
+def _disagreement_entry(row: Dict[str, Any]) -> Dict[str, Any]:
+    """One /disagreements list item from a get_disagreement_messages row."""
+    return {
+        "message_id": row["message_id"],
+        "text": row["text"],
+        "sender": row["sender"],
+        "vader": {
+            "label": row["vader_label"],
+            "score": row["vader_score"],
+        },
+        "textblob": {
+            "label": row["textblob_label"],
+            "score": row["textblob_score"],
+        },
+        "ensemble": {
+            "label": row["ensemble_label"],
+            "score": row["ensemble_score"],
+        },
+    }
+
+
+def _disagreement_totals(job_id: str, disagreement_count: int, total_messages: int) -> Dict[str, Any]:
+    return {
+        "job_id": job_id,
+        "total_messages": total_messages,
+        "disagreement_count": disagreement_count,
+        "disagreement_rate": f"{disagreement_count / total_messages * 100:.1f}%" if total_messages else "0%",
+    }
 
 
 @app.get("/disagreements/{job_id}")
@@ -849,86 +975,86 @@ async def find_disagreements(job_id: str):
     Returns list of conflicting predictions.
     """
     try:
-        # Get all messages for job
-        messages, _ = query_messages_advanced(job_id=job_id, limit=10000)
-        
-        disagreements = []
-        
-        for msg in messages:
-            vader_label = msg.get("vader_label")
-            textblob_label = msg.get("textblob_label")
-            ensemble_label = msg.get("ensemble_label")
-            
-            # Check for disagreements
-            if vader_label != textblob_label or vader_label != ensemble_label:
-                disagreements.append({
-                    "message_id": msg["message_id"],
-                    "text": msg["raw_text"][:100],
-                    "sender": msg["sender"],
-                    "vader": {
-                        "label": vader_label,
-                        "score": msg["vader_score"],
-                    },
-                    "textblob": {
-                        "label": textblob_label,
-                        "score": msg["textblob_score"],
-                    },
-                    "ensemble": {
-                        "label": ensemble_label,
-                        "score": msg["ensemble_score"],
-                    },
-                })
+        # The label comparison runs in SQL; only disagreeing rows come back
+        rows, disagreement_count, total_messages = get_disagreement_messages(job_id)
         
-        return {
-            "job_id": job_id,
-            "total_messages": len(messages),
-            "disagreement_count": len(disagreements),
-            "disagreement_rate": f"{len(disagreements) / len(messages) * 100:.1f}%" if messages else "0%",
-            "disagreements": disagreements,
-        }
+        # Plain dict without a response_model: encoded by orjson, skipping jsonable_encoder
+        return ORJSONResponse({
+            **_disagreement_totals(job_id, disagreement_count, total_messages),
+            "disagreements": [_disagreement_entry(row) for row in rows],
+        })
         
     except Exception as e:
-        logger.error(f"✗ Disagreement analysis failed: {e}")
+        logger.error("✗ Disagreement analysis failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to analyze disagreements")
 
 
+@app.get("/disagreements/{job_id}/stream")
+async def stream_disagreements(job_id: str):
+    """
+    NDJSON alternative to /disagreements/{job_id} for large jobs: the first
+    line holds the totals, then one line per disagreeing message. Rows are
+    encoded as they are read from the database, so the first bytes go out
+    before the scan finishes and memory stays at one batch of rows.
+    """
+    disagreement_count, total_messages = count_disagreements(job_id)
+    
+    def lines():
+        yield orjson.dumps(_disagreement_totals(job_id, disagreement_count, total_messages)) + b"\n"
+        for rows in iter_disagreement_messages(job_id):
+            # One chunk per batch keeps threadpool hops per row out of the stream
+            yield b"".join(orjson.dumps(_disagreement_entry(row)) + b"\n" for row in rows)
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 # ============================================================================
 # HEALTH CHECK & INFO
 # ============================================================================
 
+_ROOT_JSON = orjson.dumps({
+    "name": "WhatsApp Sentiment Analyzer v2.0",
+    "version": "2.0.0",
+    "description": "Production-grade sentiment analysis with emoji & media analytics",
+    "endpoints": {
+        "upload": "POST /analyze",
+        "status": "GET /job/{job_id}",
+        "results": "GET /results/{job_id}",
+        "messages": "GET /messages",
+        "statistics": "GET /stats/{job_id}",
+        "emoji_analytics": "GET /emoji-stats/{job_id}",
+        "media_analytics": "GET /media-stats/{job_id}",
+        "summarize": "POST /summarize/{job_id}",
+        "explain": "GET /explain/{message_id}",
+        "disagreements": "GET /disagreements/{job_id}",
+        "health": "GET /health",
+    },
+    "docs": "/docs",
+    "redoc": "/redoc",
+})
+
+# /health is polled by load balancers; its body only changes once a second
+_health_body: Tuple[int, bytes] = (0, b"")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "version": "2.0.0",
-        "timestamp": datetime.now().isoformat(),
-    }
+    global _health_body
+    now = int(time.time())
+    if _health_body[0] != now:
+        _health_body = (now, orjson.dumps({
+            "status": "healthy",
+            "version": "2.0.0",
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+        }))
+    return Response(content=_health_body[1], media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """API information."""
-    return {
-        "name": "WhatsApp Sentiment Analyzer v2.0",
-        "version": "2.0.0",
-        "description": "Production-grade sentiment analysis with emoji & media analytics",
-        "endpoints": {
-            "upload": "POST /analyze",
-            "status": "GET /job/{job_id}",
-            "results": "GET /results/{job_id}",
-            "messages": "GET /messages",
-            "statistics": "GET /stats/{job_id}",
-            "emoji_analytics": "GET /emoji-stats/{job_id}",
-            "media_analytics": "GET /media-stats/{job_id}",
-            "summarize": "POST /summarize/{job_id}",
-            "explain": "GET /explain/{message_id}",
-            "disagreements": "GET /disagreements/{job_id}",
-            "health": "GET /health",
-        },
-        "docs": "/docs",
-        "redoc": "/redoc",
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
 if __name__ == "__main__":
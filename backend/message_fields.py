@@ -0,0 +1,286 @@
+"""
+Per-message field extraction for the v2 ingest: timestamp normalization, text
+cleanup, message type, emoji and media detection.
+
+Kept free of app and model imports so process-pool workers can load it cheaply.
+"""
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html import unescape
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import emoji
+
+logger = logging.getLogger(__name__)
+
+PREPARE_WORKERS = os.cpu_count() or 1
+PREPARE_SHARD_SIZE = 2000  # messages per worker task
+PREPARE_PARALLEL_MIN = 10000  # smaller chats are cheaper to prepare in-process
+
+_prepare_executor: Optional[ProcessPoolExecutor] = None
+_prepare_executor_lock = threading.Lock()
+
+
+# Every non-ASCII character that occurs in an emoji sequence. ASCII is left
+# out because keycap sequences contain digits, '#' and '*'. Emoji tests are
+# frozenset operations taking the text as a whole, so the per-character work
+# runs in C instead of a Python loop.
+_EMOJI_SEQUENCE_CHARS = frozenset(ch for seq in emoji.EMOJI_DATA for ch in seq if ord(ch) > 0x7F)
+# Joiner, skin tone modifiers, regional indicators (flags) and tag characters
+# (subdivision flags): they combine with their neighbours into one emoji, so
+# text containing any of them is split into whole sequences instead
+_EMOJI_PART_CHARS = frozenset(
+    ["\u200d"]
+    + [chr(cp) for cp in range(0x1F3FB, 0x1F400)]
+    + [chr(cp) for cp in range(0x1F1E6, 0x1F200)]
+    + [chr(cp) for cp in range(0xE0020, 0xE0080)]
+)
+# Variation selector and keycap mark: part of a sequence, not an emoji on their own
+_EMOJI_CHARS = _EMOJI_SEQUENCE_CHARS - _EMOJI_PART_CHARS - {"\ufe0f", "\u20e3"}
+# str.isspace() characters (none lies above U+3000)
+_EMOJI_OR_SPACE_CHARS = _EMOJI_SEQUENCE_CHARS | frozenset(ch for ch in map(chr, range(0x3001)) if ch.isspace())
+
+# Everything detect_message_type looks for, found in a single scan of the
+# text. Media markers and extensions are case-insensitive (no lowercased copy
+# of the text is made); links are not. The leading lookahead is the set of
+# first characters of all branches: most positions fail that one class test
+# instead of trying each alternative in turn.
+_MESSAGE_MARKER_RE = re.compile(
+    r"(?=(?i:[<ivh.]))(?:"
+    r"(?P<media>(?i:<media omitted>|image omitted|video omitted))"
+    r"|(?P<link>https?://\S)"
+    r"|(?P<document>(?i:\.(?:pdf|docx?|xlsx?|pptx?|zip|rar)))"
+    r")"
+)
+
+
+def detect_message_type(text: str) -> Tuple[str, bool, bool, bool]:
+    """
+    Detect message type: text, media, emoji_only, link, document
+    Returns: (message_type, is_media, is_emoji_only, is_link)
+    """
+    if not text:
+        return "text", False, False, False
+    
+    # One pass collects the markers; media outranks links, links outrank documents
+    markers = set()
+    for match in _MESSAGE_MARKER_RE.finditer(text):
+        if match.lastgroup == "media":
+            return "media", True, False, False
+        markers.add(match.lastgroup)
+    
+    if "link" in markers:
+        return "link", False, False, True
+    
+    if "document" in markers:
+        return "document", True, False, False
+    
+    # Check for emoji-only (never the case once a marker matched)
+    if _EMOJI_OR_SPACE_CHARS.issuperset(text) and not _EMOJI_SEQUENCE_CHARS.isdisjoint(text):
+        return "emoji_only", False, True, False
+    
+    return "text", False, False, False
+
+
+def extract_emojis(text: str) -> List[str]:
+    """Extract all emojis from text."""
+    if not text:
+        return []
+    
+    if _EMOJI_PART_CHARS.isdisjoint(text):
+        # One C-level pass de-duplicates; messages with several distinct emojis are
+        # put in first-occurrence order so the stored emoji_list is stable
+        found = _EMOJI_CHARS.intersection(text)
+        return sorted(found, key=text.index) if len(found) > 1 else list(found)
+    
+    # 👍🏽, 🇮🇳 and 👨‍👩‍👧 are one emoji each. Variation selectors are dropped
+    # and keycaps skipped, matching what the single-character path reports.
+    sequences = (match["emoji"].replace("\ufe0f", "") for match in emoji.emoji_list(text))
+    return list(dict.fromkeys(seq for seq in sequences if "\u20e3" not in seq))
+
+
+def detect_media_types(text: str) -> Tuple[List[str], int]:
+    """Detect media types mentioned in message."""
+    media_types = []
+    
+    if "<media omitted>" in text.lower():
+        # Could be any media type - mark as generic
+        media_types.append("media")
+    elif "image" in text.lower():
+        media_types.append("image")
+    elif "video" in text.lower():
+        media_types.append("video")
+    elif "audio" in text.lower() or "voice" in text.lower():
+        media_types.append("audio")
+    elif "document" in text.lower() or "file" in text.lower():
+        media_types.append("document")
+    
+    return media_types, len(media_types)
+
+
+_MONTH_FIRST_FORMATS = (
+    "%m/%d/%Y, %H:%M",  # 12/25/2023, 14:30
+    "%m/%d/%Y, %H:%M:%S",
+    "%m/%d/%y, %H:%M",
+)
+_DAY_FIRST_FORMATS = (
+    "%d/%m/%Y, %H:%M",  # 25/12/2023, 14:30
+    "%d/%m/%Y, %H:%M:%S",
+    "%d/%m/%y, %H:%M",
+)
+_OTHER_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+)
+
+# Formats in the order tried for month-first and day-first chats. Within one
+# order no string matches two formats except a date like 01/02/2023, which
+# fits both the month-first and the day-first group; the chat's order
+# (detect_day_first) decides it.
+_TIMESTAMP_FORMATS = {
+    False: _MONTH_FIRST_FORMATS + _DAY_FIRST_FORMATS + _OTHER_FORMATS,
+    True: _DAY_FIRST_FORMATS + _MONTH_FIRST_FORMATS + _OTHER_FORMATS,
+}
+# Formats safe to try first on a later timestamp: all but the other group,
+# whose formats would read an ambiguous date the wrong way round
+_REMEMBERED_FORMATS = {
+    False: frozenset(_MONTH_FIRST_FORMATS + _OTHER_FORMATS),
+    True: frozenset(_DAY_FIRST_FORMATS + _OTHER_FORMATS),
+}
+
+_SLASH_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/")
+
+# Last (day_first, format) that matched on this thread. An export uses one
+# format throughout, so it is tried first; only _REMEMBERED_FORMATS are kept,
+# so the result never depends on which timestamps were parsed before.
+_timestamp_format = threading.local()
+
+
+def detect_day_first(timestamps: Iterable[str]) -> bool:
+    """
+    Whether a chat writes dates day-first (25/12/2023) rather than month-first
+    (12/25/2023), decided by its first timestamp with a day above 12.
+    Chats without one are read month-first.
+    """
+    for timestamp_str in timestamps:
+        match = _SLASH_DATE_RE.match(timestamp_str)
+        if match:
+            if int(match.group(1)) > 12:
+                return True
+            if int(match.group(2)) > 12:
+                return False
+    return False
+
+
+def normalize_timestamp(timestamp_str: str, day_first: bool = False) -> Optional[datetime]:
+    """
+    Normalize various timestamp formats to ISO datetime.
+    Handles: MM/DD/YYYY HH:MM, DD/MM/YYYY HH:MM, YYYY-MM-DD HH:MM, etc.
+    Dates that read either way (01/02/2023) follow day_first.
+    """
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        pass
+    
+    last = getattr(_timestamp_format, "last", None)
+    last_fmt = last[1] if last and last[0] == day_first else None
+    if last_fmt:
+        try:
+            return datetime.strptime(timestamp_str, last_fmt)
+        except ValueError:
+            pass
+    
+    for fmt in _TIMESTAMP_FORMATS[day_first]:
+        if fmt == last_fmt:
+            continue
+        try:
+            parsed = datetime.strptime(timestamp_str, fmt)
+        except ValueError:
+            continue
+        if fmt in _REMEMBERED_FORMATS[day_first]:
+            _timestamp_format.last = (day_first, fmt)
+        return parsed
+    
+    logger.warning("Could not normalize timestamp: %s", timestamp_str)
+    return None
+
+
+def sanitize_text(text: str) -> str:
+    """Clean and sanitize message text."""
+    if not text:
+        return ""
+    
+    # Remove HTML entities
+    text = unescape(text)
+    
+    # Remove extra whitespace
+    text = " ".join(text.split())
+    
+    return text
+
+
+def _prepare_shard(timestamps: List[str], raw_texts: List[str], day_first: bool = False) -> List[Tuple]:
+    """
+    Run the per-message classifiers a column at a time, so each pass is a C-level
+    map over one list instead of dict lookups and calls interleaved per message.
+    day_first is decided for the whole chat, so shards parse dates alike.
+    """
+    _timestamp_format.last = None
+    return list(zip(
+        map(normalize_timestamp, timestamps, repeat(day_first)),
+        map(sanitize_text, raw_texts),
+        map(detect_message_type, raw_texts),
+        map(extract_emojis, raw_texts),
+        map(detect_media_types, raw_texts),
+    ))
+
+
+def _get_prepare_executor() -> ProcessPoolExecutor:
+    global _prepare_executor
+    with _prepare_executor_lock:
+        if _prepare_executor is None:
+            _prepare_executor = ProcessPoolExecutor(
+                max_workers=PREPARE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _prepare_executor
+
+
+def shutdown_prepare_executor() -> None:
+    """Stop the worker processes, if any were started."""
+    global _prepare_executor
+    with _prepare_executor_lock:
+        if _prepare_executor is not None:
+            _prepare_executor.shutdown(wait=False, cancel_futures=True)
+            _prepare_executor = None
+
+
+def prepare_message_fields(messages: List[Dict[str, Any]]) -> List[Tuple]:
+    """
+    Extract the stored fields of every parsed message. Large chats are split
+    into shards prepared in worker processes; only the timestamp and text
+    strings are sent to them.
+    Returns: one (timestamp, cleaned_text, message_type info, emojis, media info)
+    tuple per message, in input order.
+    """
+    timestamps = [msg.get('timestamp', '') for msg in messages]
+    raw_texts = [msg.get('message', '') for msg in messages]
+    day_first = detect_day_first(timestamps)
+    if len(messages) < PREPARE_PARALLEL_MIN or PREPARE_WORKERS < 2:
+        return _prepare_shard(timestamps, raw_texts, day_first)
+    
+    starts = range(0, len(messages), PREPARE_SHARD_SIZE)
+    shards = _get_prepare_executor().map(
+        _prepare_shard,
+        [timestamps[i:i + PREPARE_SHARD_SIZE] for i in starts],
+        [raw_texts[i:i + PREPARE_SHARD_SIZE] for i in starts],
+        repeat(day_first, len(starts)),
+    )
+    return [fields for shard in shards for fields in shard]
@@ -0,0 +1,17 @@
+"""
+orjson-backed responses shared by the v1 and v2 apps.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# orjson rejects numpy scalars and non-string dict keys unless told otherwise
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, for endpoints that return pre-built dicts."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
@@ -64,6 +64,7 @@ class PaginatedMessages(BaseModel):
     limit: int
     total_pages: int
     filters_applied: Dict[str, Any] = {}
+    next_token: Optional[str] = None  # pass as ?after= for the next page
 
 
 # ============================================================================
@@ -4,11 +4,118 @@ Shows per-model scores, confidence metrics, word importance, and model disagreem
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever explanation wording or fields change: it is part of the
+# /explain ETag, so clients holding an older explanation fetch the new one
+EXPLAINER_VERSION = 1
+
+_WORD_RE = re.compile(r'\b[a-z]+\b')
+
+# Keyed by whether the VADER/TextBlob score gap exceeds 0.5
+_DISAGREEMENT_REASONS = {
+    True: "Large difference in scores suggests mixed or complex sentiment. "
+          "Text may contain sarcasm, irony, or both positive and negative elements.",
+    False: "Models are close but on opposite sides of neutral. "
+           "Text likely has subtle sentiment indicators that differ in interpretation.",
+}
+
+# Second sentence of a model's explanation, by model and label
+_MODEL_DESCRIPTIONS = {
+    "VADER": {
+        "Positive": "Uses lexicon-based approach with emphasis on positive words and punctuation.",
+        "Negative": "Identifies negative words and intensifying punctuation marks.",
+        "Neutral": "Mixed sentiment cues or lacks clear sentiment indicators.",
+    },
+    "TextBlob": {
+        "Positive": "Uses subjectivity and polarity analysis on word levels.",
+        "Negative": "Identifies negative modifiers and sentiment-bearing words.",
+        "Neutral": "Text appears objective or lacks emotional indicators.",
+    },
+}
+
+# Frozensets so the per-word membership test in extract_important_words is O(1)
+_SENTIMENT_KEYWORDS = {
+    'positive': frozenset(['good', 'great', 'excellent', 'amazing', 'awesome', 'love', 'happy',
+                           'wonderful', 'fantastic', 'best', 'perfect', 'beautiful', 'brilliant']),
+    'negative': frozenset(['bad', 'terrible', 'awful', 'horrible', 'hate', 'sad', 'angry',
+                           'worst', 'disgusting', 'pathetic', 'disappointing', 'poor']),
+    'neutral': frozenset(['think', 'believe', 'seem', 'appear', 'maybe', 'perhaps', 'might',
+                          'probably', 'possibly', 'consider', 'could']),
+}
+
+
+# ============================================================================
+# ARRAY KERNELS
+# ============================================================================
+# Column-wise versions of the scalar helpers below for find_disagreements_batch.
+# float64 keeps the cutoff comparisons identical to the scalar path (a float32
+# copy of 0.1 already compares > 0.1).
+
+# Indexed by side of neutral: 0, +1, and -1 (the last element)
+_LABEL_NAMES = np.array(["Neutral", "Positive", "Negative"], dtype=object)
+
+
+def batch_labels(scores: np.ndarray) -> np.ndarray:
+    """Vectorized _score_to_label (object array of label strings)."""
+    sides = (scores > 0.1).view(np.int8) - (scores < -0.1).view(np.int8)
+    return _LABEL_NAMES[sides]
+
+
+def _as_scores(scores: Iterable[float]) -> np.ndarray:
+    if isinstance(scores, np.ndarray):
+        return scores.astype(np.float64, copy=False)
+    return np.fromiter(scores, dtype=np.float64)
+
+
+# ============================================================================
+# SCALAR HELPERS
+# ============================================================================
+
+# Kept scalar: only /explain reports confidences, a few per message, and no
+# batch endpoint returns them, so an array or numba version has no caller.
+def _confidence(score: float) -> float:
+    """Distance from neutral (0) as a 0-1 confidence, capped at 1.0."""
+    return round(min(abs(score) * 1.2, 1.0), 2)
+
+
+def _label(score: float) -> str:
+    if score > 0.1:
+        return "Positive"
+    elif score < -0.1:
+        return "Negative"
+    else:
+        return "Neutral"
+
+
+@lru_cache(maxsize=2048)
+def _model_explanation(model: str, score: float) -> str:
+    """
+    Explanation sentence for one model's score. It depends on the score alone
+    and chats repeat scores a lot (identical short messages), so the formatted
+    strings are memoized. Callers pass score + 0.0: -0.0 and 0.0 share a cache
+    key but format differently.
+    """
+    label = _label(score)
+    description = _MODEL_DESCRIPTIONS[model][label]
+    if label == "Neutral":
+        return f"{model} detects neutral sentiment ({score:.2f}). {description}"
+    
+    confidence = _confidence(score)
+    if confidence > 0.7:
+        strength = "strongly"
+    elif confidence > 0.4:
+        strength = "moderately"
+    else:
+        strength = "slightly"
+    return f"{model} {strength} detects {label.lower()} sentiment ({score:.2f}). {description}"
+
 
 class ExplainableAIService:
     """Provides explainability for AI decisions and sentiment analysis."""
@@ -42,13 +149,13 @@ class ExplainableAIService:
                 "score": round(vader_score, 3),
                 "confidence": self._calculate_confidence(vader_score),
                 "label": self._score_to_label(vader_score),
-                "explanation": self._explain_vader_result(vader_score, message.get('text', ''))
+                "explanation": self._explain_vader_result(vader_score)
             },
             "textblob": {
                 "score": round(textblob_score, 3),
                 "confidence": self._calculate_confidence(textblob_score),
                 "label": self._score_to_label(textblob_score),
-                "explanation": self._explain_textblob_result(textblob_score, message.get('text', ''))
+                "explanation": self._explain_textblob_result(textblob_score)
             },
             "ensemble": {
                 "score": round(ensemble_score, 3),
@@ -69,62 +176,19 @@ class ExplainableAIService:
         Returns:
             Confidence score (0 to 1)
         """
-        return round(min(abs(score) * 1.2, 1.0), 2)  # Cap at 1.0
+        return _confidence(score)
     
     def _score_to_label(self, score: float) -> str:
         """Convert numeric score to sentiment label."""
-        if score > 0.1:
-            return "Positive"
-        elif score < -0.1:
-            return "Negative"
-        else:
-            return "Neutral"
+        return _label(score)
     
-    def _explain_vader_result(self, score: float, text: str) -> str:
+    def _explain_vader_result(self, score: float) -> str:
         """Generate explanation for VADER result."""
-        confidence = self._calculate_confidence(score)
-        
-        if confidence > 0.7:
-            strength = "strongly"
-        elif confidence > 0.4:
-            strength = "moderately"
-        else:
-            strength = "slightly"
-        
-        label = self._score_to_label(score)
-        
-        if label == "Positive":
-            return f"VADER {strength} detects positive sentiment ({score:.2f}). " \
-                   f"Uses lexicon-based approach with emphasis on positive words and punctuation."
-        elif label == "Negative":
-            return f"VADER {strength} detects negative sentiment ({score:.2f}). " \
-                   f"Identifies negative words and intensifying punctuation marks."
-        else:
-            return f"VADER detects neutral sentiment ({score:.2f}). " \
-                   f"Mixed sentiment cues or lacks clear sentiment indicators."
+        return _model_explanation("VADER", score + 0.0)
     
-    def _explain_textblob_result(self, score: float, text: str) -> str:
+    def _explain_textblob_result(self, score: float) -> str:
         """Generate explanation for TextBlob result."""
-        confidence = self._calculate_confidence(score)
-        
-        if confidence > 0.7:
-            strength = "strongly"
-        elif confidence > 0.4:
-            strength = "moderately"
-        else:
-            strength = "slightly"
-        
-        label = self._score_to_label(score)
-        
-        if label == "Positive":
-            return f"TextBlob {strength} detects positive sentiment ({score:.2f}). " \
-                   f"Uses subjectivity and polarity analysis on word levels."
-        elif label == "Negative":
-            return f"TextBlob {strength} detects negative sentiment ({score:.2f}). " \
-                   f"Identifies negative modifiers and sentiment-bearing words."
-        else:
-            return f"TextBlob detects neutral sentiment ({score:.2f}). " \
-                   f"Text appears objective or lacks emotional indicators."
+        return _model_explanation("TextBlob", score + 0.0)
     
     def find_disagreements(
         self,
@@ -155,14 +219,35 @@ class ExplainableAIService:
             "recommendation": "Manual review recommended for this message"
         }
     
+    def find_disagreements_batch(
+        self,
+        vader_scores: Iterable[float],
+        textblob_scores: Iterable[float]
+    ) -> List[Optional[Dict]]:
+        """
+        find_disagreements over whole score columns: labels and score gaps are
+        computed as arrays, and only the per-message result dicts are built in Python.
+        """
+        vader = _as_scores(vader_scores)
+        textblob = _as_scores(textblob_scores)
+        vader_labels = batch_labels(vader).tolist()
+        textblob_labels = batch_labels(textblob).tolist()
+        large_gap = (np.abs(vader - textblob) > 0.5).tolist()
+        
+        return [
+            None if vader_label == textblob_label else {
+                "disagreement": True,
+                "vader_says": vader_label,
+                "textblob_says": textblob_label,
+                "possible_reason": _DISAGREEMENT_REASONS[gap],
+                "recommendation": "Manual review recommended for this message"
+            }
+            for vader_label, textblob_label, gap in zip(vader_labels, textblob_labels, large_gap)
+        ]
+    
     def _explain_disagreement(self, vader_score: float, textblob_score: float) -> str:
         """Explain why models disagree."""
-        if abs(vader_score - textblob_score) > 0.5:
-            return "Large difference in scores suggests mixed or complex sentiment. " \
-                   "Text may contain sarcasm, irony, or both positive and negative elements."
-        else:
-            return "Models are close but on opposite sides of neutral. " \
-                   "Text likely has subtle sentiment indicators that differ in interpretation."
+        return _DISAGREEMENT_REASONS[abs(vader_score - textblob_score) > 0.5]
     
     def extract_important_words(
         self,
@@ -179,25 +264,12 @@ class ExplainableAIService:
         Returns:
             List of important words
         """
-        sentiment_keywords = {
-            'positive': ['good', 'great', 'excellent', 'amazing', 'awesome', 'love', 'happy', 
-                        'wonderful', 'fantastic', 'best', 'perfect', 'beautiful', 'brilliant'],
-            'negative': ['bad', 'terrible', 'awful', 'horrible', 'hate', 'sad', 'angry', 
-                        'worst', 'disgusting', 'pathetic', 'disappointing', 'poor'],
-            'neutral': ['think', 'believe', 'seem', 'appear', 'maybe', 'perhaps', 'might', 
-                       'probably', 'possibly', 'consider', 'could']
-        }
-        
-        words = re.findall(r'\b[a-z]+\b', text.lower())
-        
-        if sentiment_type in sentiment_keywords:
-            important = [
-                word for word in words 
-                if word in sentiment_keywords[sentiment_type]
-            ]
-            return important[:10]  # Top 10
+        keywords = _SENTIMENT_KEYWORDS.get(sentiment_type)
+        if keywords is None:
+            return []
         
-        return []
+        important = [word for word in _WORD_RE.findall(text.lower()) if word in keywords]
+        return important[:10]  # Top 10
     
     def generate_confidence_metrics(self, message: Dict) -> Dict:
         """
@@ -0,0 +1,44 @@
+"""
+langdetect configuration shared by the language services.
+
+langdetect loads every bundled n-gram profile (55 languages) the first time
+it detects anything and keeps them resident for the life of the process.
+Only the languages the services can name are loaded here, and the seed is
+fixed so the same text always gets the same answer (detection results are
+cached, so an unlucky first draw would otherwise stick).
+
+Import this module before calling langdetect.
+"""
+import os
+
+from langdetect import detector_factory
+from langdetect.detector_factory import DetectorFactory
+
+# Codes named in LANGUAGE_NAMES (language.py) or
+# MultilingualService.SUPPORTED_LANGUAGES that langdetect has a profile for
+LANGDETECT_LANGUAGES = frozenset({
+    'af', 'ar', 'bn', 'cs', 'da', 'de', 'el', 'en', 'es', 'fi',
+    'fr', 'gu', 'he', 'hi', 'hu', 'id', 'it', 'ja', 'kn', 'ko',
+    'ml', 'mr', 'nl', 'no', 'pa', 'pl', 'pt', 'ro', 'ru', 'sv',
+    'ta', 'te', 'th', 'tl', 'tr', 'uk', 'ur', 'vi', 'zh-cn', 'zh-tw',
+})
+
+DetectorFactory.seed = 0
+
+
+def init_factory() -> None:
+    """Replacement for langdetect's init_factory that loads LANGDETECT_LANGUAGES only."""
+    if detector_factory._factory is not None:
+        return
+    profiles = []
+    for name in sorted(os.listdir(detector_factory.PROFILES_DIRECTORY)):
+        if name in LANGDETECT_LANGUAGES:
+            with open(os.path.join(detector_factory.PROFILES_DIRECTORY, name), encoding='utf-8') as f:
+                profiles.append(f.read())
+    factory = DetectorFactory()
+    factory.load_json_profile(profiles)
+    detector_factory._factory = factory
+
+
+# detect()/detect_langs() look init_factory up in their module on every call
+detector_factory.init_factory = init_factory
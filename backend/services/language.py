@@ -2,14 +2,31 @@
 Language Detection and Translation Service
 """
 import logging
-from typing import Dict, Tuple
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from langdetect import detect, LangDetectException
 import asyncio
 import inspect
-from collections import defaultdict
+from collections import Counter
+
+from backend.config import LANGUAGE_CACHE_SIZE
+from backend.services import langdetect_setup  # noqa: F401  (trims langdetect's profiles)
 
 logger = logging.getLogger(__name__)
 
+# langdetect is pure Python and holds the GIL, so big batches of distinct
+# texts are spread over worker processes
+DETECT_WORKERS = os.cpu_count() or 1
+DETECT_PARALLEL_MIN = 2000  # distinct texts; below this, spawning workers costs more than it saves
+
+_detect_executor: Optional[ProcessPoolExecutor] = None
+_detect_executor_lock = threading.Lock()
+
 LANGUAGE_NAMES = {
     'en': 'English', 'es': 'Spanish', 'fr': 'French', 'de': 'German',
     'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
@@ -23,6 +40,30 @@ LANGUAGE_NAMES = {
     'da': 'Danish', 'fi': 'Finnish', 'no': 'Norwegian', 'af': 'Afrikaans',
 }
 
+# langdetect only looks at so much text, and chats repeat the same short
+# messages ("ok", "haha", "good night") constantly
+DETECT_TEXT_LIMIT = 200
+
+# Below these lengths langdetect's answer is mostly noise ('ok' comes back as
+# Polish or Slovak), so detect() doesn't ask: shorter texts are 'unknown' and
+# short pure-ASCII texts are taken as English. Trades a little accuracy on
+# short Latin-script messages in other languages for skipping langdetect on
+# the bulk of chat traffic.
+MIN_DETECT_LENGTH = 5
+ASCII_ENGLISH_LENGTH = 15
+
+
+@lru_cache(maxsize=LANGUAGE_CACHE_SIZE)
+def _cached_detect(text: str) -> str:
+    try:
+        return detect(text)
+    except LangDetectException:
+        logger.warning("Could not detect language for text: %s", text[:50])
+        return 'unknown'
+    except Exception as e:
+        logger.error("Language detection failed: %s", e)
+        return 'unknown'
+
 
 class LanguageDetector:
     """Detect language for text."""
@@ -35,19 +76,34 @@ class LanguageDetector:
         Returns:
             Language code (e.g., 'en', 'es', 'fr')
         """
-        if not text or not text.strip():
+        text = text.strip()[:DETECT_TEXT_LIMIT] if text else ''
+        if len(text) < MIN_DETECT_LENGTH:
             return 'unknown'
+        if len(text) < ASCII_ENGLISH_LENGTH and text.isascii():
+            return 'en'
         
-        try:
-            # Try langdetect
-            lang_code = detect(text)
-            return lang_code
-        except LangDetectException:
-            logger.warning(f"Could not detect language for text: {text[:50]}")
-            return 'unknown'
-        except Exception as e:
-            logger.error(f"Language detection failed: {e}")
-            return 'unknown'
+        return _cached_detect(text)
+    
+    @staticmethod
+    def detect_many(texts: List[str]) -> List[str]:
+        """
+        detect() for every text, in input order. Each distinct text is
+        detected once; large batches are split across worker processes,
+        unless this already is one (v1 analyzes whole chats in a process
+        pool, which would otherwise start a pool per worker).
+        """
+        unique = list(dict.fromkeys(texts))
+        if (len(unique) < DETECT_PARALLEL_MIN or DETECT_WORKERS < 2
+                or multiprocessing.parent_process() is not None):
+            languages = dict(zip(unique, map(LanguageDetector.detect, unique)))
+        else:
+            chunksize = max(64, len(unique) // (DETECT_WORKERS * 4))
+            results = _get_detect_executor().map(LanguageDetector.detect, unique, chunksize=chunksize)
+            # Codes come back as fresh strings per worker chunk; intern them so
+            # the handful of distinct codes are shared objects again, as they
+            # are when detected in-process
+            languages = dict(zip(unique, map(sys.intern, results)))
+        return [languages[text] for text in texts]
     
     @staticmethod
     def get_language_name(code: str) -> str:
@@ -55,6 +111,62 @@ class LanguageDetector:
         return LANGUAGE_NAMES.get(code, code.upper())
 
 
+def _get_detect_executor() -> ProcessPoolExecutor:
+    global _detect_executor
+    with _detect_executor_lock:
+        if _detect_executor is None:
+            _detect_executor = ProcessPoolExecutor(
+                max_workers=DETECT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=langdetect_setup.init_factory,  # load the profiles once per worker
+            )
+        return _detect_executor
+
+
+def shutdown_detect_executor() -> None:
+    """Stop the detection worker processes, if any were started."""
+    global _detect_executor
+    with _detect_executor_lock:
+        if _detect_executor is not None:
+            _detect_executor.shutdown(wait=False, cancel_futures=True)
+            _detect_executor = None
+
+
+TRANSLATE_TIMEOUT_SECONDS = 10
+
+_translation_loop: Optional[asyncio.AbstractEventLoop] = None
+_translation_loop_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_translator():
+    """
+    One googletrans Translator for the process (None if it isn't installed),
+    so its HTTP connections are reused between calls.
+    """
+    try:
+        # try googletrans first (lightweight)
+        from googletrans import Translator
+    except ImportError:
+        return None
+    return Translator()
+
+
+def _get_translation_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop running in a daemon thread for async translator
+    implementations. Reusing it avoids setting up a loop per call and keeps
+    the translator's async client on the loop it was created with; it also
+    works when the caller is itself inside a running loop.
+    """
+    global _translation_loop
+    with _translation_loop_lock:
+        if _translation_loop is None:
+            _translation_loop = asyncio.new_event_loop()
+            threading.Thread(target=_translation_loop.run_forever, name="translation-loop", daemon=True).start()
+        return _translation_loop
+
+
 def translate_text(text: str, target: str = 'en') -> str:
     """
     Translate text to target language if translation backend is available.
@@ -64,21 +176,20 @@ def translate_text(text: str, target: str = 'en') -> str:
         return text
 
     try:
-        # try googletrans first (lightweight)
-        from googletrans import Translator
-        translator = Translator()
+        translator = _get_translator()
+        if translator is None:
+            # google-cloud-translate or other SDKs could be added here
+            logger.debug("No translator available, returning original text")
+            return text
         result = translator.translate(text, dest=target)
         # Handle async translator implementations returning coroutines
         if inspect.isawaitable(result):
+            future = asyncio.run_coroutine_threadsafe(result, _get_translation_loop())
             try:
-                result = asyncio.run(result)
-            except RuntimeError:
-                # If there's already a running event loop (e.g., in test runner), create a new loop
-                loop = asyncio.new_event_loop()
-                try:
-                    result = loop.run_until_complete(result)
-                finally:
-                    loop.close()
+                result = future.result(timeout=TRANSLATE_TIMEOUT_SECONDS)
+            except BaseException:
+                future.cancel()
+                raise
 
         return getattr(result, 'text', str(result))
     except Exception:
@@ -106,17 +217,19 @@ class LanguageAnalytics:
                 'language_pairs': { ('en', 'es'): 15, ... }
             }
         """
-        lang_counts = defaultdict(int)
-        language_sequence = []
-        
-        for msg in messages:
-            text = msg.get('message', '')
-            if text.strip():
-                lang = LanguageDetector.detect(text)
-                lang_counts[lang] += 1
-                language_sequence.append(lang)
+        return LanguageAnalytics.summarize_languages(LanguageDetector.detect_many([
+            text for text in (msg.get('message', '') for msg in messages) if text.strip()
+        ]))
+    
+    @staticmethod
+    def summarize_languages(language_sequence: List[str]) -> Dict[str, any]:
+        """
+        analyze_distribution for languages that are already detected, one
+        per non-empty message in conversation order.
+        """
+        lang_counts = Counter(language_sequence)
         
-        total = sum(lang_counts.values())
+        total = len(language_sequence)
         if total == 0:
             return {
                 'distribution': {},
@@ -126,19 +239,17 @@ class LanguageAnalytics:
             }
         
         # Distribution percentages
-        distribution = {
-            lang: (count / total) * 100 
-            for lang, count in lang_counts.items()
-        }
+        scale = 100.0 / total
+        distribution = {lang: count * scale for lang, count in lang_counts.items()}
         
-        # Language pairs (consecutive messages)
-        lang_pairs = defaultdict(int)
-        for i in range(len(language_sequence) - 1):
-            pair = tuple(sorted([language_sequence[i], language_sequence[i+1]]))
-            lang_pairs[pair] += 1
+        # Language pairs (consecutive messages), unordered
+        lang_pairs = Counter(
+            (a, b) if a <= b else (b, a)
+            for a, b in zip(language_sequence, language_sequence[1:])
+        )
         
         # Primary language
-        primary = max(lang_counts, key=lang_counts.get) if lang_counts else 'unknown'
+        primary = lang_counts.most_common(1)[0][0]
         
         return {
             'distribution': distribution,
@@ -3,20 +3,188 @@ Phase 4: Enhanced multilingual support with language-specific sentiment analysis
 Supports 40+ languages including Hindi, Hinglish, Urdu, Spanish, French.
 """
 
+import hashlib
 import logging
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, List
-from langdetect import detect, detect_langs, LangDetectException
+from langdetect import detect_langs, LangDetectException
 
-try:
-    from googletrans import Translator
-    HAS_GOOGLETRANS = True
-except ImportError:
-    HAS_GOOGLETRANS = False
-    Translator = None
+from backend.config import LANGUAGE_CACHE_SIZE, TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_SIZE
+from backend.services import langdetect_setup  # noqa: F401  (trims langdetect's profiles)
+from backend.services.language import DETECT_TEXT_LIMIT
 
 logger = logging.getLogger(__name__)
 
 
+def _load_translator():
+    """
+    Create a googletrans Translator, or None if it isn't installed. Imported
+    here rather than at module level because importing googletrans (and its
+    HTTP stack) is slow and most processes importing this module never
+    translate; the singleton only gets built on first use.
+    """
+    try:
+        from googletrans import Translator
+    except ImportError:
+        return None
+    return Translator()
+
+# Translation is one HTTPS round-trip per text; this many run at once in
+# batch_translate (Google starts throttling beyond roughly this)
+TRANSLATE_WORKERS = 8
+
+# batch_translate joins short texts into one request of up to this many
+# characters, separated by a marker the translator leaves alone
+TRANSLATE_CHUNK_CHARS = 3500
+TRANSLATE_SEPARATOR = "\n\n@@@\n\n"
+_SEPARATOR_RE = re.compile(r"\s*@@@\s*")
+
+
+def _chunk_texts(texts: List[str]) -> List[List[str]]:
+    """Greedily group texts so each joined chunk stays within TRANSLATE_CHUNK_CHARS."""
+    chunks, chunk, size = [], [], 0
+    for text in texts:
+        added = len(text) + len(TRANSLATE_SEPARATOR)
+        if chunk and size + added > TRANSLATE_CHUNK_CHARS:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(text)
+        size += added
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+@lru_cache(maxsize=LANGUAGE_CACHE_SIZE)
+def _cached_detect_langs(text: str) -> Tuple[str, float]:
+    """
+    (language_code, confidence) for text. detect() is just the most
+    probable entry of detect_langs(), so one langdetect pass gives both.
+    """
+    try:
+        probs = detect_langs(text)
+        if not probs:
+            return 'en', 0.0
+        return probs[0].lang, probs[0].prob
+    except LangDetectException:
+        # Default to English if detection fails
+        return 'en', 0.0
+    except Exception as e:
+        logger.error("Language detection error: %s", e)
+        return 'en', 0.0
+
+
+_TRANSLATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS translations (
+        text_hash TEXT NOT NULL,
+        source_lang TEXT NOT NULL,
+        target_lang TEXT NOT NULL,
+        translated TEXT NOT NULL,
+        PRIMARY KEY (text_hash, source_lang, target_lang)
+    ) WITHOUT ROWID
+"""
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU of translations keyed by (text, source_lang, target_lang),
+    bounded so a long-running server doesn't keep every text it ever saw.
+    Backed by a SQLite file (opened on first use) keyed by a hash of the text,
+    so restarts don't pay for translations again; with no path, or if the
+    file can't be opened, it is memory only.
+    """
+    
+    def __init__(self, maxsize: int = TRANSLATION_CACHE_SIZE, path: Optional[str] = TRANSLATION_CACHE_FILE):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._hits = 0
+        self._misses = 0
+    
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the backing file on first use; must hold _lock."""
+        if self._db is None and self.path:
+            try:
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(_TRANSLATIONS_DDL)
+            except sqlite3.Error as e:
+                logger.warning("⚠ Translation cache file %s unavailable, caching in memory only: %s", self.path, e)
+                self._db = None
+                self.path = None
+        return self._db
+    
+    @staticmethod
+    def _disk_key(key: Tuple[str, str, str]) -> Tuple[str, str, str]:
+        text, source_lang, target_lang = key
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest(), source_lang, target_lang
+    
+    def _remember(self, key: Tuple[str, str, str], translated: str) -> None:
+        self._entries[key] = translated
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def get(self, key: Tuple[str, str, str]) -> Optional[str]:
+        with self._lock:
+            translated = self._entries.get(key)
+            if translated is not None:
+                self._entries.move_to_end(key)
+            else:
+                db = self._connection()
+                if db is not None:
+                    try:
+                        row = db.execute(
+                            "SELECT translated FROM translations WHERE text_hash = ? AND source_lang = ? AND target_lang = ?",
+                            self._disk_key(key),
+                        ).fetchone()
+                    except sqlite3.Error as e:
+                        logger.error("✗ Translation cache read failed: %s", e)
+                        row = None
+                    if row is not None:
+                        translated = row[0]
+                        self._remember(key, translated)
+            if translated is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return translated
+    
+    def put(self, key: Tuple[str, str, str], translated: str) -> None:
+        with self._lock:
+            self._remember(key, translated)
+            db = self._connection()
+            if db is not None:
+                try:
+                    with db:
+                        db.execute(
+                            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                            (*self._disk_key(key), translated),
+                        )
+                except sqlite3.Error as e:
+                    logger.error("✗ Translation cache write failed: %s", e)
+    
+    def stats(self) -> Dict:
+        """Lookup counts since startup, for monitoring the hit rate."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries_in_memory': len(self._entries),
+                'persistent': self.path is not None,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+            }
+
+
 class MultilingualService:
     """Handles language detection, translation, and multilingual sentiment analysis."""
     
@@ -65,14 +233,18 @@ class MultilingualService:
         'neutral': ['theek hai', 'ok', 'kya', 'accha']
     }
     
+    # Common Hinglish words; two or more in a message marks it as Hinglish
+    HINGLISH_PATTERNS = (
+        'acha', 'bhai', 'haan', 'nahi', 'kya', 'ab', 'phir',
+        'aise', 'bus', 'bas', 'theek', 'lo', 'ho', 'raha'
+    )
+    
     def __init__(self):
         """Initialize multilingual service."""
-        if HAS_GOOGLETRANS:
-            self.translator = Translator()
-        else:
-            self.translator = None
+        self.translator = _load_translator()
+        if self.translator is None:
             logger.warning("⚠ googletrans not installed - translation features disabled")
-        self.cache = {}  # Simple cache for translations
+        self.cache = TranslationCache()
         logger.info("✓ Multilingual Service initialized")
     
     def detect_language(self, text: str) -> Tuple[str, float]:
@@ -88,21 +260,7 @@ class MultilingualService:
         if not text or len(text) < 3:
             return 'en', 0.0
         
-        try:
-            # Try langdetect for accurate detection
-            lang = detect(text)
-            
-            # Get confidence by checking all probabilities
-            probs = detect_langs(text)
-            confidence = max([p.prob for p in probs]) if probs else 0.5
-            
-            return lang, confidence
-        except LangDetectException:
-            # Default to English if detection fails
-            return 'en', 0.0
-        except Exception as e:
-            logger.error(f"Language detection error: {e}")
-            return 'en', 0.0
+        return _cached_detect_langs(text.strip()[:DETECT_TEXT_LIMIT])
     
     def translate_text(self, text: str, source_lang: str = 'auto', target_lang: str = 'en') -> Optional[str]:
         """
@@ -123,30 +281,73 @@ class MultilingualService:
             logger.warning("Translation requested but googletrans not available - returning original text")
             return text
         
-        cache_key = f"{text}:{source_lang}:{target_lang}"
+        cache_key = (text, source_lang, target_lang)
         
         # Check cache
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if source_lang == 'auto' and self._in_language(text, target_lang):
+            return text
         
         try:
-            result = self.translator.translate(
-                text,
-                src_language=source_lang,
-                dest_language=target_lang,
-                attempt_reversal=True
-            )
-            
-            translated = result.get('text') if isinstance(result, dict) else str(result)
+            translated = self._request_translation(text, source_lang, target_lang)
             
             # Cache result
-            self.cache[cache_key] = translated
+            self.cache.put(cache_key, translated)
             
             return translated
         except Exception as e:
-            logger.error(f"Translation error: {e}")
+            logger.error("Translation error: %s", e)
             return text
     
+    def _in_language(self, text: str, lang_code: str) -> bool:
+        """
+        Whether text is confidently detected as lang_code, in which case
+        there is nothing to translate (detection results are cached, a
+        translation is a network round-trip).
+        """
+        detected, confidence = self.detect_language(text)
+        if confidence > 0.0 and detected == lang_code:
+            logger.debug("Skipping translation, text already in %s", lang_code)
+            return True
+        return False
+    
+    def _request_translation(self, text: str, source_lang: str, target_lang: str) -> str:
+        """One uncached call to the translator."""
+        result = self.translator.translate(
+            text,
+            src_language=source_lang,
+            dest_language=target_lang,
+            attempt_reversal=True
+        )
+        return result.get('text') if isinstance(result, dict) else str(result)
+    
+    def _translate_chunk(self, chunk: List[str], target_lang: str) -> List[str]:
+        """
+        Translate a chunk from _chunk_texts in a single request, falling back
+        to one request per text if the separators don't survive translation.
+        """
+        if len(chunk) == 1:
+            return [self.translate_text(chunk[0], target_lang=target_lang)]
+        
+        try:
+            joined = self._request_translation(TRANSLATE_SEPARATOR.join(chunk), 'auto', target_lang)
+            parts = _SEPARATOR_RE.split(joined.strip())
+        except Exception as e:
+            logger.error("Translation error: %s", e)
+            parts = []
+        
+        if len(parts) != len(chunk):
+            logger.warning("Chunked translation returned %d parts for %d texts - translating one by one",
+                           len(parts), len(chunk))
+            return [self.translate_text(text, target_lang=target_lang) for text in chunk]
+        
+        for text, translated in zip(chunk, parts):
+            self.cache.put((text, 'auto', target_lang), translated)
+        return parts
+    
     def get_language_name(self, lang_code: str) -> str:
         """
         Get human-readable language name.
@@ -169,18 +370,17 @@ class MultilingualService:
         Returns:
             True if Hinglish detected
         """
-        text_lower = text.lower()
-        
-        # Check for common Hinglish patterns
-        hinglish_patterns = [
-            'acha', 'bhai', 'haan', 'nahi', 'kya', 'ab', 'phir',
-            'aise', 'bus', 'bas', 'theek', 'lo', 'ho', 'raha'
-        ]
-        
-        hinglish_count = sum(1 for pattern in hinglish_patterns if pattern in text_lower)
-        
+        return self._is_hinglish_lowered(text.lower())
+    
+    def _is_hinglish_lowered(self, text_lower: str) -> bool:
         # If at least 2 Hinglish words found, it's likely Hinglish
-        return hinglish_count >= 2
+        found = 0
+        for pattern in self.HINGLISH_PATTERNS:
+            if pattern in text_lower:
+                found += 1
+                if found == 2:
+                    return True
+        return False
     
     def analyze_hinglish_sentiment(self, text: str) -> Optional[Dict]:
         """
@@ -192,28 +392,32 @@ class MultilingualService:
         Returns:
             Dictionary with Hinglish sentiment indicators
         """
+        return self._hinglish_sentiment_lowered(text.lower())
+    
+    def analyze_hinglish(self, text: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        detect_hinglish and, for Hinglish text, analyze_hinglish_sentiment,
+        lowercasing the text once for both.
+        
+        Returns:
+            Tuple of (is_hinglish, sentiment indicators or None)
+        """
         text_lower = text.lower()
+        if not self._is_hinglish_lowered(text_lower):
+            return False, None
+        return True, self._hinglish_sentiment_lowered(text_lower)
+    
+    def _hinglish_sentiment_lowered(self, text_lower: str) -> Optional[Dict]:
+        indicators = self.HINGLISH_SENTIMENT_INDICATORS
         
+        # Check for sentiment indicators
         result = {
-            'positive_indicators': [],
-            'negative_indicators': [],
-            'neutral_indicators': [],
+            'positive_indicators': [kw for kw in indicators['positive'] if kw in text_lower],
+            'negative_indicators': [kw for kw in indicators['negative'] if kw in text_lower],
+            'neutral_indicators': [kw for kw in indicators['neutral'] if kw in text_lower],
             'hinglish_confidence': 0.0
         }
         
-        # Check for sentiment indicators
-        for positive in self.HINGLISH_SENTIMENT_INDICATORS['positive']:
-            if positive in text_lower:
-                result['positive_indicators'].append(positive)
-        
-        for negative in self.HINGLISH_SENTIMENT_INDICATORS['negative']:
-            if negative in text_lower:
-                result['negative_indicators'].append(negative)
-        
-        for neutral in self.HINGLISH_SENTIMENT_INDICATORS['neutral']:
-            if neutral in text_lower:
-                result['neutral_indicators'].append(neutral)
-        
         # Calculate Hinglish confidence
         total_indicators = len(result['positive_indicators']) + \
                           len(result['negative_indicators']) + \
@@ -227,6 +431,9 @@ class MultilingualService:
     def batch_translate(self, texts: List[str], target_lang: str = 'en') -> List[str]:
         """
         Translate multiple texts efficiently.
+        Each distinct text is translated once. Texts not already cached are
+        joined into chunks of about TRANSLATE_CHUNK_CHARS, one request per
+        chunk, sent concurrently up to TRANSLATE_WORKERS at a time.
         
         Args:
             texts: List of texts to translate
@@ -235,7 +442,30 @@ class MultilingualService:
         Returns:
             List of translated texts
         """
-        return [self.translate_text(text, target_lang=target_lang) for text in texts]
+        translated = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            if not self.translator or target_lang == 'auto' or not text.strip():
+                translated[text] = self.translate_text(text, target_lang=target_lang)
+                continue
+            cached = self.cache.get((text, 'auto', target_lang))
+            if cached is not None:
+                translated[text] = cached
+            elif self._in_language(text, target_lang):
+                translated[text] = text
+            else:
+                missing.append(text)
+        
+        chunks = _chunk_texts(missing)
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(TRANSLATE_WORKERS, len(chunks))) as pool:
+                results = pool.map(lambda chunk: self._translate_chunk(chunk, target_lang), chunks)
+                for chunk, parts in zip(chunks, results):
+                    translated.update(zip(chunk, parts))
+        elif chunks:
+            translated.update(zip(chunks[0], self._translate_chunk(chunks[0], target_lang)))
+        
+        return [translated[text] for text in texts]
     
     def get_language_stats(self, messages: List[Dict]) -> Dict:
         """
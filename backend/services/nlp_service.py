@@ -5,8 +5,9 @@ Provides parsing, sentiment analysis, emotions, keywords, and advanced NLP featu
 import re
 import emoji
 import logging
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, Iterable, List, Any, Tuple, Optional, Union
 from collections import Counter
+from backend.config import VADER_POS, VADER_NEG, TOP_USERS_COUNT, TOP_EMOJIS_COUNT
 from backend.services.sentiment import sentiment_analyzer
 from backend.services.language import detector, analytics, translate_text
 from datetime import datetime
@@ -33,14 +34,18 @@ class ChatParser:
     START_RE = re.compile(r"^(?P<date>\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}|\d{4}[\-]\d{1,2}[\-]\d{1,2}),?\s*(?P<time>\d{1,2}:\d{2}(?::\d{2})?(?:\s*[APMapm]{2})?)\s*-\s*(?P<sender>[^:]+?):\s*(?P<message>.*)")
     
     @staticmethod
-    def parse(content: str) -> Tuple[List[Dict[str, str]], List[str]]:
+    def parse(content: Union[str, Iterable[str]]) -> Tuple[List[Dict[str, str]], List[str]]:
         """
-        Parse WhatsApp chat content.
+        Parse WhatsApp chat content, given as one string or as an iterable of
+        lines (e.g. an open text file, which is then read line by line).
         
         Returns:
             (messages, failed_lines) - List of parsed messages and unparsed lines
         """
-        lines = content.splitlines()
+        if isinstance(content, str):
+            lines = content.splitlines()
+        else:
+            lines = (line.rstrip("\r\n") for line in content)
         messages = []
         failed_lines = []
         
@@ -124,7 +129,7 @@ class KeywordExtractor:
             counter = Counter(keywords)
             return counter.most_common(top_k)
         except Exception as e:
-            logger.warning(f"Keyword extraction failed: {e}")
+            logger.warning("Keyword extraction failed: %s", e)
             return []
 
 
@@ -182,7 +187,7 @@ class MediaExtractor:
             media['links'] = [url for url in general_urls if url not in all_urls]
             
         except Exception as e:
-            logger.warning(f"Media extraction failed: {e}")
+            logger.warning("Media extraction failed: %s", e)
         
         return media
 
@@ -242,9 +247,9 @@ class NLPService:
         self.summarizer = None
         logger.info("✓ NLP Service initialized")
     
-    def analyze_chat(self, chat_content: str) -> Dict[str, Any]:
+    def analyze_chat(self, chat_content: Union[str, Iterable[str]]) -> Dict[str, Any]:
         """
-        Analyze complete WhatsApp chat.
+        Analyze complete WhatsApp chat (the full text or an iterable of its lines).
         
         Returns comprehensive analysis including sentiment, emotions, languages, etc.
         """
@@ -266,25 +271,30 @@ class NLPService:
             emojis_list = []
             all_text = []
             
-            for msg in messages:
+            # Skip media-only messages
+            text_messages = [
+                msg for msg in messages
+                if msg.get('message', '') != '<Media omitted>' and msg.get('message', '').strip()
+            ]
+            
+            # Sentiment for the whole chat in one batch (may include transformer results)
+            batch_sentiments = self.sentiment.analyze_batch([msg.get('message', '') for msg in text_messages])
+            # Language too (each distinct text detected once)
+            batch_languages = self.lang_detector.detect_many([msg.get('message', '') for msg in text_messages])
+            
+            emotions_by_text = {}
+            for msg, sentiment, language in zip(text_messages, batch_sentiments, batch_languages):
                 sender = msg.get('sender', '')
                 text = msg.get('message', '')
                 raw_ts = msg.get('raw_timestamp', '')
                 ts = msg.get('timestamp', '')
                 
-                # Skip media-only messages
-                if text == '<Media omitted>' or not text.strip():
-                    continue
-                
-                # Sentiment (may include transformer results)
-                sentiment = self.sentiment.analyze(text)
                 sentiments.append(sentiment.get('ensemble_score', 0.0))
 
-                # Emotions
-                emotions = self.emotions.detect(text)
-
-                # Language
-                language = self.lang_detector.detect(text)
+                # Emotions (detected once per distinct text; each message gets its own dict)
+                if text not in emotions_by_text:
+                    emotions_by_text[text] = self.emotions.detect(text)
+                emotions = dict(emotions_by_text[text])
 
                 # Translate if needed (preserve original)
                 translated = text
@@ -336,21 +346,22 @@ class NLPService:
             avg_sentiment = sum(sentiments) / len(sentiments) if sentiments else 0
             
             # Overall sentiment label
-            if avg_sentiment >= 0.05:
+            if avg_sentiment >= VADER_POS:
                 overall_label = 'Positive'
-            elif avg_sentiment <= -0.05:
+            elif avg_sentiment <= VADER_NEG:
                 overall_label = 'Negative'
             else:
                 overall_label = 'Neutral'
             
             # Language distribution
-            lang_analysis = self.lang_analytics.analyze_distribution(analyzed_messages)
+            # (every analyzed message has non-empty text and its language already detected)
+            lang_analysis = self.lang_analytics.summarize_languages([m['language'] for m in analyzed_messages])
             
             # Top users
-            top_users = user_counts.most_common(5)
+            top_users = user_counts.most_common(TOP_USERS_COUNT)
             
             # Top emojis
-            top_emojis = Counter(emojis_list).most_common(10)
+            top_emojis = Counter(emojis_list).most_common(TOP_EMOJIS_COUNT)
             
             # Aggregate emotions
             agg_emotions = {e: 0 for e in EmotionDetector.EMOTIONS_MAP.keys()}
@@ -361,7 +372,7 @@ class NLPService:
             if total_messages > 0:
                 agg_emotions = {e: s / total_messages for e, s in agg_emotions.items()}
             
-            logger.info(f"✓ Analyzed {total_messages} messages successfully")
+            logger.info("✓ Analyzed %s messages successfully", total_messages)
 
             # Summarization (safe)
             summary_text = ''
@@ -373,7 +384,7 @@ class NLPService:
                             from transformers import pipeline as _pipeline
                             self.summarizer = _pipeline('summarization')
                         except Exception as e:
-                            logger.warning(f"Failed to initialize summarizer: {e}")
+                            logger.warning("Failed to initialize summarizer: %s", e)
                             self.summarizer = None
 
                     if self.summarizer:
@@ -385,7 +396,7 @@ class NLPService:
                     top_terms = Counter(' '.join(all_text).lower().split()).most_common(5)
                     summary_text = 'Summary topics: ' + ', '.join([t[0] for t in top_terms])
             except Exception as e:
-                logger.warning(f"Summarization failed: {e}")
+                logger.warning("Summarization failed: %s", e)
                 summary_text = ''
             
             return {
@@ -409,9 +420,20 @@ class NLPService:
             }
         
         except Exception as e:
-            logger.error(f"Chat analysis failed: {e}", exc_info=True)
+            logger.error("Chat analysis failed: %s", e, exc_info=True)
             return {'error': f'Analysis failed: {str(e)}'}
 
 
 # Global instance
 nlp_service = NLPService()
+
+
+def analyze_chat(chat_content: Union[str, Iterable[str]]) -> Dict[str, Any]:
+    """Analyze a chat with the global instance (picklable entry point for worker processes)."""
+    return nlp_service.analyze_chat(chat_content)
+
+
+def analyze_chat_file(path: str) -> Dict[str, Any]:
+    """Analyze a chat file line by line (invalid UTF-8 is replaced), without loading it whole."""
+    with open(path, encoding="utf-8", errors="replace") as chat_file:
+        return nlp_service.analyze_chat(chat_file)
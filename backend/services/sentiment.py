@@ -3,12 +3,15 @@ Enterprise-grade Sentiment Analysis Service
 Supports multiple models and ensemble predictions
 """
 import logging
-from typing import Dict, Tuple, Any
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from textblob import TextBlob
 import numpy as np
 import logging
 
+from backend.config import VADER_POS, VADER_NEG, TEXT_CACHE_SIZE
+
 # Try optional transformers
 HAS_TRANSFORMERS = False
 try:
@@ -19,6 +22,9 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Label per int8 code: 0 neutral, 1 positive, 2 negative
+_LABEL_NAMES = np.array(['Neutral', 'Positive', 'Negative'], dtype=object)
+
 class SentimentAnalyzer:
     """Multi-model sentiment analysis with ensemble."""
     
@@ -27,6 +33,9 @@ class SentimentAnalyzer:
         self.vader = SentimentIntensityAnalyzer()
         self.transformer_en = None
         self.transformer_multi = None
+        # Chats repeat short texts ("ok", "haha", "👍") a lot; each distinct
+        # text is run through the models once
+        self._model_scores = lru_cache(maxsize=TEXT_CACHE_SIZE)(self._score_models)
         # Do not auto-download heavy models during init. They will be loaded lazily when needed.
         logger.info("✓ Sentiment analyzer initialized")
     
@@ -64,18 +73,7 @@ class SentimentAnalyzer:
             textblob_result = self._analyze_textblob(text)
 
             # Transformer analyses (optional, lazy-loaded)
-            transformer_en_result = None
-            transformer_multi_result = None
-            try:
-                self._ensure_transformers()
-                if self.transformer_en:
-                    transformer_en_result = self._analyze_transformer(self.transformer_en, text)
-                if self.transformer_multi:
-                    transformer_multi_result = self._analyze_transformer(self.transformer_multi, text, multilingual=True)
-            except Exception:
-                # If transformer loading or analysis fails, continue with available results
-                transformer_en_result = None
-                transformer_multi_result = None
+            transformer_en_result, transformer_multi_result = self._analyze_transformers(text)
             
             # Ensemble (only pass vader and textblob, not transformer args)
             ensemble = self._ensemble_scores(vader_result, textblob_result)
@@ -92,7 +90,7 @@ class SentimentAnalyzer:
                 'transformer_multi': transformer_multi_result
             }
         except Exception as e:
-            logger.error(f"Sentiment analysis failed: {e}")
+            logger.error("Sentiment analysis failed: %s", e)
             return {
                 'vader_score': 0.0,
                 'vader_label': 'Neutral',
@@ -103,14 +101,95 @@ class SentimentAnalyzer:
                 'confidence': 0.0
             }
     
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze many texts; returns one analyze()-shaped dict per text.
+        
+        VADER and TextBlob score each distinct text once (see _model_scores),
+        and the ensemble scores, labels and confidences are computed for the
+        whole batch with numpy.
+        """
+        scores = [self._model_scores(text) for text in texts]
+        vader_scores = np.array([score[0] for score in scores], dtype=float)
+        textblob_scores = np.array([score[1] for score in scores], dtype=float)
+        transformer_results = [score[2] for score in scores]
+
+        ensemble_scores = vader_scores * 0.6 + textblob_scores * 0.4
+        agreement = np.clip(1.0 - np.abs(vader_scores - textblob_scores) / 2, 0.0, 1.0)
+        confidences = np.minimum(np.abs(ensemble_scores) * agreement, 1.0)
+
+        vader_labels = self._labels(vader_scores >= VADER_POS, vader_scores <= VADER_NEG)
+        textblob_labels = self._labels(textblob_scores > 0.1, textblob_scores < -0.1)
+        ensemble_labels = self._labels(ensemble_scores >= VADER_POS, ensemble_scores <= VADER_NEG)
+
+        return [
+            {
+                'vader_score': vader,
+                'vader_label': vader_label,
+                'textblob_score': textblob,
+                'textblob_label': textblob_label,
+                'ensemble_score': score,
+                'ensemble_label': label,
+                'confidence': confidence,
+                'transformer_en': transformer_en,
+                'transformer_multi': transformer_multi
+            }
+            for vader, vader_label, textblob, textblob_label, score, label, confidence, (transformer_en, transformer_multi)
+            in zip(
+                vader_scores.tolist(), vader_labels, textblob_scores.tolist(), textblob_labels,
+                ensemble_scores.tolist(), ensemble_labels, confidences.tolist(), transformer_results,
+            )
+        ]
+
+    def _score_models(self, text: str) -> Tuple[float, float, Tuple[Any, Any]]:
+        """(VADER compound, TextBlob polarity, transformer results) of one text."""
+        if not text.strip():
+            return 0.0, 0.0, (None, None)
+        try:
+            return (
+                self.vader.polarity_scores(text)['compound'],
+                self._analyze_textblob(text)['score'],
+                self._analyze_transformers(text),
+            )
+        except Exception as e:
+            logger.error("Sentiment analysis failed: %s", e)
+            return 0.0, 0.0, (None, None)
+
+    @staticmethod
+    def _labels(positive: np.ndarray, negative: np.ndarray) -> List[str]:
+        """
+        Positive/Negative/Neutral label per element from two boolean masks
+        (positive wins where both are set). The labels are built as int8 codes
+        and mapped through _LABEL_NAMES, so every element shares one of three
+        str objects instead of getting its own.
+        """
+        codes = negative.view(np.int8) * 2
+        codes[positive] = 1
+        return _LABEL_NAMES[codes].tolist()
+
+    def _analyze_transformers(self, text: str) -> Tuple[Any, Any]:
+        """(English, multilingual) transformer results, None where unavailable."""
+        try:
+            self._ensure_transformers()
+            transformer_en_result = None
+            transformer_multi_result = None
+            if self.transformer_en:
+                transformer_en_result = self._analyze_transformer(self.transformer_en, text)
+            if self.transformer_multi:
+                transformer_multi_result = self._analyze_transformer(self.transformer_multi, text, multilingual=True)
+            return transformer_en_result, transformer_multi_result
+        except Exception:
+            # If transformer loading or analysis fails, continue with available results
+            return None, None
+    
     def _analyze_vader(self, text: str) -> Dict[str, Any]:
         """VADER sentiment analysis."""
         scores = self.vader.polarity_scores(text)
         compound = scores['compound']
         
-        if compound >= 0.05:
+        if compound >= VADER_POS:
             label = 'Positive'
-        elif compound <= -0.05:
+        elif compound <= VADER_NEG:
             label = 'Negative'
         else:
             label = 'Neutral'
@@ -125,13 +204,13 @@ class SentimentAnalyzer:
             try:
                 self.transformer_en = pipeline('sentiment-analysis', model='distilbert-base-uncased-finetuned-sst-2-english')
             except Exception as e:
-                logger.warning(f"Failed to load English transformer pipeline: {e}")
+                logger.warning("Failed to load English transformer pipeline: %s", e)
                 self.transformer_en = None
         if self.transformer_multi is None:
             try:
                 self.transformer_multi = pipeline('sentiment-analysis', model='nlptown/bert-base-multilingual-uncased-sentiment')
             except Exception as e:
-                logger.warning(f"Failed to load multilingual transformer pipeline: {e}")
+                logger.warning("Failed to load multilingual transformer pipeline: %s", e)
                 self.transformer_multi = None
 
     def _analyze_transformer(self, pipe, text: str, multilingual: bool = False) -> Dict[str, Any]:
@@ -153,7 +232,7 @@ class SentimentAnalyzer:
                 return {'score': norm, 'label': label}
             return None
         except Exception as e:
-            logger.warning(f"Transformer analysis failed: {e}")
+            logger.warning("Transformer analysis failed: %s", e)
             return None
     
     def _analyze_textblob(self, text: str) -> Dict[str, Any]:
@@ -171,7 +250,7 @@ class SentimentAnalyzer:
             
             return {'score': polarity, 'label': label}
         except Exception as e:
-            logger.warning(f"TextBlob analysis failed: {e}")
+            logger.warning("TextBlob analysis failed: %s", e)
             return {'score': 0.0, 'label': 'Neutral'}
     
     def _ensemble_scores(self, vader: Dict, textblob: Dict) -> Dict[str, Any]:
@@ -212,9 +291,9 @@ class SentimentAnalyzer:
         # Fallback simple average using the weights above
         ensemble_score = vader_norm * 0.6 + textblob_norm * 0.4
         
-        if ensemble_score >= 0.05:
+        if ensemble_score >= VADER_POS:
             label = 'Positive'
-        elif ensemble_score <= -0.05:
+        elif ensemble_score <= VADER_NEG:
             label = 'Negative'
         else:
             label = 'Neutral'
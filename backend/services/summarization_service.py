@@ -51,7 +51,7 @@ class SummarizationService:
             logger.warning("Transformers not available - summarization disabled")
             self.initialized = False
         except Exception as e:
-            logger.error(f"Failed to load summarization models: {e}")
+            logger.error("Failed to load summarization models: %s", e)
             self.initialized = False
     
     def generate_short_summary(self, text: str, max_length: int = 100) -> Optional[str]:
@@ -78,7 +78,7 @@ class SummarizationService:
             summary = self.summarizer(text, max_length=50, min_length=15, do_sample=False)
             return summary[0]['summary_text'] if summary else None
         except Exception as e:
-            logger.error(f"Error generating short summary: {e}")
+            logger.error("Error generating short summary: %s", e)
             return None
     
     def generate_detailed_summary(self, text: str) -> Optional[str]:
@@ -103,7 +103,7 @@ class SummarizationService:
             summary = self.summarizer(text, max_length=150, min_length=50, do_sample=False)
             return summary[0]['summary_text'] if summary else None
         except Exception as e:
-            logger.error(f"Error generating detailed summary: {e}")
+            logger.error("Error generating detailed summary: %s", e)
             return None
     
     def extract_key_topics(self, text: str, num_topics: int = 5) -> Optional[List[str]]:
@@ -139,7 +139,7 @@ class SummarizationService:
             topics = result['labels'][:num_topics] if result['labels'] else []
             return topics if topics else None
         except Exception as e:
-            logger.error(f"Error extracting topics: {e}")
+            logger.error("Error extracting topics: %s", e)
             return None
     
     def analyze_emotional_trend(
@@ -209,7 +209,7 @@ class SummarizationService:
                 "windows_count": len(windows)
             }
         except Exception as e:
-            logger.error(f"Error analyzing emotional trend: {e}")
+            logger.error("Error analyzing emotional trend: %s", e)
             return None
     
     def generate_full_analysis(self, messages: List[Dict], text: str) -> Dict:
@@ -233,7 +233,7 @@ class SummarizationService:
             "available": self.initialized
         }
         
-        logger.info(f"Generated full analysis for {len(messages)} messages")
+        logger.info("Generated full analysis for %s messages", len(messages))
         return analysis
 
 
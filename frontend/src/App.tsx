@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { startAnalysisApi, getResultsApi } from './api';
+import { startAnalysisApi, resultsStreamUrl } from './api';
 import FileUpload from './components/FileUpload';
 import Dashboard from './components/Dashboard';
 import ChatViewer from './components/ChatViewer';
@@ -66,29 +66,28 @@ const App: React.FC = () => {
 
   useEffect(() => {
     if (jobId && isPolling) {
-      const pollInterval = setInterval(async () => {
-        try {
-          const response = await getResultsApi(jobId);
-          if (response.status === 'complete') {
-            clearInterval(pollInterval);
-            setIsPolling(false);
-            setAnalysisData(response.result);
-          } else if (response.status === 'processing') {
-            // Still processing, do nothing
-          }
-        } catch (err: any) {
-          clearInterval(pollInterval);
+      // The server pushes the job status until the analysis finishes
+      const source = new EventSource(resultsStreamUrl(jobId));
+      source.onmessage = (event) => {
+        const response = JSON.parse(event.data);
+        if (response.status === 'complete') {
+          source.close();
           setIsPolling(false);
-          const errorDetail = err.response?.data?.detail;
-          if (typeof errorDetail === 'object' && errorDetail !== null) {
-            setError(errorDetail as ErrorInfo);
-          } else {
-            setError(errorDetail || 'An unexpected error occurred during polling.');
-          }
+          setAnalysisData(response.result);
+        } else if (response.status === 'failed') {
+          source.close();
+          setIsPolling(false);
+          setError(response.error || 'Analysis failed.');
         }
-      }, 3000); // Poll every 3 seconds
+        // 'processing' is a heartbeat; keep waiting
+      };
+      source.onerror = () => {
+        source.close();
+        setIsPolling(false);
+        setError('An unexpected error occurred while waiting for results.');
+      };
 
-      return () => clearInterval(pollInterval);
+      return () => source.close();
     }
   }, [jobId, isPolling]);
 
@@ -15,6 +15,9 @@ export const startAnalysisApi = async (file: File): Promise<{ job_id: string }>
   return response.data;
 };
 
+// Server-Sent Events stream of /results, ending with the job's final status
+export const resultsStreamUrl = (jobId: string) => `${API_URL}/results/${jobId}/stream`;
+
 export const getResultsApi = async (jobId: string) => {
   const response = await axios.get(`${API_URL}/results/${jobId}`);
   return response.data;
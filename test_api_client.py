@@ -4,7 +4,7 @@ This tests /analyze and /results endpoints end-to-end within the process.
 """
 import time
 from fastapi.testclient import TestClient
-from backend.main import app, job_store
+from backend.main import app
 
 client = TestClient(app)
 
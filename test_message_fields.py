@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Direct test of v2 emoji extraction: multi-character emoji stay whole."""
+from backend.message_fields import extract_emojis
+
+
+def test_extract_emojis():
+    print("Testing emoji extraction...")
+    print("=" * 60)
+
+    expected = {
+        "": [],
+        "no emoji here": [],
+        "hi 😀😀 🎉": ["😀", "🎉"],  # de-duplicated, first-occurrence order
+        "❤️ and ❤": ["❤"],  # variation selector dropped
+        "1️⃣ done": [],  # keycaps are not counted
+        "👍🏽 🇮🇳": ["👍🏽", "🇮🇳"],  # skin tone modifier, flag
+        "👍🏽👍👍🏽": ["👍🏽", "👍"],
+        "👨‍👩‍👧 family": ["👨‍👩‍👧"],  # joined sequence
+        "🏴󠁧󠁢󠁳󠁣󠁴󠁿 🇮🇳 😀": ["🏴󠁧󠁢󠁳󠁣󠁴󠁿", "🇮🇳", "😀"],  # tag sequence flag
+        "1️⃣ 🇮🇳": ["🇮🇳"],
+    }
+    for text, emojis in expected.items():
+        assert extract_emojis(text) == emojis, (text, extract_emojis(text))
+        print(f"✓ {text!r}: {emojis}")
+
+    print("\n" + "=" * 60)
+    print("EMOJI EXTRACTION TESTS: ALL PASSED ✓")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_extract_emojis()